@@ -1,5 +1,6 @@
 import logging
 
+from . import metricas
 from .aex import AEX as AEX
 from .bempatrimoniado import Bempatrimoniado as Bempatrimoniado
 from .beneficio import Beneficio as Beneficio
@@ -14,6 +15,24 @@ from .pesquisa import Pesquisa as Pesquisa
 from .pessoa import Pessoa as Pessoa
 from .posgraduacao import Posgraduacao as Posgraduacao
 
+# Medição dos métodos públicos (desligada por padrão; ver replicado.metricas)
+for _classe in (
+    AEX,
+    Bempatrimoniado,
+    Beneficio,
+    CartaoUSP,
+    CEU,
+    Convenio,
+    Estrutura,
+    Financeiro,
+    Graduacao,
+    Lattes,
+    Pesquisa,
+    Pessoa,
+    Posgraduacao,
+):
+    metricas.instrumentar(_classe)
+
 # Configuração do logger da biblioteca
 logger = logging.getLogger("replicado")
 logger.addHandler(logging.NullHandler())
@@ -0,0 +1,195 @@
+"""
+API assíncrona do replicado, para uso em aplicações asyncio (ex: FastAPI).
+
+O driver do replicado (pymssql) não tem versão assíncrona, então as consultas
+são executadas num pool de threads dedicado, do tamanho do pool de conexões
+(`PoolConfig.max_conexoes`, ou REPLICADO_AIO_WORKERS). Assim o event loop não
+fica bloqueado e chamadas concorrentes se sobrepõem de verdade::
+
+    from replicado.aio import Pessoa
+
+    email_a, email_b = await asyncio.gather(Pessoa.email(a), Pessoa.email(b))
+
+Cada classe pública tem um espelho aqui com os mesmos métodos, que passam a ser
+corrotinas. Os métodos que devolvem iteradores (`iterar_*`, `DB.iter_rows`,
+`Lattes.obter_arrays`...) viram iteradores assíncronos::
+
+    async for servidor in Pessoa.iterar_servidores():
+        ...
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any
+
+from replicado import (
+    aex,
+    bempatrimoniado,
+    beneficio,
+    cartao,
+    ceu,
+    connection,
+    convenio,
+    estrutura,
+    financeiro,
+    graduacao,
+    lattes,
+    pesquisa,
+    pessoa,
+    posgraduacao,
+)
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_max_workers: int | None = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Retorna o pool de threads usado pelas chamadas assíncronas.
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = (
+                    _max_workers
+                    or int(os.getenv("REPLICADO_AIO_WORKERS", "0"))
+                    or connection.DB.get_pool_config().max_conexoes
+                )
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="replicado-aio"
+                )
+    return _executor
+
+
+def configure(max_workers: int | None = None) -> None:
+    """
+    Redefine o número máximo de consultas simultâneas.
+
+    O pool de threads atual é encerrado (sem interromper as chamadas em
+    andamento) e um novo é criado na próxima chamada.
+
+    Args:
+        max_workers (int, optional): Limite de consultas simultâneas. Sem ele,
+            volta a usar REPLICADO_AIO_WORKERS ou o tamanho do pool de conexões.
+    """
+    global _executor, _max_workers
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _max_workers = max_workers
+
+
+async def executar(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Executa uma função síncrona do replicado no pool de threads.
+
+    Args:
+        func (Callable): Função a executar.
+        *args: Argumentos posicionais.
+        **kwargs: Argumentos nomeados.
+
+    Returns:
+        Any: O retorno de `func`.
+    """
+    loop = asyncio.get_running_loop()
+    contexto = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(contexto.run, func, *args, **kwargs)
+    )
+
+
+async def iterar(
+    func: Callable[..., Iterator[Any]], *args: Any, **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Consome um iterador síncrono do replicado no pool de threads, em lotes de
+    `DB.BATCH_SIZE` itens por vez.
+
+    Args:
+        func (Callable): Função que devolve o iterador.
+        *args: Argumentos posicionais.
+        **kwargs: Argumentos nomeados.
+    """
+    iterador = iter(await executar(func, *args, **kwargs))
+    tamanho = connection.DB.BATCH_SIZE
+    try:
+        while lote := await executar(lambda: list(islice(iterador, tamanho))):
+            for item in lote:
+                yield item
+    finally:
+        fechar = getattr(iterador, "close", None)
+        if fechar is not None:
+            await executar(fechar)
+
+
+def _devolve_iterador(nome: str, func: Callable[..., Any]) -> bool:
+    return (
+        nome.startswith("iterar_")
+        or nome == "iter_rows"
+        or inspect.isgeneratorfunction(func)
+    )
+
+
+class _Assincrono:
+    """
+    Espelho assíncrono de uma classe de consultas do replicado.
+    """
+
+    def __init__(self, cls: type) -> None:
+        self._cls = cls
+        self.__name__ = cls.__name__
+        self.__doc__ = cls.__doc__
+
+    def __getattr__(self, nome: str) -> Any:
+        atributo = getattr(self._cls, nome)
+        if nome.startswith("_") or not callable(atributo):
+            return atributo
+
+        if _devolve_iterador(nome, atributo):
+
+            @functools.wraps(atributo)
+            def iterador(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+                return iterar(atributo, *args, **kwargs)
+
+            return iterador
+
+        @functools.wraps(atributo)
+        async def corrotina(*args: Any, **kwargs: Any) -> Any:
+            return await executar(atributo, *args, **kwargs)
+
+        return corrotina
+
+    def __dir__(self) -> list[str]:
+        return dir(self._cls)
+
+    def __repr__(self) -> str:
+        return f"<replicado.aio.{self.__name__}>"
+
+
+DB = _Assincrono(connection.DB)
+AEX = _Assincrono(aex.AEX)
+Bempatrimoniado = _Assincrono(bempatrimoniado.Bempatrimoniado)
+Beneficio = _Assincrono(beneficio.Beneficio)
+CartaoUSP = _Assincrono(cartao.CartaoUSP)
+CEU = _Assincrono(ceu.CEU)
+Convenio = _Assincrono(convenio.Convenio)
+Estrutura = _Assincrono(estrutura.Estrutura)
+Financeiro = _Assincrono(financeiro.Financeiro)
+Graduacao = _Assincrono(graduacao.Graduacao)
+Lattes = _Assincrono(lattes.Lattes)
+Pesquisa = _Assincrono(pesquisa.Pesquisa)
+Pessoa = _Assincrono(pessoa.Pessoa)
+Posgraduacao = _Assincrono(posgraduacao.Posgraduacao)
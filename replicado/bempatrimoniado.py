@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Iterator
 from typing import Any
 
 from replicado.connection import DB
@@ -85,6 +86,27 @@ class Bempatrimoniado:
                 pass
         return False
 
+    @staticmethod
+    def _query_bens(
+        filtros: dict[str, Any] | None,
+        buscas: dict[str, Any] | None,
+        tipos: dict[str, str] | None,
+        limite: int | None,
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Monta a query (e os parâmetros) de bens patrimoniados.
+        Com `limite` None a consulta não é limitada; `limite` 0 não traz linhas.
+        """
+        if limite is not None and limite < 0:
+            raise ValueError(f"Limite inválido: {limite}. Use um inteiro >= 0.")
+        top = f"TOP {limite} " if limite is not None else ""
+        query = f"SELECT {top}* FROM BEMPATRIMONIADO "
+        str_where, params = DB.cria_filtro_busca(
+            filtros or {}, buscas or {}, tipos or {}
+        )
+
+        return query + str_where, params
+
     @staticmethod
     def bens(
         filtros: dict[str, Any] = None,
@@ -95,15 +117,100 @@ class Bempatrimoniado:
         """
         Retorna todos bens patrimoniados (com opção de filtros e buscas).
         """
-        if tipos is None:
-            tipos = {}
-        if buscas is None:
-            buscas = {}
-        if filtros is None:
-            filtros = {}
-        query = f"SELECT TOP {limite} * FROM BEMPATRIMONIADO "
-        str_where, params = DB.cria_filtro_busca(filtros, buscas, tipos)
+        return DB.fetch_all(
+            *Bempatrimoniado._query_bens(filtros, buscas, tipos, limite)
+        )
 
-        query += str_where
+    @staticmethod
+    def iterar_bens(
+        filtros: dict[str, Any] = None,
+        buscas: dict[str, Any] = None,
+        tipos: dict[str, str] = None,
+        limite: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `bens`: devolve um bem por vez.
+        Por padrão não aplica limite, já que o resultado não é mantido em memória.
+        """
+        return DB.iter_rows(
+            *Bempatrimoniado._query_bens(filtros, buscas, tipos, limite)
+        )
 
-        return DB.fetch_all(query, params)
+    @staticmethod
+    def colunas_bens(
+        filtros: dict[str, Any] = None,
+        buscas: dict[str, Any] = None,
+        tipos: dict[str, str] = None,
+        limite: int | None = None,
+        formato: str = "auto",
+    ) -> Any:
+        """
+        Versão em colunas de `bens` (ver `DB.fetch_columns`), para análises
+        sobre todo o patrimônio sem um dicionário por bem.
+        """
+        return DB.fetch_columns(
+            *Bempatrimoniado._query_bens(filtros, buscas, tipos, limite),
+            formato=formato,
+        )
+
+    @staticmethod
+    def _query_pagina_bens(
+        filtros: dict[str, Any] | None,
+        buscas: dict[str, Any] | None,
+        tipos: dict[str, str] | None,
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Monta a query de bens no formato de `DB.fetch_page` (com ``{top}`` e
+        ``{apos}``).
+        """
+        str_where, params = DB.cria_filtro_busca(
+            filtros or {}, buscas or {}, tipos or {}
+        )
+        query = "SELECT {top}* FROM BEMPATRIMONIADO WHERE {apos}"
+        return query + str_where.replace(" WHERE ", " AND ", 1), params
+
+    @staticmethod
+    def pagina_bens(
+        filtros: dict[str, Any] = None,
+        buscas: dict[str, Any] = None,
+        tipos: dict[str, str] = None,
+        apos: str | None = None,
+        tamanho: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Versão paginada de `bens`, ordenada por `numpat`: devolve os bens
+        seguintes ao patrimônio `apos` (ver `DB.fetch_page`).
+
+        A chave para a próxima página fica em ``pagina.proxima``.
+        """
+        query, params = Bempatrimoniado._query_pagina_bens(filtros, buscas, tipos)
+        return DB.fetch_page(query, "numpat", params, apos=apos, tamanho=tamanho)
+
+    @staticmethod
+    def paginas_bens(
+        filtros: dict[str, Any] = None,
+        buscas: dict[str, Any] = None,
+        tipos: dict[str, str] = None,
+        apos: str | None = None,
+        tamanho: int | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Percorre todos os bens, uma página de `pagina_bens` por vez.
+        """
+        query, params = Bempatrimoniado._query_pagina_bens(filtros, buscas, tipos)
+        yield from DB.iter_pages(query, "numpat", params, apos=apos, tamanho=tamanho)
+
+    @staticmethod
+    def iterar_ativos(
+        filtros: dict[str, Any] = None,
+        buscas: dict[str, Any] = None,
+        tipos: dict[str, str] = None,
+        limite: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `ativos`: devolve um bem ativo por vez.
+        """
+        if filtros is None:
+            filtros = {}
+        filtros["stabem"] = "Ativo"
+        return Bempatrimoniado.iterar_bens(filtros, buscas, tipos, limite)
@@ -0,0 +1,273 @@
+import copy
+import functools
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Protocol
+
+from . import metricas
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL: int = int(os.getenv("REPLICADO_CACHE_TTL", "3600"))
+# Dados de referência (unidades, cursos, programas) mudam raramente
+REFERENCE_TTL: int = int(os.getenv("REPLICADO_CACHE_TTL_REFERENCIA", "86400"))
+DEFAULT_MAX_ITENS: int = int(os.getenv("REPLICADO_CACHE_MAX_ITENS", "1024"))
+
+
+class CacheBackend(Protocol):
+    """
+    Interface dos backends de cache.
+    """
+
+    def get(self, chave: str) -> tuple[bool, Any]: ...
+
+    def set(self, chave: str, namespace: str, valor: Any, ttl: float) -> None: ...
+
+    def invalidate(self, namespace: str | None = None) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Cache em memória do processo, com expiração por TTL e descarte LRU.
+
+    Os valores são copiados ao serem lidos, de modo que alterações feitas pelo
+    chamador não contaminam o cache.
+    """
+
+    def __init__(self, max_itens: int = DEFAULT_MAX_ITENS) -> None:
+        self.max_itens = max_itens
+        self._dados: OrderedDict[str, tuple[str, float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: str) -> tuple[bool, Any]:
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                return False, None
+            _, expira, valor = item
+            if expira < time.monotonic():
+                del self._dados[chave]
+                return False, None
+            self._dados.move_to_end(chave)
+        return True, copy.deepcopy(valor)
+
+    def set(self, chave: str, namespace: str, valor: Any, ttl: float) -> None:
+        valor = copy.deepcopy(valor)
+        with self._lock:
+            self._dados[chave] = (namespace, time.monotonic() + ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.max_itens:
+                self._dados.popitem(last=False)
+
+    def invalidate(self, namespace: str | None = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._dados.clear()
+                return
+            for chave in [c for c, v in self._dados.items() if v[0] == namespace]:
+                del self._dados[chave]
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+
+class SQLiteBackend:
+    """
+    Cache persistido em arquivo SQLite, compartilhado entre processos.
+
+    Indicado para vários workers na mesma máquina: o primeiro a consultar o
+    replicado grava o resultado e os demais o reaproveitam até expirar.
+    """
+
+    def __init__(self, caminho: str, max_itens: int = DEFAULT_MAX_ITENS) -> None:
+        self.caminho = caminho
+        self.max_itens = max_itens
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Uma conexão por thread e por processo (conexões não sobrevivem a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS replicado_cache (
+                    chave TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    expira REAL NOT NULL,
+                    acesso REAL NOT NULL,
+                    valor BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS replicado_cache_ns "
+                "ON replicado_cache (namespace)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, chave: str) -> tuple[bool, Any]:
+        conn = self._conn()
+        agora = time.time()
+        row = conn.execute(
+            "SELECT expira, valor FROM replicado_cache WHERE chave = ?", (chave,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        if row[0] < agora:
+            conn.execute("DELETE FROM replicado_cache WHERE chave = ?", (chave,))
+            return False, None
+        conn.execute(
+            "UPDATE replicado_cache SET acesso = ? WHERE chave = ?", (agora, chave)
+        )
+        return True, pickle.loads(row[1])
+
+    def set(self, chave: str, namespace: str, valor: Any, ttl: float) -> None:
+        conn = self._conn()
+        agora = time.time()
+        blob = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        conn.execute(
+            "INSERT OR REPLACE INTO replicado_cache VALUES (?, ?, ?, ?, ?)",
+            (chave, namespace, agora + ttl, agora, blob),
+        )
+        conn.execute("DELETE FROM replicado_cache WHERE expira < ?", (agora,))
+        conn.execute(
+            """
+            DELETE FROM replicado_cache WHERE chave IN (
+                SELECT chave FROM replicado_cache
+                ORDER BY acesso DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_itens,),
+        )
+
+    def invalidate(self, namespace: str | None = None) -> None:
+        conn = self._conn()
+        if namespace is None:
+            conn.execute("DELETE FROM replicado_cache")
+        else:
+            conn.execute(
+                "DELETE FROM replicado_cache WHERE namespace = ?", (namespace,)
+            )
+
+    def __len__(self) -> int:
+        return (
+            self._conn().execute("SELECT COUNT(*) FROM replicado_cache").fetchone()[0]
+        )
+
+
+_backend: CacheBackend | None = None
+_configurado = False
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _backend_from_env() -> CacheBackend | None:
+    """
+    Cria o backend a partir de REPLICADO_CACHE.
+
+    Valores aceitos: ``memory`` (padrão), ``sqlite:/caminho/arquivo.db`` ou
+    ``0``/``off`` para desativar o cache.
+    """
+    valor = os.getenv("REPLICADO_CACHE", "memory").strip()
+    if valor.lower() in ("0", "off", "false", "none", ""):
+        return None
+    if valor.lower().startswith("sqlite:"):
+        return SQLiteBackend(valor.split(":", 1)[1])
+    if valor.lower() != "memory":
+        logger.warning(f"REPLICADO_CACHE inválido ({valor}); usando cache em memória")
+    return MemoryBackend()
+
+
+def get_backend() -> CacheBackend | None:
+    """
+    Retorna o backend de cache em uso (ou None se o cache estiver desativado).
+    """
+    global _backend, _configurado
+    if not _configurado:
+        with _lock:
+            if not _configurado:
+                _backend = _backend_from_env()
+                _configurado = True
+    return _backend
+
+
+def configure(backend: CacheBackend | None) -> None:
+    """
+    Define explicitamente o backend de cache. Use None para desativá-lo.
+
+    Args:
+        backend (CacheBackend | None): Backend a ser usado.
+    """
+    global _backend, _configurado
+    with _lock:
+        _backend = backend
+        _configurado = True
+
+
+def invalidate(namespace: str | None = None) -> None:
+    """
+    Descarta os resultados em cache de um namespace (ou de todos).
+
+    Args:
+        namespace (str, optional): Namespace a invalidar, ex: 'estrutura'.
+    """
+    backend = get_backend()
+    if backend is not None:
+        backend.invalidate(namespace)
+
+
+def cache_stats() -> dict[str, int]:
+    """
+    Retorna a contagem de acertos e falhas do cache desde o início do processo.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def cached(namespace: str, ttl: float | None = None) -> Callable:
+    """
+    Decorador que guarda em cache o retorno de um método de consulta.
+
+    A chave inclui o nome qualificado da função, os argumentos e o valor de
+    REPLICADO_CODUNDCLG, já que várias consultas dependem da unidade configurada.
+
+    Args:
+        namespace (str): Grupo do cache, usado em `invalidate`.
+        ttl (float, optional): Validade em segundos. Padrão: REPLICADO_CACHE_TTL.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            backend = get_backend()
+            if backend is None:
+                return func(*args, **kwargs)
+
+            chave = (
+                f"{namespace}:{func.__qualname__}:{args!r}:"
+                f"{sorted(kwargs.items())!r}:{os.getenv('REPLICADO_CODUNDCLG')}"
+            )
+            encontrado, valor = backend.get(chave)
+            with _lock:
+                _stats["hits" if encontrado else "misses"] += 1
+            metricas.registrar_cache(encontrado)
+            if encontrado:
+                return valor
+
+            valor = func(*args, **kwargs)
+            backend.set(chave, namespace, valor, DEFAULT_TTL if ttl is None else ttl)
+            return valor
+
+        return wrapper
+
+    return decorator
@@ -4,6 +4,7 @@ from datetime import date
 from typing import Any
 
 from replicado.connection import DB
+from replicado.loader import BatchLoader
 
 nlogger = logging.getLogger(__name__)
 
@@ -75,25 +76,26 @@ class CEU:
         params = {"ano_inicio": ano_inicio, "ano_fim": ano_fim}
         cursos = DB.fetch_all(query, params)
 
-        # Enrich with ministrantes
-        for curso in cursos:
-            q_min = """
-                SELECT m.codpes, p.nompes
+        # Enrich with ministrantes (uma consulta para todos os cursos)
+        loader = BatchLoader(
+            """
+                SELECT o.codcurceu, o.codedicurceu, m.codpes, p.nompes
                 FROM OFERECIMENTOATIVIDADECEU o
                 INNER JOIN MINISTRANTECEU m ON o.codofeatvceu = m.codofeatvceu
                 INNER JOIN PESSOA p ON m.codpes = p.codpes
-                WHERE o.codcurceu = convert(int,:codcurceu)
-                    AND o.codedicurceu = convert(int,:codedicurceu)
-            """
-            p_min = {
-                "codcurceu": curso["codcurceu"],
-                "codedicurceu": curso["codedicurceu"],
-            }
-            ministrantes = DB.fetch_all(q_min, p_min)
-            if ministrantes:
-                curso["ministrantes"] = ", ".join([m["nompes"] for m in ministrantes])
-            else:
-                curso["ministrantes"] = ""
+                WHERE o.codcurceu IN ({lista_in})
+            """,
+            chave=lambda row: (row["codcurceu"], row["codedicurceu"]),
+            muitos=True,
+            valor_in=lambda chave: chave[0],
+            nome="codcurceu",
+        )
+        ministrantes = loader.load_many(
+            (curso["codcurceu"], curso["codedicurceu"]) for curso in cursos
+        )
+        for curso in cursos:
+            chave = (curso["codcurceu"], curso["codedicurceu"])
+            curso["ministrantes"] = ", ".join(m["nompes"] for m in ministrantes[chave])
 
         return cursos
 
@@ -0,0 +1,227 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime
+from typing import IO, Any
+
+from replicado.lattes import LattesStore
+
+logger = logging.getLogger(__name__)
+
+
+def _abrir(caminho: str, modo: str = "r") -> AbstractContextManager[IO[str]]:
+    """
+    Abre o arquivo informado; '-' representa a entrada ou saída padrão.
+    """
+    if caminho == "-":
+        return nullcontext(sys.stdin if modo == "r" else sys.stdout)
+    return open(caminho, modo, encoding="utf-8")
+
+
+def _ler_codpes(caminho: str) -> list[int]:
+    """
+    Lê números USP de um arquivo, um por linha.
+    """
+    with _abrir(caminho) as arquivo:
+        return [int(linha) for linha in arquivo if linha.strip()]
+
+
+def _lattes_sync(args: argparse.Namespace) -> int:
+    from replicado.sync import sincronizar_lattes
+
+    caminho = args.store or os.getenv("REPLICADO_LATTES_STORE")
+    if not caminho:
+        logger.error("Informe --store ou defina REPLICADO_LATTES_STORE")
+        return 2
+
+    resultado = sincronizar_lattes(
+        LattesStore(caminho),
+        desde=datetime.fromisoformat(args.desde) if args.desde else None,
+        codpes_list=_ler_codpes(args.codpes) if args.codpes else None,
+        tamanho_lote=args.lote,
+        completo=args.completo,
+    )
+
+    with _abrir(args.saida, "w") as saida:
+        for codpes in resultado.alterados:
+            print(codpes, file=saida)
+
+    logger.info(
+        f"{len(resultado.alterados)} currículos atualizados, "
+        f"{len(resultado.falhas)} falhas; marca: {resultado.marca_atual}"
+    )
+    return 1 if resultado.falhas else 0
+
+
+def _snapshot(args: argparse.Namespace) -> int:
+    from replicado import snapshot
+
+    caminho = args.arquivo or os.getenv("REPLICADO_SNAPSHOT")
+    if not caminho:
+        logger.error("Informe --arquivo ou defina REPLICADO_SNAPSHOT")
+        return 2
+
+    if not args.status:
+        snapshot.atualizar(
+            caminho,
+            tabelas=args.tabela,
+            codundclg=args.codundclg,
+            batch_size=args.lote,
+        )
+    for tabela in snapshot.status(caminho):
+        print(
+            f"{tabela['tabela']}\t{tabela['linhas']}\t{tabela['atualizado_em']}",
+            file=sys.stdout,
+        )
+    return 0
+
+
+def _parametros(pares: list[str] | None) -> dict[str, Any]:
+    """
+    Converte argumentos 'nome=valor' em parâmetros nomeados; valores em JSON
+    (números, listas, objetos) são decodificados, os demais ficam como texto.
+    """
+    parametros = {}
+    for par in pares or []:
+        nome, separador, valor = par.partition("=")
+        if not separador:
+            raise argparse.ArgumentTypeError(f"Parâmetro inválido: {par}")
+        try:
+            parametros[nome] = json.loads(valor)
+        except json.JSONDecodeError:
+            parametros[nome] = valor
+    return parametros
+
+
+def _export(args: argparse.Namespace) -> int:
+    from replicado.export import exportar, resolver
+
+    def progresso(total: int) -> None:
+        if sys.stderr.isatty():
+            print(f"\r{total} linhas", end="", file=sys.stderr, flush=True)
+
+    metodo = resolver(args.metodo)
+    try:
+        exportar(
+            metodo(**_parametros(args.param)),
+            args.destino,
+            formato=args.formato,
+            compressao=args.compressao,
+            tamanho_lote=args.lote,
+            progresso=progresso,
+            delimitador=args.delimitador,
+        )
+    finally:
+        if sys.stderr.isatty():
+            print(file=sys.stderr)
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Cria o parser de argumentos da linha de comando.
+    """
+    parser = argparse.ArgumentParser(
+        prog="replicado", description="Ferramentas de linha de comando do replicado."
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Exibe logs de depuração."
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    sync = subparsers.add_parser(
+        "lattes-sync",
+        help="Baixa os currículos Lattes alterados desde a última execução.",
+    )
+    sync.add_argument(
+        "--store", help="Arquivo SQLite do armazenamento (REPLICADO_LATTES_STORE)."
+    )
+    # --completo regrava a marca, então não combina com execuções parciais
+    parcial = sync.add_mutually_exclusive_group()
+    parcial.add_argument(
+        "--completo", action="store_true", help="Ignora a marca e confere todos."
+    )
+    parcial.add_argument(
+        "--desde", help="Data de corte ISO (ex: 2024-01-31); ignora a marca gravada."
+    )
+    sync.add_argument(
+        "--codpes", help="Arquivo com os números USP a sincronizar ('-' para stdin)."
+    )
+    sync.add_argument("--lote", type=int, help="Currículos por consulta.")
+    sync.add_argument(
+        "--saida",
+        default="-",
+        help="Arquivo onde gravar os codpes alterados ('-' para stdout).",
+    )
+    sync.set_defaults(func=_lattes_sync)
+
+    snap = subparsers.add_parser(
+        "snapshot",
+        help="Cria ou atualiza a cópia local (SQLite) das tabelas de referência.",
+    )
+    snap.add_argument("--arquivo", help="Arquivo do snapshot (REPLICADO_SNAPSHOT).")
+    snap.add_argument(
+        "--tabela",
+        action="append",
+        help="Tabela a atualizar (pode repetir); padrão: todas.",
+    )
+    snap.add_argument(
+        "--codundclg", help="Unidades do filtro (padrão: REPLICADO_CODUNDCLG)."
+    )
+    snap.add_argument("--lote", type=int, help="Linhas por lote na cópia.")
+    snap.add_argument(
+        "--status", action="store_true", help="Só lista as tabelas e suas datas."
+    )
+    snap.set_defaults(func=_snapshot)
+
+    export = subparsers.add_parser(
+        "export",
+        help="Exporta uma listagem (ex: Pessoa.listar_docentes) para CSV/JSONL/Parquet.",
+    )
+    export.add_argument("metodo", help="Classe e método, ex: Graduacao.listar_ativos.")
+    export.add_argument(
+        "destino", help="Arquivo de saída (ex: ativos.csv.gz) ou '-' para stdout."
+    )
+    export.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        help="Parâmetro do método, nome=valor (JSON aceito); pode repetir.",
+    )
+    export.add_argument(
+        "--formato",
+        choices=["csv", "jsonl", "parquet"],
+        help="Padrão: pela extensão do destino.",
+    )
+    export.add_argument(
+        "--compressao", help="gzip, bz2 ou xz (Parquet: snappy, zstd...)."
+    )
+    export.add_argument("--lote", type=int, help="Linhas por escrita.")
+    export.add_argument(
+        "--delimitador", default=",", help="Separador do CSV (padrão: ',')."
+    )
+    export.set_defaults(func=_export)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Ponto de entrada do comando `replicado`.
+    """
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "completo", False) and args.codpes:
+        parser.error("argument --codpes: not allowed with argument --completo")
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Resultados em colunas (ver `DB.fetch_columns`).
+
+Em vez de um dicionário por linha, cada coluna vira um único vetor. Formatos:
+
+- ``"numpy"``: dicionário de arrays NumPy (requer numpy);
+- ``"arrow"``: uma ``pyarrow.Table`` (requer pyarrow);
+- ``"array"``: dicionário de ``array.array`` para colunas inteiramente inteiras
+  ou reais, e listas para as demais (sem dependências);
+- ``"auto"`` (padrão): ``"numpy"`` se estiver instalado, senão ``"array"``.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+FORMATOS = ("auto", "numpy", "arrow", "array")
+
+
+class Coluna:
+    """
+    Vetor de uma coluna, preenchido lote a lote.
+
+    Começa como ``array('q')`` (inteiros de 64 bits) e só passa para
+    ``array('d')`` ou para lista quando aparece um valor que não cabe no tipo
+    atual (real, nulo, string...). Strings são limpas (`clean_string`) ao
+    entrar, um lote por vez.
+    """
+
+    __slots__ = ("dados",)
+
+    def __init__(self) -> None:
+        self.dados: array | list[Any] = array("q")
+
+    def extend(self, valores: Sequence[Any]) -> None:
+        tipos = {type(v) for v in valores}
+        if str in tipos:
+            valores = [v.strip() if isinstance(v, str) else v for v in valores]
+
+        dados = self.dados
+        if isinstance(dados, array):
+            if dados.typecode == "q" and tipos <= {int}:
+                tamanho = len(dados)
+                try:
+                    dados.extend(valores)
+                    return
+                except OverflowError:
+                    # Inteiro maior que 64 bits: desfaz o lote parcial
+                    del dados[tamanho:]
+                    tipos.add(object)
+            if tipos <= {int, float} and object not in tipos:
+                if dados.typecode == "q":
+                    self.dados = dados = array("d", dados)
+            else:
+                self.dados = dados = dados.tolist()
+        dados.extend(valores)
+
+    def __len__(self) -> int:
+        return len(self.dados)
+
+
+def _como_numpy(dados: array | list[Any]) -> Any:
+    import numpy as np
+
+    if isinstance(dados, array):
+        return np.frombuffer(dados, dtype=np.int64 if dados.typecode == "q" else "d")
+    resultado = np.empty(len(dados), dtype=object)
+    resultado[:] = dados
+    return resultado
+
+
+def _como_lista(dados: array | list[Any]) -> list[Any]:
+    return dados.tolist() if isinstance(dados, array) else dados
+
+
+def montar(nomes: list[str], colunas: list[Coluna], formato: str = "auto") -> Any:
+    """
+    Converte as colunas lidas no formato pedido.
+
+    Args:
+        nomes (list[str]): Nomes das colunas.
+        colunas (list[Coluna]): Colunas, na ordem de `nomes`.
+        formato (str): Um de `FORMATOS`.
+
+    Returns:
+        dict[str, Sequence] | pyarrow.Table: As colunas no formato pedido.
+
+    Raises:
+        ValueError: Se o formato não existir.
+        ImportError: Se o formato pedido depender de um pacote não instalado.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}. Use um de {FORMATOS}.")
+    if formato == "auto":
+        try:
+            import numpy  # noqa: F401
+
+            formato = "numpy"
+        except ImportError:
+            formato = "array"
+
+    pares = zip(nomes, (coluna.dados for coluna in colunas), strict=True)
+    if formato == "arrow":
+        import pyarrow as pa
+
+        return pa.table({nome: pa.array(_como_lista(dados)) for nome, dados in pares})
+    if formato == "numpy":
+        return {nome: _como_numpy(dados) for nome, dados in pares}
+    return dict(pares)
@@ -0,0 +1,158 @@
+"""
+Execução paralela de chamadas independentes ao replicado.
+
+Útil para páginas que precisam de várias consultas sem relação entre si: em vez
+de somar a latência de todas, `gather` as executa num pool de threads do
+tamanho do pool de conexões e o tempo total se aproxima do da mais lenta::
+
+    from replicado.concurrent import gather
+
+    painel = gather(
+        graduacao=Graduacao.contar_ativos,
+        pos=Posgraduacao.contar_ativos,
+        departamentos=lambda: Estrutura.listar_departamentos(8),
+    )
+    painel["graduacao"]
+"""
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any
+
+from replicado.connection import DB
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_max_workers: int | None = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Retorna o pool de threads usado por `gather`.
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = (
+                    _max_workers
+                    or int(os.getenv("REPLICADO_CONCURRENT_WORKERS", "0"))
+                    or DB.get_pool_config().max_conexoes
+                )
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="replicado-concurrent",
+                    initializer=_marcar_worker,
+                )
+    return _executor
+
+
+def configure(max_workers: int | None = None) -> None:
+    """
+    Redefine o número máximo de chamadas simultâneas de `gather`.
+
+    Args:
+        max_workers (int, optional): Limite de chamadas simultâneas. Sem ele,
+            volta a usar REPLICADO_CONCURRENT_WORKERS ou o tamanho do pool de
+            conexões.
+    """
+    global _executor, _max_workers
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _max_workers = max_workers
+
+
+def _marcar_worker() -> None:
+    _local.worker = True
+
+
+def gather(
+    *chamadas: Callable[[], Any],
+    return_exceptions: bool = False,
+    timeout: float | None = None,
+    **nomeadas: Callable[[], Any],
+) -> list[Any] | dict[str, Any]:
+    """
+    Executa chamadas independentes em paralelo e devolve seus resultados.
+
+    Cada chamada é uma função sem argumentos (use `lambda` ou
+    `functools.partial` para passar parâmetros). Chamando `gather` de dentro de
+    uma chamada em andamento, as chamadas internas rodam em sequência, para não
+    esgotar o pool de threads.
+
+    Args:
+        *chamadas (Callable): Chamadas; o resultado é uma lista na mesma ordem.
+        return_exceptions (bool): Se True, a exceção de uma chamada que falhou
+            ocupa o lugar do seu resultado. Se False (padrão), a primeira
+            exceção (na ordem das chamadas) é relançada depois que todas
+            terminarem.
+        timeout (float, optional): Tempo máximo de espera, em segundos.
+        **nomeadas (Callable): Chamadas nomeadas; o resultado é um dicionário.
+
+    Returns:
+        list | dict: Resultados na ordem (ou com os nomes) das chamadas.
+
+    Raises:
+        ValueError: Se chamadas posicionais e nomeadas forem misturadas.
+        TimeoutError: Se alguma chamada não terminar dentro de `timeout`.
+    """
+    if chamadas and nomeadas:
+        raise ValueError("Use apenas chamadas posicionais ou apenas nomeadas.")
+    nomes = list(nomeadas) if nomeadas else list(range(len(chamadas)))
+    funcoes = list(nomeadas.values()) if nomeadas else list(chamadas)
+
+    if getattr(_local, "worker", False):
+        resultados = [_executar(func) for func in funcoes]
+    else:
+        executor = get_executor()
+        futures = [executor.submit(_executar, func) for func in funcoes]
+        _, pendentes = wait(futures, timeout=timeout)
+        if pendentes:
+            for future in pendentes:
+                future.cancel()
+            raise TimeoutError(
+                f"{len(pendentes)} de {len(futures)} chamadas não terminaram "
+                f"em {timeout}s"
+            )
+        resultados = [future.result() for future in futures]
+
+    erros = [
+        (nome, r.excecao)
+        for nome, r in zip(nomes, resultados, strict=True)
+        if _falhou(r)
+    ]
+    if erros and not return_exceptions:
+        _, erro = erros[0]
+        for outro_nome, outro in erros[1:]:
+            erro.add_note(f"Também falhou a chamada {outro_nome!r}: {outro!r}")
+        raise erro
+
+    valores = [r.excecao if _falhou(r) else r for r in resultados]
+    if nomeadas:
+        return dict(zip(nomes, valores, strict=True))
+    return valores
+
+
+class _Falha:
+    def __init__(self, excecao: BaseException) -> None:
+        self.excecao = excecao
+
+
+def _falhou(resultado: Any) -> bool:
+    return isinstance(resultado, _Falha)
+
+
+def _executar(func: Callable[[], Any]) -> Any:
+    try:
+        return func()
+    except Exception as e:
+        logger.debug(f"Chamada paralela {func!r} falhou: {e!r}")
+        return _Falha(e)
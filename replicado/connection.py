@@ -1,12 +1,29 @@
 import logging
 import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from dotenv import load_dotenv
-from sqlalchemy import Engine, create_engine, text
+from sqlalchemy import (
+    Connection,
+    CursorResult,
+    Engine,
+    TextClause,
+    create_engine,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from .utils import clean_string
+from . import colunar, linhas, metricas, snapshot
+from .utils import lotes
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +31,111 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+def _env_bool(nome: str, padrao: bool) -> bool:
+    """
+    Lê uma variável de ambiente booleana ('1', 'true', 'sim' etc).
+    """
+    valor = os.getenv(nome)
+    if valor is None or valor.strip() == "":
+        return padrao
+    return valor.strip().lower() in ("1", "true", "t", "yes", "y", "sim", "s")
+
+
+@lru_cache(maxsize=int(os.getenv("REPLICADO_SQL_CACHE_SIZE", "256")))
+def _compilar(query: str) -> TextClause:
+    return text(query.strip())
+
+
+@dataclass
+class PoolConfig:
+    """
+    Configuração do pool de conexões usado por `DB.get_engine`.
+
+    Attributes:
+        pool_size (int): Conexões mantidas abertas no pool.
+        max_overflow (int): Conexões extras permitidas além de `pool_size`.
+        pool_recycle (int): Segundos até uma conexão ser reciclada (-1 desativa).
+        pool_timeout (float): Segundos de espera por uma conexão livre antes de erro.
+        pool_use_lifo (bool): Reutiliza primeiro a conexão devolvida mais recentemente
+            (LIFO), permitindo que conexões ociosas expirem no servidor.
+        pre_ping (bool): Testa a conexão antes de usá-la.
+        pre_ping_interval (float): Se maior que zero, o teste só é feito quando a
+            conexão ficou ociosa por mais que esse número de segundos, em vez de a
+            cada checkout.
+        null_pool (bool): Desativa o pool (NullPool). Indicado para workers que
+            fazem fork, onde conexões não podem ser compartilhadas entre processos.
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = -1
+    pool_timeout: float = 30.0
+    pool_use_lifo: bool = False
+    pre_ping: bool = True
+    pre_ping_interval: float = 0.0
+    null_pool: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """
+        Cria a configuração a partir das variáveis REPLICADO_POOL_*.
+
+        Returns:
+            PoolConfig: Configuração com os valores do ambiente ou os padrões.
+        """
+        padrao = cls()
+        return cls(
+            pool_size=int(os.getenv("REPLICADO_POOL_SIZE", padrao.pool_size)),
+            max_overflow=int(
+                os.getenv("REPLICADO_POOL_MAX_OVERFLOW", padrao.max_overflow)
+            ),
+            pool_recycle=int(os.getenv("REPLICADO_POOL_RECYCLE", padrao.pool_recycle)),
+            pool_timeout=float(
+                os.getenv("REPLICADO_POOL_TIMEOUT", padrao.pool_timeout)
+            ),
+            pool_use_lifo=_env_bool("REPLICADO_POOL_LIFO", padrao.pool_use_lifo),
+            pre_ping=_env_bool("REPLICADO_POOL_PRE_PING", padrao.pre_ping),
+            pre_ping_interval=float(
+                os.getenv("REPLICADO_POOL_PRE_PING_INTERVAL", padrao.pre_ping_interval)
+            ),
+            null_pool=_env_bool("REPLICADO_POOL_NULL", padrao.null_pool),
+        )
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        """
+        Traduz a configuração para os argumentos de `create_engine`.
+
+        Returns:
+            dict: Argumentos nomeados do pool.
+        """
+        kwargs: dict[str, Any] = {
+            # Com intervalo definido, o teste é feito por DB._conectar
+            "pool_pre_ping": self.pre_ping and not self.pre_ping_interval,
+        }
+        if self.null_pool:
+            kwargs["poolclass"] = NullPool
+            return kwargs
+
+        kwargs.update(
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_recycle=self.pool_recycle,
+            pool_timeout=self.pool_timeout,
+            pool_use_lifo=self.pool_use_lifo,
+        )
+        return kwargs
+
+    @property
+    def max_conexoes(self) -> int:
+        """
+        Número de conexões que o pool entrega ao mesmo tempo sem espera.
+
+        Usado para dimensionar os executores de `replicado.aio` e
+        `replicado.concurrent`; com overflow ilimitado (-1), considera só o pool.
+        """
+        return max(1, self.pool_size + max(self.max_overflow, 0))
+
+
 class DB:
     """
     Singleton para gerenciar a conexão com o banco de dados.
@@ -21,6 +143,30 @@ class DB:
 
     _engine: Engine | None = None
     _session_factory: sessionmaker | None = None
+    _pool_config: PoolConfig | None = None
+
+    _engine_lock = threading.Lock()
+
+    # Métricas de checkout do pool (ver DB.pool_stats)
+    _stats_lock = threading.Lock()
+    _stats: dict[str, float] = {
+        "checkouts": 0,
+        "espera_total": 0.0,
+        "espera_max": 0.0,
+        "timeouts": 0,
+        "pings": 0,
+        "pings_falhos": 0,
+    }
+
+    # Quantidade de linhas buscadas por vez nas consultas em streaming
+    BATCH_SIZE: int = int(os.getenv("REPLICADO_BATCH_SIZE", "1000"))
+
+    # Valores por cláusula IN nas consultas em lote (o SQL Server aceita no
+    # máximo 2100 parâmetros por comando)
+    IN_LOTE: int = int(os.getenv("REPLICADO_IN_LOTE", "1000"))
+
+    # Linhas por página nas listagens paginadas por chave (ver DB.fetch_page)
+    PAGE_SIZE: int = int(os.getenv("REPLICADO_PAGE_SIZE", "1000"))
 
     @classmethod
     def get_engine(cls) -> Engine:
@@ -33,7 +179,15 @@ class DB:
         Raises:
             ValueError: Se as variáveis de ambiente obrigatórias não estiverem definidas.
         """
-        if cls._engine is None:
+        if cls._engine is not None:
+            return cls._engine
+
+        # Várias threads podem pedir a engine ao mesmo tempo na primeira
+        # consulta; só uma deve criá-la (e o pool de conexões)
+        with cls._engine_lock:
+            if cls._engine is not None:
+                return cls._engine
+
             host = os.getenv("REPLICADO_HOST")
             port = os.getenv("REPLICADO_PORT")
             database = os.getenv("REPLICADO_DATABASE")
@@ -52,15 +206,182 @@ class DB:
             # Formato: mssql+pymssql://<username>:<password>@<host>:<port>/<database>?charset=utf8
             connection_string = f"mssql+pymssql://{user}:{password}@{host}:{port}/{database}?charset=utf8&tds_version=7.0"
 
+            pool_config = cls.get_pool_config()
             cls._engine = create_engine(
                 connection_string,
-                pool_pre_ping=True,  # Verifica se a conexão está viva antes de usar
                 echo=False,  # Pode ser parametrizado futuramente
+                **pool_config.engine_kwargs(),
             )
             logger.info(f"Engine do SQLAlchemy criada para o host: {host}:{port}")
 
         return cls._engine
 
+    @classmethod
+    def get_pool_config(cls) -> PoolConfig:
+        """
+        Retorna a configuração de pool em uso (lida do ambiente na primeira vez).
+
+        Returns:
+            PoolConfig: Configuração do pool.
+        """
+        if cls._pool_config is None:
+            cls._pool_config = PoolConfig.from_env()
+        return cls._pool_config
+
+    @classmethod
+    def configure(cls, pool_config: PoolConfig | None = None) -> None:
+        """
+        Define a configuração do pool e descarta a engine atual.
+
+        A próxima consulta cria uma nova engine com a configuração informada.
+        Sem argumentos, volta a ler as variáveis REPLICADO_POOL_*.
+
+        Args:
+            pool_config (PoolConfig, optional): Configuração explícita do pool.
+        """
+        with cls._engine_lock:
+            if cls._engine is not None:
+                cls._engine.dispose()
+            cls._engine = None
+            cls._session_factory = None
+            cls._pool_config = pool_config
+
+    @classmethod
+    def pool_stats(cls) -> dict[str, Any]:
+        """
+        Retorna métricas de uso do pool para dimensionamento.
+
+        Inclui contagem de checkouts, tempo de espera (total, médio e máximo, em
+        segundos), timeouts, pings feitos por intervalo e, quando disponível, o
+        estado atual do pool (conexões em uso, livres e em overflow).
+
+        Returns:
+            dict: Métricas do pool.
+        """
+        with cls._stats_lock:
+            stats: dict[str, Any] = dict(cls._stats)
+        checkouts = stats["checkouts"]
+        stats["espera_media"] = stats["espera_total"] / checkouts if checkouts else 0.0
+
+        if cls._engine is not None:
+            pool = cls._engine.pool
+            for nome, metodo in (
+                ("tamanho", "size"),
+                ("em_uso", "checkedout"),
+                ("livres", "checkedin"),
+                ("overflow", "overflow"),
+            ):
+                valor = getattr(pool, metodo, None)
+                if callable(valor):
+                    stats[nome] = valor()
+        return stats
+
+    @classmethod
+    def reset_pool_stats(cls) -> None:
+        """
+        Zera as métricas acumuladas do pool.
+        """
+        with cls._stats_lock:
+            for chave in cls._stats:
+                cls._stats[chave] = 0
+
+    @classmethod
+    def _registrar(cls, **incrementos: float) -> None:
+        with cls._stats_lock:
+            for chave, valor in incrementos.items():
+                cls._stats[chave] += valor
+
+    @classmethod
+    @contextmanager
+    def _conectar(cls) -> Iterator[Connection]:
+        """
+        Obtém uma conexão do pool, medindo o tempo de espera pelo checkout.
+        """
+        engine = cls.get_engine()
+        inicio = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                espera = time.perf_counter() - inicio
+                with cls._stats_lock:
+                    cls._stats["checkouts"] += 1
+                    cls._stats["espera_total"] += espera
+                    cls._stats["espera_max"] = max(cls._stats["espera_max"], espera)
+                intervalo = cls.get_pool_config().pre_ping_interval
+                if intervalo:
+                    cls._ping_se_ociosa(conn, intervalo)
+                try:
+                    yield conn
+                finally:
+                    if intervalo:
+                        conn.info["replicado_ultimo_uso"] = time.monotonic()
+        except PoolTimeoutError:
+            cls._registrar(timeouts=1)
+            logger.warning("Tempo de espera por conexão livre no pool esgotado")
+            raise
+
+    @classmethod
+    @contextmanager
+    def _consultar(
+        cls, query: str | TextClause, params: dict | None = None, **opcoes: Any
+    ) -> Iterator[CursorResult]:
+        """
+        Executa uma consulta no snapshot local, se ela for elegível (ver
+        `replicado.snapshot`), ou no replicado.
+
+        Se a consulta falhar no snapshot (ex: sintaxe sem tradução), ela é
+        marcada para sempre ir ao replicado e repetida lá.
+        """
+        rota = snapshot.rotear(query)
+        if rota is not None:
+            engine, sql = rota
+            try:
+                conn = engine.connect()
+            except DBAPIError as e:
+                logger.warning(f"Snapshot indisponível ({e.orig}); usando o replicado")
+            else:
+                try:
+                    result = conn.execution_options(**opcoes).execute(
+                        cls.compilar(sql), params or {}
+                    )
+                except DBAPIError as e:
+                    conn.close()
+                    snapshot.rejeitar(query)
+                    logger.info(
+                        f"Consulta fora do snapshot ({e.orig}); usando o replicado"
+                    )
+                else:
+                    logger.debug("Consulta respondida pelo snapshot")
+                    try:
+                        yield result
+                    finally:
+                        conn.close()
+                    return
+
+        with cls._conectar() as conn:
+            if opcoes:
+                conn = conn.execution_options(**opcoes)
+            yield conn.execute(cls.compilar(query), params or {})
+
+    @classmethod
+    def _ping_se_ociosa(cls, conn: Connection, intervalo: float) -> None:
+        """
+        Testa a conexão apenas se ela ficou ociosa por mais de `intervalo` segundos.
+        Se o teste falhar, a conexão é invalidada e reaberta no próximo uso.
+        """
+        ultimo_uso = conn.info.get("replicado_ultimo_uso")
+        if ultimo_uso is None or time.monotonic() - ultimo_uso <= intervalo:
+            return
+
+        cls._registrar(pings=1)
+        try:
+            conn.exec_driver_sql("SELECT 1")
+        except DBAPIError as e:
+            if not e.connection_invalidated:
+                raise
+            cls._registrar(pings_falhos=1)
+            logger.info("Conexão ociosa inválida descartada; reconectando")
+            conn.rollback()
+
     @classmethod
     def get_session(cls) -> Session:
         """
@@ -75,64 +396,413 @@ class DB:
 
         return cls._session_factory()
 
+    @staticmethod
+    def compilar(query: str | TextClause) -> TextClause:
+        """
+        Converte a query em um `TextClause`, reaproveitando conversões anteriores.
+
+        As queries já convertidas ficam num cache LRU limitado (tamanho definido
+        por ``REPLICADO_SQL_CACHE_SIZE``), evitando refazer o parse do SQL a
+        cada chamada. Queries fixas podem ser compiladas uma única vez, como
+        constantes, e passadas diretamente a `fetch`/`fetch_all`.
+
+        Args:
+            query (str | TextClause): SQL Query.
+
+        Returns:
+            TextClause: Query pronta para execução.
+        """
+        if isinstance(query, TextClause):
+            return query
+        return _compilar(query)
+
+    @staticmethod
+    def compilar_cache_info() -> Any:
+        """
+        Retorna as estatísticas do cache de queries (hits, misses, tamanho).
+        """
+        return _compilar.cache_info()
+
     @classmethod
-    def execute(cls, query: str, params: dict | None = None) -> Any:
+    def execute(cls, query: str | TextClause, params: dict | None = None) -> Any:
         """
         Executa uma query raw.
 
         Args:
-           query (str): Query SQL.
+           query (str | TextClause): Query SQL.
            params (dict, optional): Parâmetros para bind.
 
         Returns:
            ResultProxy do SQLAlchemy.
         """
-        with cls.get_engine().connect() as conn:
-            return conn.execute(text(query), params or {})
+        with metricas.consulta("execute", query) as medicao, cls._conectar() as conn:
+            result = conn.execute(cls.compilar(query), params or {})
+            if medicao is not None and result.rowcount > 0:
+                medicao.linhas = result.rowcount
+            return result
 
     @classmethod
-    def fetch_all(cls, query: str, params: dict | None = None) -> list[dict]:
+    def fetch_all(
+        cls,
+        query: str | TextClause,
+        params: dict | None = None,
+        row_format: str = "dict",
+    ) -> list[Any]:
         """
         Executa query e retorna todos os resultados como dicionários.
 
         Args:
-            query (str): SQL Query.
+            query (str | TextClause): SQL Query.
             params (dict, optional): Parameters.
+            row_format (str): Formato de cada linha: 'dict' (padrão), 'tuple',
+                'namedtuple' ou 'slots'; ver `replicado.linhas`.
 
         Returns:
-            List[dict]: Lista de resultados.
+            List[dict]: Lista de resultados. Com ``row_format='tuple'``, uma
+            `linhas.Tabela` (lista de tuplas com o cabeçalho em ``colunas``).
         """
         logger.debug(f"SQL: {query} | Params: {params}")
-        with cls.get_engine().connect() as conn:
-            result = conn.execute(text(query), params or {})
-            data = [
-                {k: clean_string(v) for k, v in row._mapping.items()} for row in result
-            ]
+        with (
+            metricas.consulta("fetch_all", query) as medicao,
+            cls._consultar(query, params) as result,
+        ):
+            data = cls._converter_linhas(result, row_format, medicao)
             logger.debug(f"Retornadas {len(data)} linhas")
             return data
 
     @classmethod
-    def fetch(cls, query: str, params: dict | None = None) -> dict | None:
+    def fetch_all_in(
+        cls,
+        query: str,
+        valores: Iterable[Any],
+        params: dict | None = None,
+        nome: str = "codpes",
+        tamanho_lote: int | None = None,
+        row_format: str = "dict",
+    ) -> list[Any]:
+        """
+        Executa uma query com cláusula IN para muitos valores, em lotes.
+
+        A query deve conter o marcador ``{lista_in}``, substituído em cada lote
+        pela lista de parâmetros nomeados. Valores repetidos são consultados uma
+        única vez.
+
+        Args:
+            query (str): SQL Query com ``{lista_in}``.
+            valores (Iterable): Valores da cláusula IN.
+            params (dict, optional): Demais parâmetros da query.
+            nome (str): Prefixo dos parâmetros da lista. Padrão: 'codpes'.
+            tamanho_lote (int, optional): Valores por consulta. Padrão:
+                ``DB.IN_LOTE`` (variável ``REPLICADO_IN_LOTE``).
+            row_format (str): Formato de cada linha; ver `fetch_all`.
+
+        Returns:
+            List[dict]: Resultados de todos os lotes, na ordem em que chegaram.
+
+        Example:
+            >>> DB.fetch_all_in(
+            ...     "SELECT * FROM PESSOA WHERE codpes IN ({lista_in})", [1, 2]
+            ... )
+        """
+        data = None
+        for lote in lotes(dict.fromkeys(valores), tamanho_lote or cls.IN_LOTE):
+            lista_in, params_in = cls.cria_lista_in(nome, lote)
+            parte = cls.fetch_all(
+                query.format(lista_in=lista_in),
+                {**(params or {}), **params_in},
+                row_format=row_format,
+            )
+            # Mantém o tipo do primeiro lote (ex: a Tabela com o cabeçalho)
+            if data is None:
+                data = parte
+            else:
+                data.extend(parte)
+        return [] if data is None else data
+
+    @classmethod
+    def fetch_page(
+        cls,
+        query: str,
+        chave: str,
+        params: dict | None = None,
+        apos: Any = None,
+        tamanho: int | None = None,
+        chave_unica: bool = True,
+    ) -> linhas.Pagina:
+        """
+        Busca uma página de resultados ordenada por `chave` (paginação por
+        chave, ou *keyset*): só as linhas com chave maior que `apos`.
+
+        Ao contrário de um OFFSET, o banco posiciona a consulta direto pelo
+        índice da chave, então a página 1000 custa o mesmo que a primeira.
+
+        A query não deve ter ORDER BY e deve conter os marcadores ``{top}``,
+        logo após o SELECT (ou SELECT DISTINCT), e ``{apos}``, onde entra a
+        condição sobre a chave (ex: ``WHERE {apos} AND codund = :codund``).
+
+        Args:
+            query (str): SQL Query com ``{top}`` e ``{apos}``.
+            chave (str): Coluna de ordenação, como escrita na query (ex:
+                'P.codpes'). Na linha devolvida, é lida sem o prefixo.
+            params (dict, optional): Demais parâmetros da query.
+            apos (Any, optional): Última chave da página anterior
+                (`linhas.Pagina.proxima`). None busca a primeira página.
+            tamanho (int, optional): Linhas por página. Padrão:
+                ``DB.PAGE_SIZE`` (variável ``REPLICADO_PAGE_SIZE``).
+            chave_unica (bool): Use False quando a chave se repete entre linhas
+                (ex: um ``codpes`` por vínculo); a página é então completada
+                com todas as linhas da última chave, e pode passar de
+                `tamanho`.
+
+        Returns:
+            linhas.Pagina: Linhas da página (dicionários), com a chave para a
+            próxima em ``proxima``.
+
+        Example:
+            >>> pagina = DB.fetch_page(
+            ...     "SELECT {top}* FROM LOCALUSP WHERE {apos}", "codlocusp"
+            ... )
+            >>> DB.fetch_page(
+            ...     "SELECT {top}* FROM LOCALUSP WHERE {apos}",
+            ...     "codlocusp",
+            ...     apos=pagina.proxima,
+            ... )
+        """
+        tamanho = tamanho or cls.PAGE_SIZE
+        nome = chave.rsplit(".", 1)[-1]
+        params = dict(params or {})
+        condicao = "1 = 1"
+        if apos is not None:
+            condicao = f"{chave} > :pagina_apos"
+            params["pagina_apos"] = apos
+
+        data = cls.fetch_all(
+            query.format(top=f"TOP {tamanho} ", apos=condicao) + f" ORDER BY {chave}",
+            params,
+        )
+        if len(data) < tamanho:
+            return linhas.Pagina(data)
+
+        ultima = data[-1][nome]
+        if not chave_unica:
+            # As linhas da última chave podem ter ficado divididas com a
+            # próxima página: busca todas de uma vez
+            data = [linha for linha in data if linha[nome] != ultima]
+            data.extend(
+                cls.fetch_all(
+                    query.format(top="", apos=f"{chave} = :pagina_ultima"),
+                    {**params, "pagina_ultima": ultima},
+                )
+            )
+        return linhas.Pagina(data, ultima)
+
+    @classmethod
+    def iter_pages(
+        cls,
+        query: str,
+        chave: str,
+        params: dict | None = None,
+        apos: Any = None,
+        tamanho: int | None = None,
+        chave_unica: bool = True,
+    ) -> Iterator[linhas.Pagina]:
+        """
+        Percorre todas as páginas de `fetch_page`, da chave `apos` em diante.
+
+        Cada página é uma consulta curta e independente, então nenhuma conexão
+        fica presa enquanto as páginas são processadas.
+
+        Yields:
+            linhas.Pagina: Uma página por vez, até o fim da listagem.
+        """
+        while True:
+            pagina = cls.fetch_page(query, chave, params, apos, tamanho, chave_unica)
+            if pagina:
+                yield pagina
+            if pagina.proxima is None:
+                return
+            apos = pagina.proxima
+
+    @classmethod
+    def iter_rows(
+        cls,
+        query: str | TextClause,
+        params: dict | None = None,
+        batch_size: int | None = None,
+        row_format: str = "dict",
+    ) -> Iterator[Any]:
+        """
+        Executa query e devolve os resultados sob demanda, um dicionário por vez.
+
+        Usa cursor do lado do servidor (``stream_results``) e busca as linhas em
+        lotes de ``batch_size``, de modo que o consumo de memória não depende do
+        tamanho do resultado. A conexão permanece em uso até o iterador ser
+        esgotado ou fechado.
+
+        Args:
+            query (str): SQL Query.
+            params (dict, optional): Parameters.
+            batch_size (int, optional): Linhas por lote. Padrão: ``DB.BATCH_SIZE``
+                (variável ``REPLICADO_BATCH_SIZE``).
+            row_format (str): Formato de cada linha; ver `fetch_all`. Com
+                'tuple', as tuplas seguem a ordem das colunas do SELECT, sem
+                repetições.
+
+        Yields:
+            dict: Uma linha do resultado, com strings já limpas.
+        """
+        batch_size = batch_size or cls.BATCH_SIZE
+        logger.debug(f"SQL (stream, lote={batch_size}): {query} | Params: {params}")
+        with (
+            metricas.consulta("iter_rows", query) as medicao,
+            cls._consultar(
+                query, params, stream_results=True, yield_per=batch_size
+            ) as result,
+        ):
+            total = 0
+            converter = linhas.fabrica(
+                list(result.keys()), row_format, linhas.colunas_texto(result)
+            )
+            for row in result:
+                total += 1
+                if medicao is None:
+                    yield converter(row)
+                    continue
+                medicao.contar(row)
+                linha = converter(row)
+                # O tempo com quem consome as linhas não conta como do banco
+                medicao.pausar()
+                yield linha
+                medicao.retomar()
+            logger.debug(f"Transmitidas {total} linhas")
+
+    @classmethod
+    def fetch_columns(
+        cls,
+        query: str | TextClause,
+        params: dict | None = None,
+        formato: str = "auto",
+        batch_size: int | None = None,
+    ) -> Any:
+        """
+        Executa query e retorna o resultado em colunas, sem um dicionário por
+        linha.
+
+        As linhas são lidas do cursor em lotes de ``batch_size`` e distribuídas
+        direto nas colunas; `clean_string` é aplicado coluna a coluna. Para
+        listagens grandes usa uma fração da memória de `fetch_all`.
+
+        Args:
+            query (str | TextClause): SQL Query.
+            params (dict, optional): Parameters.
+            formato (str): 'auto' (padrão), 'numpy', 'arrow' ou 'array'; ver
+                `replicado.colunar`.
+            batch_size (int, optional): Linhas por lote. Padrão: ``DB.BATCH_SIZE``.
+
+        Returns:
+            dict[str, Sequence] | pyarrow.Table: Colunas do resultado.
+
+        Example:
+            >>> DB.fetch_columns("SELECT codpes, nompes FROM PESSOA", formato="array")
+            {'codpes': array('q', [...]), 'nompes': [...]}
+        """
+        batch_size = batch_size or cls.BATCH_SIZE
+        logger.debug(f"SQL (colunas, formato={formato}): {query} | Params: {params}")
+        with (
+            metricas.consulta("fetch_columns", query) as medicao,
+            cls._consultar(
+                query, params, stream_results=True, yield_per=batch_size
+            ) as result,
+        ):
+            nomes = list(result.keys())
+            colunas = [colunar.Coluna() for _ in nomes]
+            while lote := result.fetchmany(batch_size):
+                if medicao is not None:
+                    for row in lote:
+                        medicao.contar(row)
+                for coluna, valores in zip(
+                    colunas, zip(*lote, strict=True), strict=True
+                ):
+                    coluna.extend(valores)
+        logger.debug(f"Retornadas {len(colunas[0]) if colunas else 0} linhas")
+        return colunar.montar(nomes, colunas, formato)
+
+    @staticmethod
+    def _converter_linhas(
+        result: Any, row_format: str, medicao: metricas.Medicao | None = None
+    ) -> list[Any]:
+        """
+        Converte todas as linhas de um resultado, com o plano de colunas
+        montado uma única vez para a consulta.
+        """
+        colunas = list(result.keys())
+        converter = linhas.fabrica(colunas, row_format, linhas.colunas_texto(result))
+        if medicao is None:
+            data = [converter(row) for row in result]
+        else:
+            data = []
+            for row in result:
+                medicao.contar(row)
+                data.append(converter(row))
+        if row_format == "tuple":
+            return linhas.Tabela(linhas.cabecalho(colunas), data)
+        return data
+
+    @classmethod
+    def fetch(
+        cls,
+        query: str | TextClause,
+        params: dict | None = None,
+        row_format: str = "dict",
+    ) -> Any:
         """
         Executa query e retorna o primeiro resultado.
 
         Args:
-             query (str): SQL Query.
+             query (str | TextClause): SQL Query.
              params (dict, optional): Parameters.
+             row_format (str): Formato da linha; ver `fetch_all`.
 
         Returns:
             Optional[dict]: Resultado ou None.
         """
         logger.debug(f"SQL: {query} | Params: {params}")
-        with cls.get_engine().connect() as conn:
-            result = conn.execute(text(query), params or {}).fetchone()
+        with (
+            metricas.consulta("fetch", query) as medicao,
+            cls._consultar(query, params) as cursor,
+        ):
+            converter = linhas.fabrica(
+                list(cursor.keys()), row_format, linhas.colunas_texto(cursor)
+            )
+            result = cursor.fetchone()
             if result:
-                data = {k: clean_string(v) for k, v in result._mapping.items()}
+                if medicao is not None:
+                    medicao.contar(result)
+                data = converter(result)
                 logger.debug("Linha encontrada")
                 return data
             logger.debug("Nenhuma linha encontrada")
             return None
 
+    @staticmethod
+    def cria_lista_in(nome: str, valores: list[Any]) -> tuple[str, dict[str, Any]]:
+        """
+        Cria a lista de parâmetros nomeados para uma cláusula IN.
+
+        Args:
+            nome (str): Prefixo dos parâmetros, ex: 'codpes'.
+            valores (list): Valores da lista.
+
+        Returns:
+            Tuple[str, dict]: (':codpes_0, :codpes_1, ...', params)
+
+        Example:
+            >>> DB.cria_lista_in("codpes", [1, 2])
+            (':codpes_0, :codpes_1', {'codpes_0': 1, 'codpes_1': 2})
+        """
+        params = {f"{nome}_{i}": valor for i, valor in enumerate(valores)}
+        return ", ".join(f":{chave}" for chave in params), params
+
     @classmethod
     def cria_filtro_busca(
         cls, filtros: dict[str, Any], buscas: dict[str, Any], tipos: dict[str, str]
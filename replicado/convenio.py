@@ -3,6 +3,7 @@ import os
 from typing import Any
 
 from replicado.connection import DB
+from replicado.loader import BatchLoader
 from replicado.utils import data_mes
 
 nlogger = logging.getLogger(__name__)
@@ -73,32 +74,60 @@ class Convenio:
                 data_mes(convenio["dataFim"]) if convenio["dataFim"] else "—"
             )
 
-            # Coordenadores
-            resps = Convenio.listar_coordenadores_convenio(convenio["codcvn"])
+        # Coordenadores e organizações: uma consulta cada para todos os convênios
+        codcvns = [convenio["codcvn"] for convenio in convenios]
+        coordenadores = BatchLoader(
+            Convenio._QUERY_COORDENADORES.format(filtro="r.codcvn IN ({lista_in})"),
+            chave="codcvn",
+            muitos=True,
+            nome="codcvn",
+        ).load_many(codcvns)
+        organizacoes = BatchLoader(
+            Convenio._QUERY_ORGANIZACOES.format(filtro="co.codcvn IN ({lista_in})"),
+            chave="codcvn",
+            muitos=True,
+            nome="codcvn",
+        ).load_many(codcvns)
+
+        for convenio in convenios:
+            resps = coordenadores[convenio["codcvn"]]
             convenio["coordenadores"] = "|".join([r["nompesttd"] for r in resps])
 
-            # Organizacoes
-            orgs = Convenio.listar_organizacoes_convenio(convenio["codcvn"])
+            orgs = organizacoes[convenio["codcvn"]]
             convenio["organizacoes"] = "|".join([o["nomeOrganizacao"] for o in orgs])
 
         return convenios
 
+    _QUERY_COORDENADORES = """
+        SELECT
+            r.codcvn,
+            r.codpes,
+            p.nompesttd
+        FROM RESPCONVSERV r
+        JOIN PESSOA p ON p.codpes = r.codpes
+        WHERE
+            {filtro}
+            AND r.codtiprsp = 1
+    """
+
+    _QUERY_ORGANIZACOES = """
+        SELECT
+            co.codcvn,
+            co.codorg,
+            o.nomrazsoc AS nomeOrganizacao
+        FROM CONVORGAN co
+        JOIN ORGANIZACAO o ON o.codorg = co.codorg
+        WHERE {filtro}
+    """
+
     @staticmethod
     def listar_coordenadores_convenio(codcvn: int) -> list[dict[str, Any]]:
         """
         Método para listar os responsáveis vinculados a um convênio específico.
         """
-        query = """
-            SELECT
-                r.codcvn,
-                r.codpes,
-                p.nompesttd
-            FROM RESPCONVSERV r
-            JOIN PESSOA p ON p.codpes = r.codpes
-            WHERE
-                r.codcvn = CONVERT(int, :codcvn)
-                AND r.codtiprsp = 1
-        """
+        query = Convenio._QUERY_COORDENADORES.format(
+            filtro="r.codcvn = CONVERT(int, :codcvn)"
+        )
         return DB.fetch_all(query, {"codcvn": codcvn})
 
     @staticmethod
@@ -106,13 +135,7 @@ class Convenio:
         """
         Método para listar as organizações externas vinculadas a um convênio específico.
         """
-        query = """
-            SELECT
-                co.codcvn,
-                co.codorg,
-                o.nomrazsoc AS nomeOrganizacao
-            FROM CONVORGAN co
-            JOIN ORGANIZACAO o ON o.codorg = co.codorg
-            WHERE co.codcvn = convert(int, :codcvn)
-        """
+        query = Convenio._QUERY_ORGANIZACOES.format(
+            filtro="co.codcvn = convert(int, :codcvn)"
+        )
         return DB.fetch_all(query, {"codcvn": codcvn})
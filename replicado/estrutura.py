@@ -1,7 +1,9 @@
 import logging
 import os
+from collections.abc import Iterator
 from typing import Any
 
+from replicado.cache import REFERENCE_TTL, cached
 from replicado.connection import DB
 
 nlogger = logging.getLogger(__name__)
@@ -87,6 +89,7 @@ class Estrutura:
         return DB.fetch_all(query, {"codset": codset})
 
     @staticmethod
+    @cached("estrutura", ttl=REFERENCE_TTL)
     def listar_unidades() -> list[dict[str, Any]]:
         """
         Retorna lista com todas as unidades ativas da universidade.
@@ -100,6 +103,7 @@ class Estrutura:
         return DB.fetch_all(query)
 
     @staticmethod
+    @cached("estrutura", ttl=REFERENCE_TTL)
     def obter_unidade(codund: int) -> dict[str, Any] | None:
         """
         Retorna todos campos da tabela UNIDADE.
@@ -132,6 +136,69 @@ class Estrutura:
         query = "SELECT * FROM LOCALUSP WHERE codund = CONVERT(int, :codund)"
         return DB.fetch_all(query, {"codund": codund})
 
+    @staticmethod
+    def iterar_locais_unidade(codund: int | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `listar_locais_unidade`: devolve um local por vez.
+        """
+        if not codund:
+            codund = os.getenv("REPLICADO_CODUNDCLG")
+
+        query = "SELECT * FROM LOCALUSP WHERE codund = CONVERT(int, :codund)"
+        return DB.iter_rows(query, {"codund": codund})
+
+    @staticmethod
+    def colunas_locais_unidade(codund: int | None = None, formato: str = "auto") -> Any:
+        """
+        Versão em colunas de `listar_locais_unidade` (ver `DB.fetch_columns`).
+        """
+        if not codund:
+            codund = os.getenv("REPLICADO_CODUNDCLG")
+
+        query = "SELECT * FROM LOCALUSP WHERE codund = CONVERT(int, :codund)"
+        return DB.fetch_columns(query, {"codund": codund}, formato=formato)
+
+    @staticmethod
+    def pagina_locais_unidade(
+        codund: int | None = None,
+        apos: int | None = None,
+        tamanho: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Versão paginada de `listar_locais_unidade`, ordenada por `codlocusp`:
+        devolve os locais seguintes ao local `apos` (ver `DB.fetch_page`).
+        """
+        if not codund:
+            codund = os.getenv("REPLICADO_CODUNDCLG")
+
+        query = (
+            "SELECT {top}* FROM LOCALUSP "
+            "WHERE {apos} AND codund = CONVERT(int, :codund)"
+        )
+        return DB.fetch_page(
+            query, "codlocusp", {"codund": codund}, apos=apos, tamanho=tamanho
+        )
+
+    @staticmethod
+    def paginas_locais_unidade(
+        codund: int | None = None,
+        apos: int | None = None,
+        tamanho: int | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Percorre todos os locais da unidade, uma página por vez.
+        """
+        if not codund:
+            codund = os.getenv("REPLICADO_CODUNDCLG")
+
+        query = (
+            "SELECT {top}* FROM LOCALUSP "
+            "WHERE {apos} AND codund = CONVERT(int, :codund)"
+        )
+        yield from DB.iter_pages(
+            query, "codlocusp", {"codund": codund}, apos=apos, tamanho=tamanho
+        )
+
     @staticmethod
     def procurar_local(part_codlocusp: str, codund: int = 0) -> list[dict[str, Any]]:
         """
@@ -161,6 +228,7 @@ class Estrutura:
         return DB.fetch_all(query, {"partCodlocusp": f"{part_codlocusp}%"})
 
     @staticmethod
+    @cached("estrutura", ttl=REFERENCE_TTL)
     def listar_colegiados(codund: int) -> list[dict[str, Any]]:
         """
         Retorna lista de órgãos colegiados ativos da unidade (Congregação, Conselhos, etc).
@@ -207,6 +275,7 @@ class Estrutura:
         return DB.fetch_all(query, {"codund": codund})
 
     @staticmethod
+    @cached("estrutura", ttl=REFERENCE_TTL)
     def listar_departamentos(codund: int) -> list[dict[str, Any]]:
         """
         Retorna especificamente os setores que são Departamentos de Ensino.
@@ -0,0 +1,331 @@
+"""
+Exportação em streaming de listagens do replicado para CSV, JSONL ou Parquet.
+
+As linhas são lidas e gravadas em lotes, de modo que a memória usada não
+depende do tamanho da listagem::
+
+    from replicado import Pessoa
+    from replicado.export import exportar
+
+    exportar(Pessoa.iterar_docentes(), "docentes.csv.gz")
+
+Pela linha de comando, o método é informado pelo nome (a versão ``iterar_*``
+é usada quando existir)::
+
+    replicado export Pessoa.listar_docentes docentes.csv.gz
+    replicado export Bempatrimoniado.bens bens.parquet -p filtros='{"stabem": "Ativo"}'
+"""
+
+import bz2
+import csv
+import gzip
+import json
+import logging
+import lzma
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import IO, Any
+
+from .utils import lotes
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = ("csv", "jsonl", "parquet")
+
+_EXTENSOES = {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl", "parquet": "parquet"}
+_COMPRESSOES: dict[str, Callable[..., IO[str]]] = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+_EXTENSOES_COMPRESSAO = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+def resolver(nome: str) -> Callable[..., Iterable[dict[str, Any]]]:
+    """
+    Converte 'Classe.metodo' no método de listagem, preferindo a versão em
+    streaming (ex: 'Pessoa.listar_docentes' -> `Pessoa.iterar_docentes`).
+
+    Args:
+        nome (str): Nome da classe e do método, ex: 'Graduacao.listar_ativos'.
+
+    Returns:
+        Callable: O método, que devolve linhas (dicionários).
+
+    Raises:
+        ValueError: Se a classe ou o método não existirem.
+    """
+    import replicado
+
+    nome_classe, _, metodo = nome.partition(".")
+    classe = getattr(replicado, nome_classe, None)
+    if (
+        not isinstance(classe, type)
+        or not metodo
+        or metodo.startswith("_")
+        or not callable(getattr(classe, metodo, None))
+    ):
+        raise ValueError(f"Método de listagem desconhecido: {nome}")
+    streaming = getattr(classe, "iterar_" + metodo.removeprefix("listar_"), None)
+    return streaming or getattr(classe, metodo)
+
+
+def _inferir(
+    destino: str, formato: str | None, compressao: str | None
+) -> tuple[str, str | None]:
+    """
+    Deduz formato e compressão pela extensão do destino, quando não informados.
+    """
+    base, extensao = os.path.splitext(destino.lower())
+    if extensao in _EXTENSOES_COMPRESSAO:
+        compressao = compressao or _EXTENSOES_COMPRESSAO[extensao]
+        base, extensao = os.path.splitext(base)
+    formato = formato or _EXTENSOES.get(extensao.lstrip("."))
+    if formato not in FORMATOS:
+        raise ValueError(
+            f"Formato de exportação inválido: {formato}. Use um de {FORMATOS}."
+        )
+    if formato != "parquet" and compressao not in (None, *_COMPRESSOES):
+        raise ValueError(
+            f"Compressão inválida: {compressao}. Use uma de {tuple(_COMPRESSOES)}."
+        )
+    return formato, compressao
+
+
+def _json_padrao(valor: Any) -> Any:
+    # datetime/date viram ISO 8601; Decimal e demais tipos, texto
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    return str(valor)
+
+
+class _EscritorCSV:
+    def __init__(self, arquivo: IO[str], delimitador: str) -> None:
+        self.arquivo = arquivo
+        self.delimitador = delimitador
+        self.writer: csv.DictWriter | None = None
+
+    def escrever(self, lote: list[dict[str, Any]]) -> None:
+        if self.writer is None:
+            # Cabeçalho pelas colunas da primeira linha
+            self.writer = csv.DictWriter(
+                self.arquivo,
+                fieldnames=list(lote[0]),
+                delimiter=self.delimitador,
+                extrasaction="ignore",
+            )
+            self.writer.writeheader()
+        self.writer.writerows(lote)
+
+
+class _EscritorJSONL:
+    def __init__(self, arquivo: IO[str]) -> None:
+        self.arquivo = arquivo
+
+    def escrever(self, lote: list[dict[str, Any]]) -> None:
+        self.arquivo.writelines(
+            json.dumps(linha, default=_json_padrao, ensure_ascii=False) + "\n"
+            for linha in lote
+        )
+
+
+class _EscritorParquet:
+    """
+    Grava Parquet em lotes. O esquema sai do primeiro lote e é alargado
+    quando um lote seguinte não cabe nele (ex: float numa coluna até então
+    inteira, ou Decimal com mais casas); nesse caso o que já foi gravado é
+    convertido para o novo esquema.
+    """
+
+    def __init__(self, caminho: str, compressao: str | None) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "A exportação para Parquet requer pyarrow "
+                "(pip install replicado-python[colunar])."
+            ) from e
+        self.pa, self.pq = pa, pq
+        self.caminho = caminho
+        self.compressao = compressao or "snappy"
+        self.writer: Any = None
+        self.schema: Any = None
+
+    def _tipo(self, atual: Any, novo: Any) -> Any:
+        """
+        Menor tipo que comporta os valores dos dois tipos de uma coluna.
+        """
+        pa = self.pa
+        if atual == novo or pa.types.is_null(novo):
+            return atual
+        if pa.types.is_null(atual):
+            return novo
+        if pa.types.is_integer(atual) and pa.types.is_integer(novo):
+            return pa.int64()
+        decimais = [t for t in (atual, novo) if pa.types.is_decimal(t)]
+        numeros = all(
+            pa.types.is_integer(t) or pa.types.is_decimal(t) for t in (atual, novo)
+        )
+        if decimais and numeros:
+            return pa.decimal128(38, max(t.scale for t in decimais))
+        if all(
+            pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t)
+            for t in (atual, novo)
+        ):
+            return pa.float64()
+        return pa.string()
+
+    def _inicial(self, schema: Any) -> Any:
+        pa = self.pa
+        campos = []
+        for campo in schema:
+            tipo = campo.type
+            if pa.types.is_null(tipo):
+                # Colunas só com nulos no primeiro lote viram texto
+                tipo = pa.string()
+            elif pa.types.is_decimal(tipo):
+                tipo = pa.decimal128(38, tipo.scale)
+            elif pa.types.is_integer(tipo):
+                tipo = pa.int64()
+            campos.append(pa.field(campo.name, tipo))
+        return pa.schema(campos)
+
+    def _alargar(self, schema: Any) -> None:
+        """
+        Troca o esquema do arquivo, regravando os lotes já escritos.
+        """
+        self.writer.close()
+        anterior = f"{self.caminho}.anterior"
+        os.replace(self.caminho, anterior)
+        try:
+            self.writer = self.pq.ParquetWriter(
+                self.caminho, schema, compression=self.compressao
+            )
+            for lote in self.pq.ParquetFile(anterior).iter_batches():
+                tabela = self.pa.Table.from_batches([lote])
+                self.writer.write_table(tabela.cast(schema))
+        finally:
+            os.remove(anterior)
+        self.schema = schema
+
+    def escrever(self, lote: list[dict[str, Any]]) -> None:
+        pa = self.pa
+        tabela = pa.Table.from_pylist(lote)
+        if self.writer is None:
+            self.schema = self._inicial(tabela.schema)
+            self.writer = self.pq.ParquetWriter(
+                self.caminho, self.schema, compression=self.compressao
+            )
+        else:
+            tabela = tabela.select(self.schema.names)
+            schema = pa.schema(
+                pa.field(atual.name, self._tipo(atual.type, novo.type))
+                for atual, novo in zip(self.schema, tabela.schema, strict=True)
+            )
+            if schema != self.schema:
+                logger.debug(f"Esquema Parquet alargado para {schema}")
+                self._alargar(schema)
+        self.writer.write_table(tabela.cast(self.schema))
+
+    def fechar(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            self.pq.write_table(self.pa.table({}), self.caminho)
+
+
+@contextmanager
+def _escritor(
+    destino: str, formato: str, compressao: str | None, delimitador: str
+) -> Iterator[Any]:
+    """
+    Abre o escritor do formato pedido.
+
+    Arquivos são gravados num temporário e só substituem o destino no fim,
+    para que uma exportação interrompida não deixe um arquivo pela metade.
+    """
+    if destino == "-":
+        if formato == "parquet" or compressao:
+            raise ValueError(
+                "A saída padrão aceita apenas CSV ou JSONL sem compressão."
+            )
+        yield (
+            _EscritorCSV(sys.stdout, delimitador)
+            if formato == "csv"
+            else _EscritorJSONL(sys.stdout)
+        )
+        return
+
+    temporario = f"{destino}.tmp"
+    try:
+        if formato == "parquet":
+            escritor = _EscritorParquet(temporario, compressao)
+            try:
+                yield escritor
+            finally:
+                escritor.fechar()
+        else:
+            abrir = _COMPRESSOES.get(compressao, open)
+            with abrir(temporario, "wt", encoding="utf-8", newline="") as arquivo:
+                yield (
+                    _EscritorCSV(arquivo, delimitador)
+                    if formato == "csv"
+                    else _EscritorJSONL(arquivo)
+                )
+        os.replace(temporario, destino)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def exportar(
+    linhas: Iterable[dict[str, Any]],
+    destino: str,
+    formato: str | None = None,
+    compressao: str | None = None,
+    tamanho_lote: int | None = None,
+    progresso: Callable[[int], None] | None = None,
+    delimitador: str = ",",
+) -> int:
+    """
+    Grava linhas (dicionários) em CSV, JSONL ou Parquet, um lote por vez.
+
+    Use com os métodos ``iterar_*`` (ou `DB.iter_rows`) para que nem a leitura
+    nem a escrita mantenham a listagem inteira em memória.
+
+    Args:
+        linhas (Iterable[dict]): Linhas a exportar.
+        destino (str): Arquivo de saída, ou '-' para a saída padrão.
+        formato (str, optional): 'csv', 'jsonl' ou 'parquet'. Padrão: pela
+            extensão do destino (ex: 'dados.jsonl.gz').
+        compressao (str, optional): 'gzip', 'bz2' ou 'xz' para CSV/JSONL; para
+            Parquet, o codec interno ('snappy', padrão, 'gzip', 'zstd'...).
+            Padrão: pela extensão ('.gz', '.bz2', '.xz').
+        tamanho_lote (int, optional): Linhas por escrita. Padrão:
+            ``DB.BATCH_SIZE``.
+        progresso (Callable[[int], None], optional): Chamada após cada lote com
+            o total de linhas gravadas até então.
+        delimitador (str): Separador de campos do CSV. Padrão: ','.
+
+    Returns:
+        int: Total de linhas exportadas.
+
+    Raises:
+        ValueError: Se o formato ou a compressão forem inválidos.
+        ImportError: Se o formato Parquet for pedido sem pyarrow instalado.
+    """
+    from replicado.connection import DB
+
+    formato, compressao = _inferir(destino, formato, compressao)
+    total = 0
+    with _escritor(destino, formato, compressao, delimitador) as escritor:
+        for lote in lotes(linhas, tamanho_lote or DB.BATCH_SIZE):
+            escritor.escrever(lote)
+            total += len(lote)
+            if progresso is not None:
+                progresso(total)
+    logger.info(f"{total} linhas exportadas para {destino} ({formato})")
+    return total
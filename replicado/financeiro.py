@@ -1,5 +1,6 @@
 import logging
 import os
+from collections.abc import Iterator
 from typing import Any
 
 from replicado.connection import DB
@@ -12,6 +13,15 @@ class Financeiro:
     Classe para métodos relacionados a dados financeiros, patrimônio, almoxarifado e convênios.
     """
 
+    # Bens ativos de um local, no formato de DB.fetch_page
+    _QUERY_PAGINA_BENS_POR_LOCAL = """
+        SELECT {top}numpat, codbem, stabem, sglcendsp
+        FROM BEMPATRIMONIADO
+        WHERE {apos}
+        AND codlocusp = :codlocusp
+        AND stabem = 'Ativo'
+    """
+
     @staticmethod
     def listar_centros_despesas() -> list[dict[str, Any]]:
         """
@@ -133,6 +143,44 @@ class Financeiro:
         params = {"codlocusp": codlocusp}
         return DB.fetch_all(query, params)
 
+    @staticmethod
+    def pagina_bens_por_local(
+        codlocusp: int, apos: str | None = None, tamanho: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Versão paginada de `listar_bens_por_local`, ordenada por `numpat`.
+
+        :param codlocusp: Código do Local USP.
+        :param apos: Último patrimônio da página anterior (None: primeira).
+        :param tamanho: Bens por página (padrão: DB.PAGE_SIZE).
+        :return: Página de bens, com a chave da próxima em `proxima`.
+        """
+        return DB.fetch_page(
+            Financeiro._QUERY_PAGINA_BENS_POR_LOCAL,
+            "numpat",
+            {"codlocusp": codlocusp},
+            apos=apos,
+            tamanho=tamanho,
+        )
+
+    @staticmethod
+    def paginas_bens_por_local(
+        codlocusp: int, apos: str | None = None, tamanho: int | None = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Percorre todos os bens ativos de um local, uma página por vez.
+
+        :param codlocusp: Código do Local USP.
+        :return: Iterador de páginas de bens.
+        """
+        yield from DB.iter_pages(
+            Financeiro._QUERY_PAGINA_BENS_POR_LOCAL,
+            "numpat",
+            {"codlocusp": codlocusp},
+            apos=apos,
+            tamanho=tamanho,
+        )
+
     @staticmethod
     def listar_doacoes_recebidas(codund: int) -> list[dict[str, Any]]:
         """
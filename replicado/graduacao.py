@@ -1,8 +1,10 @@
 import logging
 import os
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from typing import Any
 
+from replicado.cache import REFERENCE_TTL, cached
 from replicado.connection import DB
 
 nlogger = logging.getLogger(__name__)
@@ -26,7 +28,7 @@ class Graduacao:
         """
         query = "SELECT nomcnhpes FROM PESSOA WHERE codpes = :codpes AND stautlnomsoc = 'S'"
         result = DB.fetch(query, {"codpes": codpes})
-        return result["nomcnhpes"].strip() if result and result["nomcnhpes"] else None
+        return result["nomcnhpes"] if result and result["nomcnhpes"] else None
 
     @staticmethod
     def obter_vencimento_identidade(codpes: int) -> str | None:
@@ -85,10 +87,7 @@ class Graduacao:
             WHERE YEAR(pg.dtaing) = :ano_ingresso
             ORDER BY p.nompes ASC
         """
-        result = DB.fetch_all(query, {"ano_ingresso": ano_ingresso})
-        for row in result:
-            row["nompes"] = row["nompes"].strip()
-        return result
+        return DB.fetch_all(query, {"ano_ingresso": ano_ingresso})
 
     @staticmethod
     def obter_notas_ingresso(codpes: int) -> list[dict[str, Any]]:
@@ -107,10 +106,7 @@ class Graduacao:
             INNER JOIN TIPOMATERIAING t ON n.codtipmiaing = t.codtipmiaing
             WHERE n.codpes = :codpes
         """
-        result = DB.fetch_all(query, {"codpes": codpes})
-        for row in result:
-            row["tipmiaing"] = row["tipmiaing"].strip()
-        return result
+        return DB.fetch_all(query, {"codpes": codpes})
 
     @staticmethod
     def listar_trancamentos_aluno(codpes: int) -> list[dict[str, Any]]:
@@ -129,11 +125,7 @@ class Graduacao:
             WHERE h.codpes = :codpes AND (h.stapgm = 'T' OR h.stapgm = 'P')
             ORDER BY h.dtaoco DESC
         """
-        result = DB.fetch_all(query, {"codpes": codpes})
-        for row in result:
-            if row["tiptrc"]:
-                row["tiptrc"] = row["tiptrc"].strip()
-        return result
+        return DB.fetch_all(query, {"codpes": codpes})
 
     @staticmethod
     def verifica(codpes: int, codundclgi: int) -> bool:
@@ -160,21 +152,13 @@ class Graduacao:
         return False
 
     @staticmethod
-    def listar_ativos(
+    def _query_ativos(
         codcur: int | None = None,
         ano_ingresso: int | None = None,
         parte_nome: str | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> tuple[str, dict[str, Any]]:
         """
-        Lista alunos de graduação ativos na unidade.
-
-        Args:
-            codcur (int, optional): Filtro por código do curso.
-            ano_ingresso (int, optional): Filtro por ano de ingresso.
-            parte_nome (str, optional): Filtro por parte do nome (busca simples).
-
-        Returns:
-            List[Dict[str, Any]]: Lista de alunos.
+        Monta a query (e os parâmetros) de alunos de graduação ativos na unidade.
         """
         codundclg = os.getenv("REPLICADO_CODUNDCLG")
 
@@ -207,7 +191,45 @@ class Graduacao:
         ORDER BY L.nompes ASC
         """
 
-        return DB.fetch_all(query, params)
+        return query, params
+
+    @staticmethod
+    def listar_ativos(
+        codcur: int | None = None,
+        ano_ingresso: int | None = None,
+        parte_nome: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Lista alunos de graduação ativos na unidade.
+
+        Args:
+            codcur (int, optional): Filtro por código do curso.
+            ano_ingresso (int, optional): Filtro por ano de ingresso.
+            parte_nome (str, optional): Filtro por parte do nome (busca simples).
+
+        Returns:
+            List[Dict[str, Any]]: Lista de alunos.
+        """
+        return DB.fetch_all(*Graduacao._query_ativos(codcur, ano_ingresso, parte_nome))
+
+    @staticmethod
+    def iterar_ativos(
+        codcur: int | None = None,
+        ano_ingresso: int | None = None,
+        parte_nome: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `listar_ativos`: devolve um aluno por vez.
+
+        Args:
+            codcur (int, optional): Filtro por código do curso.
+            ano_ingresso (int, optional): Filtro por ano de ingresso.
+            parte_nome (str, optional): Filtro por parte do nome (busca simples).
+
+        Returns:
+            Iterator[Dict[str, Any]]: Iterador de alunos.
+        """
+        return DB.iter_rows(*Graduacao._query_ativos(codcur, ano_ingresso, parte_nome))
 
     @staticmethod
     def contar_ativos() -> int:
@@ -275,8 +297,7 @@ class Graduacao:
         """
         result = DB.fetch_all(query, {"codpes": codpes})
         for row in result:
-            row["coddis"] = row["coddis"].strip()
-            row["nominstext"] = row["nominstext"].strip() if row["nominstext"] else None
+            row["nominstext"] = row["nominstext"] or None
         return result
 
     @staticmethod
@@ -299,10 +320,7 @@ class Graduacao:
             WHERE m.coddis = :coddis AND m.verdis = :verdis AND m.codtur = :codtur
         """
         params = {"coddis": coddis, "verdis": verdis, "codtur": codtur}
-        result = DB.fetch_all(query, params)
-        for row in result:
-            row["nompes"] = row["nompes"].strip()
-        return result
+        return DB.fetch_all(query, params)
 
     @staticmethod
     def obter_horario_turma(coddis: str, verdis: int, codtur: str) -> list[dict[str, Any]]:
@@ -326,7 +344,7 @@ class Graduacao:
         params = {"coddis": coddis, "verdis": verdis, "codtur": codtur}
         result = DB.fetch_all(query, params)
         for row in result:
-            row["codesp"] = str(row["codesp"]).strip() if row["codesp"] else None
+            row["codesp"] = str(row["codesp"]) if row["codesp"] else None
         return result
 
     @staticmethod
@@ -370,11 +388,7 @@ class Graduacao:
             WHERE coddisteo = :coddis AND verdisteo = :verdis AND codturteo = :codtur
         """
         params = {"coddis": coddis, "verdis": verdis, "codtur": codtur}
-        result = DB.fetch_all(query, params)
-        for row in result:
-            row["coddispra"] = row["coddispra"].strip()
-            row["codturpra"] = row["codturpra"].strip()
-        return result
+        return DB.fetch_all(query, params)
 
     @staticmethod
     def programa(codpes: int) -> dict[str, Any] | None:
@@ -396,6 +410,7 @@ class Graduacao:
         return DB.fetch(query, {"codpes": codpes})
 
     @staticmethod
+    @cached("graduacao", ttl=REFERENCE_TTL)
     def nome_curso(codcur: int) -> str | None:
         """
         Retorna o nome do curso.
@@ -411,6 +426,7 @@ class Graduacao:
         return result["nomcur"] if result else None
 
     @staticmethod
+    @cached("graduacao", ttl=REFERENCE_TTL)
     def nome_habilitacao(codhab: int, codcur: int) -> str | None:
         """
         Retorna o nome da habilitação.
@@ -472,6 +488,7 @@ class Graduacao:
         return DB.fetch_all(sql)
 
     @staticmethod
+    @cached("graduacao", ttl=REFERENCE_TTL)
     def nome_disciplina(coddis: str) -> str | None:
         """
         Retorna o nome da disciplina.
@@ -845,13 +862,7 @@ class Graduacao:
             WHERE r.codpes = :codpes
             ORDER BY r.dtacadrqm DESC
         """
-        result = DB.fetch_all(query, {"codpes": codpes})
-        for row in result:
-            row["tiprqm"] = row["tiprqm"].strip()
-            row["starqm"] = row["starqm"].strip()
-            if row["rstfim"]:
-                row["rstfim"] = row["rstfim"].strip()
-        return result
+        return DB.fetch_all(query, {"codpes": codpes})
 
     @staticmethod
     def obter_detalhes_requerimento(codrqm: int) -> dict[str, Any]:
@@ -870,9 +881,6 @@ class Graduacao:
             WHERE codrqm = :codrqm
         """
         result = DB.fetch(query, {"codrqm": codrqm})
-        if result:
-            if result.get("rstfim"):
-                result["rstfim"] = result["rstfim"].strip()
         return result if result else {}
 
     @staticmethod
@@ -899,12 +907,7 @@ class Graduacao:
             AND pr.tiping = 'Aluno Especial'
         """
         params = {"coddis": coddis, "verdis": verdis, "codtur": codtur}
-        result = DB.fetch_all(query, params)
-        for row in result:
-            row["nompes"] = row["nompes"].strip()
-            if row["rstfim"]:
-                row["rstfim"] = row["rstfim"].strip()
-        return result
+        return DB.fetch_all(query, params)
 
     @staticmethod
     def listar_disciplinas_por_prefixo(pfxdis: str) -> list[dict[str, Any]]:
@@ -923,11 +926,7 @@ class Graduacao:
             WHERE d.coddis LIKE :pfxdis
             AND d.verdis = (SELECT MAX(v.verdis) FROM DISCIPLINAGR v WHERE v.coddis = d.coddis)
         """
-        result = DB.fetch_all(query, {"pfxdis": f"{pfxdis}%"})
-        for row in result:
-            row["coddis"] = row["coddis"].strip()
-            row["nomdis"] = row["nomdis"].strip()
-        return result
+        return DB.fetch_all(query, {"pfxdis": f"{pfxdis}%"})
 
     @staticmethod
     def obter_normas_habilitacao(codcur: int, codhab: int) -> list[dict[str, Any]]:
@@ -946,10 +945,7 @@ class Graduacao:
             FROM NORMARECONHECHABILGR
             WHERE codcurgrd = :codcur AND codhab = :codhab
         """
-        result = DB.fetch_all(query, {"codcur": codcur, "codhab": codhab})
-        for row in result:
-            row["tippubnor"] = row["tippubnor"].strip()
-        return result
+        return DB.fetch_all(query, {"codcur": codcur, "codhab": codhab})
 
     @staticmethod
     def obter_data_limite_conclusao(codpes: int) -> str | None:
@@ -992,11 +988,7 @@ class Graduacao:
             WHERE pg.stapgm = :stapgm AND l.codundclg IN ({codundclg})
             AND l.tipvin = 'ALUNOGR'
         """
-        result = DB.fetch_all(query, {"stapgm": stapgm})
-        for row in result:
-            row["nompes"] = row["nompes"].strip()
-            row["stapgm"] = row["stapgm"].strip()
-        return result
+        return DB.fetch_all(query, {"stapgm": stapgm})
 
     @staticmethod
     def listar_disciplinas_com_vagas_extracurriculares() -> list[dict[str, Any]]:
@@ -1012,12 +1004,7 @@ class Graduacao:
             INNER JOIN DISCIPLINAGR d ON t.coddis = d.coddis AND t.verdis = d.verdis
             WHERE t.numvagecr > 0 AND t.statur = 'A'
         """
-        result = DB.fetch_all(query)
-        for row in result:
-            row["coddis"] = row["coddis"].strip()
-            row["nomdis"] = row["nomdis"].strip()
-            row["codtur"] = row["codtur"].strip()
-        return result
+        return DB.fetch_all(query)
 
     @staticmethod
     def listar_disciplinas_aluno(
@@ -1076,28 +1063,102 @@ class Graduacao:
         soma = 0.0
 
         for row in disciplinas:
-            creaul = row["creaul"] or 0
-            cretrb = row["cretrb"] or 0
-            total_cre = creaul + cretrb
-
-            # PHP: $nota = $row['notfim2'] ?: $row['notfim'];
-            # If notfim2 is not null/empty use it, else notfim
-            nota_val = row["notfim2"]
-            if nota_val is None or nota_val == "":
-                nota_val = row["notfim"]
-
-            if nota_val is not None and str(nota_val).strip() != "":
-                try:
-                    # Replace comma with dot if necessary usually sql returns float or decimal
-                    # python driver might return float direct
-                    nota = float(nota_val)
-                    creditos += total_cre
-                    soma += nota * total_cre
-                except ValueError:
-                    pass
+            nota = Graduacao._nota_final(row)
+            if nota is not None:
+                total_cre = (row["creaul"] or 0) + (row["cretrb"] or 0)
+                creditos += total_cre
+                soma += nota * total_cre
 
         return round(soma / creditos, 1) if creditos > 0 else 0.0
 
+    @staticmethod
+    def _nota_final(row: dict[str, Any]) -> float | None:
+        """
+        Nota usada na média ponderada: notfim2 (recuperação) se houver, senão
+        notfim. Retorna None se a disciplina não tiver nota numérica.
+        """
+        # PHP: $nota = $row['notfim2'] ?: $row['notfim'];
+        nota_val = row["notfim2"]
+        if nota_val is None or nota_val == "":
+            nota_val = row["notfim"]
+
+        if nota_val is None or str(nota_val).strip() == "":
+            return None
+        try:
+            # O driver devolve float ou Decimal
+            return float(nota_val)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def obter_medias_ponderadas(
+        codpes_list: Iterable[int],
+        codpgm: int | None = None,
+        rstfim: list[str] | None = None,
+    ) -> dict[int, float]:
+        """
+        Versão em lote de `obter_media_ponderada`, para turmas inteiras.
+
+        Busca o histórico de até DB.IN_LOTE alunos por consulta (já restrito
+        ao último programa de cada um, sem subconsulta correlacionada) e
+        acumula créditos e notas numa única passada.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP dos alunos.
+            codpgm (int, optional): Programa; padrão: o mais recente de cada aluno.
+            rstfim (list[str], optional): Resultados considerados. Padrão:
+                ['A', 'RN', 'RA', 'RF'] (média "suja"); ['A'] para a "limpa".
+
+        Returns:
+            dict[int, float]: Média ponderada por codpes, arredondada em uma
+                casa (0.0 para quem não tem disciplinas com nota).
+        """
+        if rstfim is None:
+            rstfim = ["A", "RN", "RA", "RF"]
+        codpes_list = list(dict.fromkeys(int(c) for c in codpes_list))
+
+        query_rstfim_null = "OR H.rstfim IS NULL" if "NULL" in rstfim else ""
+        rstfim_str = "', '".join(r for r in rstfim if r != "NULL")
+        rstfim_clause = f"(H.rstfim IN ('{rstfim_str}') {query_rstfim_null})"
+
+        params = {}
+        if codpgm is None:
+            join_codpgm = """
+                INNER JOIN (
+                    SELECT codpes, MAX(codpgm) AS codpgm FROM HISTESCOLARGR
+                    WHERE codpes IN ({lista_in}) GROUP BY codpes
+                ) P ON P.codpes = H.codpes AND P.codpgm = H.codpgm
+            """
+            query_codpgm = ""
+        else:
+            join_codpgm = ""
+            query_codpgm = "AND H.codpgm = CONVERT(INT,:codpgm)"
+            params["codpgm"] = codpgm
+
+        query = f"""
+            SELECT H.codpes, D.creaul, D.cretrb, H.notfim, H.notfim2
+            FROM HISTESCOLARGR H
+            INNER JOIN DISCIPLINAGR D ON H.coddis = D.coddis AND H.verdis = D.verdis
+            {join_codpgm}
+            WHERE H.codpes IN ({{lista_in}})
+                AND {rstfim_clause}
+                {query_codpgm}
+        """
+
+        creditos = dict.fromkeys(codpes_list, 0)
+        somas = dict.fromkeys(codpes_list, 0.0)
+        for row in DB.fetch_all_in(query, codpes_list, params):
+            nota = Graduacao._nota_final(row)
+            if nota is not None:
+                total_cre = (row["creaul"] or 0) + (row["cretrb"] or 0)
+                creditos[row["codpes"]] += total_cre
+                somas[row["codpes"]] += nota * total_cre
+
+        return {
+            codpes: round(somas[codpes] / cre, 1) if cre > 0 else 0.0
+            for codpes, cre in creditos.items()
+        }
+
     @staticmethod
     def obter_media_ponderada_limpa(codpes: int, codpgm: int | None = None) -> float:
         return Graduacao.obter_media_ponderada(codpes, codpgm, ["A"])
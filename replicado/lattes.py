@@ -1,30 +1,411 @@
 import json
 import logging
+import os
+import pickle
+import sqlite3
+import threading
 import time
 import xml.etree.ElementTree as ET
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from typing import Any
 
 from replicado.connection import DB
-from replicado.utils import etree_to_dict, get_path, unzip
+from replicado.utils import etree_to_dict, extrair_secoes, get_path, lotes, unzip
 
 logger = logging.getLogger(__name__)
 
 
+class LattesCache:
+    """
+    Cache em memória dos currículos Lattes já convertidos, limitado por tamanho.
+
+    Cada entrada guarda a data de atualização do currículo (dtaultalt) no
+    momento da carga. Depois de `revalidar` segundos, a data é consultada de
+    novo e a entrada só é descartada se o currículo tiver mudado. Quando o
+    total ultrapassa `max_bytes`, os currículos menos usados são descartados.
+
+    O tamanho de cada entrada é estimado pelo tamanho do XML que a originou.
+    """
+
+    def __init__(self, max_bytes: int, revalidar: float) -> None:
+        self.max_bytes = max_bytes
+        self.revalidar = revalidar
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidacoes = 0
+        # codpes => (versao, verificado_em, peso, dados)
+        self._dados: OrderedDict[int, tuple[Any, float, int, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, codpes: int, versao_atual: Callable[[], Any] | None = None
+    ) -> dict | None:
+        """
+        Retorna o currículo em cache, ou None se ausente ou desatualizado.
+
+        Args:
+            codpes (int): Número USP.
+            versao_atual (Callable, optional): Função que devolve a dtaultalt atual,
+                chamada apenas quando a entrada precisa ser revalidada.
+        """
+        with self._lock:
+            entrada = self._dados.get(codpes)
+            if entrada is None:
+                self.misses += 1
+                return None
+            versao, verificado_em, peso, dados = entrada
+            if time.monotonic() - verificado_em < self.revalidar:
+                self._dados.move_to_end(codpes)
+                self.hits += 1
+                return dados
+
+        # Consulta fora do lock para não bloquear outras threads
+        versao_nova = versao_atual() if versao_atual else versao
+        with self._lock:
+            if self._dados.get(codpes) is not entrada:
+                self.misses += 1
+                return None
+            if versao_nova != versao:
+                self._remover(codpes)
+                self.invalidacoes += 1
+                self.misses += 1
+                return None
+            self._dados[codpes] = (versao, time.monotonic(), peso, dados)
+            self._dados.move_to_end(codpes)
+            self.hits += 1
+            return dados
+
+    def set(self, codpes: int, versao: Any, dados: dict, peso: int) -> None:
+        """
+        Armazena o currículo, descartando os menos usados se preciso.
+        """
+        if peso > self.max_bytes:
+            return
+        with self._lock:
+            if codpes in self._dados:
+                self._remover(codpes)
+            self._dados[codpes] = (versao, time.monotonic(), peso, dados)
+            self.bytes += peso
+            while self.bytes > self.max_bytes:
+                antigo = next(iter(self._dados))
+                self._remover(antigo)
+                self.evictions += 1
+
+    def _remover(self, codpes: int) -> None:
+        self.bytes -= self._dados.pop(codpes)[2]
+
+    def clear(self) -> None:
+        """
+        Descarta todos os currículos em cache.
+        """
+        with self._lock:
+            self._dados.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Retorna contadores de uso do cache.
+        """
+        with self._lock:
+            return {
+                "itens": len(self._dados),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidacoes": self.invalidacoes,
+            }
+
+
+class LattesStore:
+    """
+    Armazenamento local e persistente dos currículos Lattes já convertidos.
+
+    Os currículos ficam num arquivo SQLite, indexados por codpes e pela
+    dtaultalt do currículo, serializados com pickle (protocolo 5) e comprimidos
+    com zlib. Sobrevive a reinícios do processo e pode ser compartilhado entre
+    processos: só os currículos cuja dtaultalt mudou precisam ser baixados de
+    novo do replicado.
+    """
+
+    def __init__(self, caminho: str) -> None:
+        self.caminho = caminho
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Uma conexão por thread e por processo (conexões não sobrevivem a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lattes (
+                    codpes INTEGER PRIMARY KEY,
+                    dtaultalt TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    gravado REAL NOT NULL,
+                    dados BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS marcas (nome TEXT PRIMARY KEY, valor TEXT)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _chave_versao(versao: Any) -> str:
+        return versao.isoformat() if hasattr(versao, "isoformat") else str(versao)
+
+    def get(self, codpes: int, versao: Any) -> tuple[dict, int] | None:
+        """
+        Retorna (lattes, tamanho do XML) se o currículo guardado tiver a
+        dtaultalt informada; caso contrário, None.
+        """
+        row = (
+            self._conn()
+            .execute(
+                "SELECT tamanho, dados FROM lattes WHERE codpes = ? AND dtaultalt = ?",
+                (codpes, self._chave_versao(versao)),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return pickle.loads(zlib.decompress(row[1])), row[0]
+
+    def get_many(
+        self, versoes: dict[int, Any]
+    ) -> Iterator[tuple[int, dict[str, Any], int]]:
+        """
+        Busca vários currículos de uma vez, a partir de {codpes: dtaultalt}.
+
+        Yields:
+            tuple: (codpes, lattes, tamanho do XML) dos que estão atualizados.
+        """
+        conn = self._conn()
+        for lote in lotes(list(versoes), 500):
+            marcadores = ", ".join("?" * len(lote))
+            rows = conn.execute(
+                "SELECT codpes, dtaultalt, tamanho, dados FROM lattes "
+                f"WHERE codpes IN ({marcadores})",
+                lote,
+            )
+            for codpes, dtaultalt, tamanho, dados in rows:
+                if dtaultalt == self._chave_versao(versoes[codpes]):
+                    yield codpes, pickle.loads(zlib.decompress(dados)), tamanho
+
+    def versoes(self, codpes_list: list[int]) -> dict[int, str]:
+        """
+        Retorna a dtaultalt (como texto) dos currículos guardados, sem lê-los.
+        """
+        conn = self._conn()
+        versoes = {}
+        for lote in lotes(codpes_list, 500):
+            marcadores = ", ".join("?" * len(lote))
+            rows = conn.execute(
+                f"SELECT codpes, dtaultalt FROM lattes WHERE codpes IN ({marcadores})",
+                lote,
+            )
+            versoes.update(rows)
+        return versoes
+
+    def set(self, codpes: int, versao: Any, dados: dict, tamanho: int) -> None:
+        """
+        Grava (ou substitui) o currículo da pessoa.
+        """
+        blob = zlib.compress(pickle.dumps(dados, protocol=5))
+        self._conn().execute(
+            "INSERT OR REPLACE INTO lattes VALUES (?, ?, ?, ?, ?)",
+            (codpes, self._chave_versao(versao), tamanho, time.time(), blob),
+        )
+
+    def remove(self, codpes: int) -> None:
+        """
+        Remove o currículo da pessoa.
+        """
+        self._conn().execute("DELETE FROM lattes WHERE codpes = ?", (codpes,))
+
+    def obter_marca(self, nome: str) -> str | None:
+        """
+        Retorna o valor de uma marca (ex: data da última sincronização).
+        """
+        row = (
+            self._conn()
+            .execute("SELECT valor FROM marcas WHERE nome = ?", (nome,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def gravar_marca(self, nome: str, valor: str) -> None:
+        """
+        Grava o valor de uma marca.
+        """
+        self._conn().execute(
+            "INSERT OR REPLACE INTO marcas VALUES (?, ?)", (nome, valor)
+        )
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM lattes").fetchone()[0]
+
+
 class Lattes:
     """
     Classe para métodos relacionados ao currículo Lattes.
     """
 
-    _cache: dict[int, tuple[float, dict]] = {}
-    _TTL: int = 3600
+    _cache = LattesCache(
+        max_bytes=int(os.getenv("REPLICADO_LATTES_CACHE_BYTES", 64 * 1024 * 1024)),
+        revalidar=float(os.getenv("REPLICADO_LATTES_REVALIDAR", "300")),
+    )
+
+    # Armazenamento persistente opcional (REPLICADO_LATTES_STORE=/caminho.db)
+    _store: LattesStore | None = (
+        LattesStore(os.environ["REPLICADO_LATTES_STORE"])
+        if os.getenv("REPLICADO_LATTES_STORE")
+        else None
+    )
+
+    # Currículos por consulta nos métodos em lote (obter_zips, obter_arrays)
+    LOTE: int = int(os.getenv("REPLICADO_LATTES_LOTE", "50"))
+
+    _SQL_ID = DB.compilar(
+        "SELECT idfpescpq from DIM_PESSOA_XMLUSP WHERE codpes = CONVERT(int, :codpes)"
+    )
+    _SQL_VERSAO = DB.compilar(
+        "SELECT dtaultalt from DIM_PESSOA_XMLUSP WHERE codpes = CONVERT(int, :codpes)"
+    )
+
+    # Seções disponíveis em extrair_relatorio:
+    # nome => (método, seção do XML, argumentos fixos, aceita filtro)
+    _SECOES_RELATORIO: dict[str, tuple[str, str, dict[str, Any], bool]] = {
+        "artigos": (
+            "listar_artigos",
+            "PRODUCAO-BIBLIOGRAFICA.ARTIGOS-PUBLICADOS",
+            {},
+            True,
+        ),
+        "livros": (
+            "listar_livros_publicados",
+            "PRODUCAO-BIBLIOGRAFICA.LIVROS-E-CAPITULOS",
+            {},
+            True,
+        ),
+        "capitulos": (
+            "listar_capitulos_livros",
+            "PRODUCAO-BIBLIOGRAFICA.LIVROS-E-CAPITULOS",
+            {},
+            True,
+        ),
+        "anais": (
+            "listar_trabalhos_anais",
+            "PRODUCAO-BIBLIOGRAFICA.TRABALHOS-EM-EVENTOS",
+            {},
+            True,
+        ),
+        "outras_producoes_bibliograficas": (
+            "listar_outras_producoes_bibliograficas",
+            "PRODUCAO-BIBLIOGRAFICA.DEMAIS-TIPOS-DE-PRODUCAO-BIBLIOGRAFICA",
+            {},
+            True,
+        ),
+        "trabalhos_tecnicos": (
+            "listar_trabalhos_tecnicos",
+            "PRODUCAO-TECNICA.TRABALHO-TECNICO",
+            {},
+            True,
+        ),
+        "apresentacoes": (
+            "listar_apresentacao_trabalho",
+            "PRODUCAO-TECNICA.DEMAIS-TIPOS-DE-PRODUCAO-TECNICA",
+            {},
+            True,
+        ),
+        "organizacao_eventos": (
+            "listar_organizacao_evento",
+            "PRODUCAO-TECNICA.DEMAIS-TIPOS-DE-PRODUCAO-TECNICA",
+            {},
+            True,
+        ),
+        "outras_producoes_tecnicas": (
+            "listar_outras_producoes_tecnicas",
+            "PRODUCAO-TECNICA.DEMAIS-TIPOS-DE-PRODUCAO-TECNICA",
+            {},
+            True,
+        ),
+        "cursos_curta_duracao": (
+            "listar_cursos_curta_duracao",
+            "PRODUCAO-TECNICA.DEMAIS-TIPOS-DE-PRODUCAO-TECNICA",
+            {},
+            True,
+        ),
+        "relatorios_pesquisa": (
+            "listar_relatorio_pesquisa",
+            "PRODUCAO-TECNICA.DEMAIS-TIPOS-DE-PRODUCAO-TECNICA",
+            {},
+            True,
+        ),
+        "material_didatico": (
+            "listar_material_didatico_instrucional",
+            "PRODUCAO-TECNICA.DEMAIS-TIPOS-DE-PRODUCAO-TECNICA",
+            {},
+            True,
+        ),
+        "premios": ("listar_premios", "DADOS-GERAIS.PREMIOS-TITULOS", {}, False),
+        "resumo_cv": ("retornar_resumo_cv", "DADOS-GERAIS.RESUMO-CV", {}, False),
+        "linhas_pesquisa": (
+            "listar_linhas_pesquisa",
+            "DADOS-GERAIS.ATUACOES-PROFISSIONAIS",
+            {},
+            False,
+        ),
+        "teses_doutorado": (
+            "listar_teses",
+            "DADOS-GERAIS.FORMACAO-ACADEMICA-TITULACAO",
+            {"tipo": "DOUTORADO"},
+            False,
+        ),
+        "teses_mestrado": (
+            "listar_teses",
+            "DADOS-GERAIS.FORMACAO-ACADEMICA-TITULACAO",
+            {"tipo": "MESTRADO"},
+            False,
+        ),
+        "livre_docencia": (
+            "obter_livre_docencia",
+            "DADOS-GERAIS.FORMACAO-ACADEMICA-TITULACAO",
+            {},
+            False,
+        ),
+        "bancas_mestrado": (
+            "retornar_banca_mestrado",
+            "DADOS-COMPLEMENTARES.PARTICIPACAO-EM-BANCA-TRABALHOS-CONCLUSAO",
+            {},
+            False,
+        ),
+        "bancas_doutorado": (
+            "retornar_banca_doutorado",
+            "DADOS-COMPLEMENTARES.PARTICIPACAO-EM-BANCA-TRABALHOS-CONCLUSAO",
+            {},
+            False,
+        ),
+    }
 
     @staticmethod
     def id(codpes: int) -> str | bool:
         """
         Recebe o número USP e retorna o ID Lattes da pessoa.
         """
-        query = "SELECT idfpescpq from DIM_PESSOA_XMLUSP WHERE codpes = CONVERT(int, :codpes)"
-        result = DB.fetch(query, {"codpes": codpes})
+        result = DB.fetch(Lattes._SQL_ID, {"codpes": codpes})
         if result:
             logger.debug(f"ID Lattes encontrado para {codpes}: {result['idfpescpq']}")
             return result["idfpescpq"]
@@ -71,29 +452,97 @@ class Lattes:
         return False
 
     @staticmethod
-    def obter_xml(codpes: int) -> str | bool:
+    def obter_zips(
+        codpes_list: list[int], tamanho_lote: int | None = None
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        Recebe uma lista de números USP e devolve os zips do lattes em lotes.
+
+        Os zips são buscados com `IN (...)` em lotes de `tamanho_lote` pessoas
+        (padrão: REPLICADO_LATTES_LOTE) e entregues à medida que chegam, de modo
+        que o processamento pode começar antes do fim da transferência. Pessoas
+        sem lattes são omitidas.
+
+        Args:
+            codpes_list (list[int]): Números USP.
+            tamanho_lote (int, optional): Pessoas por consulta.
+
+        Yields:
+            tuple[int, bytes]: (codpes, zip do lattes)
+        """
+        codpes_unicos = list(dict.fromkeys(int(c) for c in codpes_list))
+        for lote in lotes(codpes_unicos, tamanho_lote or Lattes.LOTE):
+            lista_in, params = DB.cria_lista_in("codpes", lote)
+            query = f"""
+                SELECT codpes, imgarqxml from DIM_PESSOA_XMLUSP
+                WHERE codpes IN ({lista_in})
+            """
+            for row in DB.iter_rows(query, params, batch_size=10):
+                if row["imgarqxml"]:
+                    yield row["codpes"], row["imgarqxml"]
+
+    @staticmethod
+    def _descompactar(zip_content: bytes, codpes: int) -> bytes | None:
+        xml_bytes = unzip(zip_content)
+        if not xml_bytes:
+            logger.error(f"Falha ao descompactar XML Lattes para {codpes}")
+        return xml_bytes
+
+    @staticmethod
+    def _obter_xml_bytes(codpes: int) -> bytes | None:
         """
-        Recebe o número USP e devolve XML do lattes.
+        Recebe o número USP e devolve o XML do lattes descompactado, sem decodificar.
         """
         zip_content = Lattes.obter_zip(codpes)
         if zip_content:
-            xml_bytes = unzip(zip_content)
-            if xml_bytes:
-                # Try decoding commonly used encodings
-                for encoding in ["utf-8", "iso-8859-1"]:
-                    try:
-                        content = xml_bytes.decode(encoding)
-                        logger.debug(
-                            f"XML Lattes decodificado para {codpes} usando {encoding}"
-                        )
-                        return content
-                    except UnicodeDecodeError:
-                        continue
-                logger.warning(
-                    f"Falha ao decodificar XML Lattes para {codpes} com codificações padrão"
-                )
-                return xml_bytes.decode("utf-8", errors="ignore")
-            logger.error(f"Falha ao descompactar XML Lattes para {codpes}")
+            return Lattes._descompactar(zip_content, codpes)
+        return None
+
+    @staticmethod
+    def _decodificar(xml_bytes: bytes, codpes: int) -> str:
+        # Try decoding commonly used encodings
+        for encoding in ["utf-8", "iso-8859-1"]:
+            try:
+                content = xml_bytes.decode(encoding)
+                logger.debug(f"XML Lattes decodificado para {codpes} usando {encoding}")
+                return content
+            except UnicodeDecodeError:
+                continue
+        logger.warning(
+            f"Falha ao decodificar XML Lattes para {codpes} com codificações padrão"
+        )
+        return xml_bytes.decode("utf-8", errors="ignore")
+
+    @staticmethod
+    def _converter(xml_bytes: bytes, codpes: int) -> dict[str, Any] | None:
+        """
+        Converte o XML do lattes diretamente em dict, sem passar por JSON.
+        """
+        try:
+            try:
+                # O parser respeita o encoding declarado no próprio XML
+                root = ET.fromstring(xml_bytes)
+            except ET.ParseError:
+                root = ET.fromstring(Lattes._decodificar(xml_bytes, codpes))
+            d = etree_to_dict(root)
+            # Remove root tag wrapper to match simplexml usually
+            # etree_to_dict returns {tag: {contents}}. We want just {contents}.
+            root_tag = root.tag
+            if root_tag in d:
+                d = d[root_tag]
+            return d
+        except Exception as e:
+            logger.error(f"Erro ao converter XML Lattes para {codpes}: {e}")
+            return None
+
+    @staticmethod
+    def obter_xml(codpes: int) -> str | bool:
+        """
+        Recebe o número USP e devolve XML do lattes.
+        """
+        xml_bytes = Lattes._obter_xml_bytes(codpes)
+        if xml_bytes:
+            return Lattes._decodificar(xml_bytes, codpes)
         return False
 
     @staticmethod
@@ -101,47 +550,312 @@ class Lattes:
         """
         Recebe o número USP e devolve json do lattes.
         """
-        xml_content = Lattes.obter_xml(codpes)
-        if xml_content:
-            try:
-                root = ET.fromstring(xml_content)
-                d = etree_to_dict(root)
-                # Remove root tag wrapper to match simplexml usually
-                # etree_to_dict returns {tag: {contents}}. We want just {contents}.
-                root_tag = root.tag
-                if root_tag in d:
-                    d = d[root_tag]
-                logger.debug(f"JSON Lattes gerado para {codpes}")
-                return json.dumps(d)
-            except Exception as e:
-                logger.error(
-                    f"Erro ao converter XML para JSON Lattes para {codpes}: {e}"
-                )
-                return False
+        dados = Lattes.obter_array(codpes)
+        if dados:
+            logger.debug(f"JSON Lattes gerado para {codpes}")
+            return json.dumps(dados)
         return False
 
+    @staticmethod
+    def _versao(codpes: int) -> Any:
+        """
+        Retorna a dtaultalt (sem formatação) do currículo, usada para validar
+        o cache.
+        """
+        result = DB.fetch(Lattes._SQL_VERSAO, {"codpes": codpes})
+        return result["dtaultalt"] if result else None
+
     @staticmethod
     def obter_array(codpes: int) -> dict[str, Any] | bool:
         """
         Recebe o número USP e devolve array (dict) do lattes.
-        Usa cache em memória com TTL de 1 hora.
+
+        Usa cache em memória limitado por REPLICADO_LATTES_CACHE_BYTES. O dict
+        retornado é compartilhado com o cache e não deve ser alterado.
         """
-        agora = time.time()
-        if codpes in Lattes._cache:
-            expira, dados = Lattes._cache[codpes]
-            if agora < expira:
-                logger.debug(f"Cache HIT para Lattes de {codpes}")
-                return dados
-            else:
-                logger.debug(f"Cache expirado para Lattes de {codpes}")
+        # A versão consultada para revalidar o cache é reaproveitada abaixo
+        consultada: list[Any] = []
 
-        json_content = Lattes.obter_json(codpes)
-        if json_content:
-            dados = json.loads(json_content)
-            Lattes._cache[codpes] = (agora + Lattes._TTL, dados)
+        def versao_atual() -> Any:
+            consultada.append(Lattes._versao(codpes))
+            return consultada[0]
+
+        dados = Lattes._cache.get(codpes, versao_atual)
+        if dados is not None:
+            logger.debug(f"Cache HIT para Lattes de {codpes}")
             return dados
+
+        versao = consultada[0] if consultada else Lattes._versao(codpes)
+        if Lattes._store is not None and versao is not None:
+            guardado = Lattes._store.get(codpes, versao)
+            if guardado is not None:
+                logger.debug(f"Lattes de {codpes} lido do armazenamento local")
+                dados, tamanho = guardado
+                Lattes._cache.set(codpes, versao, dados, tamanho)
+                return dados
+
+        xml_bytes = Lattes._obter_xml_bytes(codpes)
+        if xml_bytes:
+            dados = Lattes._converter(xml_bytes, codpes)
+            if dados is not None:
+                Lattes._guardar(codpes, versao, dados, len(xml_bytes))
+                return dados
         return False
 
+    @staticmethod
+    def _guardar(codpes: int, versao: Any, dados: dict[str, Any], tamanho: int) -> None:
+        """
+        Guarda um currículo recém convertido no cache e no armazenamento local.
+        """
+        Lattes._cache.set(codpes, versao, dados, tamanho)
+        if Lattes._store is not None and versao is not None:
+            Lattes._store.set(codpes, versao, dados, tamanho)
+
+    @staticmethod
+    def configurar_store(caminho: str | None) -> None:
+        """
+        Ativa (ou, com None, desativa) o armazenamento local de currículos.
+
+        Args:
+            caminho (str | None): Arquivo SQLite do armazenamento.
+        """
+        Lattes._store = LattesStore(caminho) if caminho else None
+
+    @staticmethod
+    def _versoes(codpes_list: list[int]) -> dict[int, Any]:
+        """
+        Retorna a dtaultalt de vários currículos numa única consulta.
+        """
+        lista_in, params = DB.cria_lista_in("codpes", codpes_list)
+        query = f"""
+            SELECT codpes, dtaultalt from DIM_PESSOA_XMLUSP
+            WHERE codpes IN ({lista_in})
+        """
+        return {row["codpes"]: row["dtaultalt"] for row in DB.fetch_all(query, params)}
+
+    @staticmethod
+    def obter_arrays(
+        codpes_list: list[int], tamanho_lote: int | None = None
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Recebe uma lista de números USP e devolve os arrays (dict) do lattes.
+
+        Currículos em cache (e ainda atualizados) são entregues direto; os demais
+        são buscados com `obter_zips` e convertidos à medida que chegam. Pessoas
+        sem lattes são omitidas e a ordem de entrega não é garantida.
+
+        Args:
+            codpes_list (list[int]): Números USP.
+            tamanho_lote (int, optional): Pessoas por consulta.
+
+        Yields:
+            tuple[int, dict]: (codpes, lattes)
+        """
+        tamanho_lote = tamanho_lote or Lattes.LOTE
+        codpes_unicos = list(dict.fromkeys(int(c) for c in codpes_list))
+        for lote in lotes(codpes_unicos, tamanho_lote):
+            encontrados, faltantes, versoes = Lattes._separar_cache(lote)
+            yield from encontrados
+
+            for codpes, zip_content in Lattes.obter_zips(faltantes, tamanho_lote):
+                codpes, dados, peso = _converter_zip(codpes, zip_content)
+                if dados is not None:
+                    Lattes._guardar(codpes, versoes.get(codpes), dados, peso)
+                    yield codpes, dados
+
+    @staticmethod
+    def obter_arrays_paralelo(
+        codpes_list: list[int],
+        workers: int | None = None,
+        chunksize: int = 4,
+        tamanho_lote: int | None = None,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Como `obter_arrays`, mas descompacta e converte os currículos em paralelo.
+
+        O processo principal busca os zips no replicado e os distribui em tarefas
+        de `chunksize` currículos para um pool de processos. Os resultados voltam
+        para o processo principal, onde são guardados no cache do Lattes. No
+        máximo `2 * workers` tarefas ficam pendentes ao mesmo tempo, limitando a
+        memória usada por zips ainda não processados.
+
+        Args:
+            codpes_list (list[int]): Números USP.
+            workers (int, optional): Processos de conversão. Padrão: número de CPUs.
+            chunksize (int): Currículos por tarefa enviada a um processo.
+            tamanho_lote (int, optional): Pessoas por consulta ao replicado.
+
+        Yields:
+            tuple[int, dict]: (codpes, lattes), na ordem em que ficam prontos.
+        """
+        workers = workers or os.cpu_count() or 1
+        tamanho_lote = tamanho_lote or Lattes.LOTE
+        codpes_unicos = list(dict.fromkeys(int(c) for c in codpes_list))
+        versoes: dict[int, Any] = {}
+
+        def concluir(prontos: set[Future]) -> Iterator[tuple[int, dict[str, Any]]]:
+            for futuro in prontos:
+                for codpes, dados, peso in futuro.result():
+                    if dados is not None:
+                        Lattes._guardar(codpes, versoes.get(codpes), dados, peso)
+                        yield codpes, dados
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pendentes: set[Future] = set()
+            for lote in lotes(codpes_unicos, tamanho_lote):
+                encontrados, faltantes, versoes_lote = Lattes._separar_cache(lote)
+                versoes.update(versoes_lote)
+                yield from encontrados
+
+                zips = Lattes.obter_zips(faltantes, tamanho_lote)
+                for tarefa in lotes(zips, chunksize):
+                    pendentes.add(executor.submit(_converter_zips, tarefa))
+                    if len(pendentes) >= 2 * workers:
+                        prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                        yield from concluir(prontos)
+
+            while pendentes:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                yield from concluir(prontos)
+
+    @staticmethod
+    def _separar_cache(
+        lote: list[int],
+    ) -> tuple[list[tuple[int, dict[str, Any]]], list[int], dict[int, Any]]:
+        """
+        Separa os currículos do lote entre os já em cache (em memória ou no
+        armazenamento local) e os que faltam baixar.
+
+        Returns:
+            tuple: (encontrados [(codpes, lattes)], faltantes [codpes], versões)
+        """
+        versoes = Lattes._versoes(lote)
+        encontrados, faltantes = [], []
+        for codpes in lote:
+            if codpes not in versoes:
+                continue
+            dados = Lattes._cache.get(codpes, lambda c=codpes: versoes[c])
+            if dados is not None:
+                encontrados.append((codpes, dados))
+            else:
+                faltantes.append(codpes)
+
+        if Lattes._store is not None and faltantes:
+            guardados = Lattes._store.get_many({c: versoes[c] for c in faltantes})
+            for codpes, dados, tamanho in guardados:
+                Lattes._cache.set(codpes, versoes[codpes], dados, tamanho)
+                encontrados.append((codpes, dados))
+                faltantes.remove(codpes)
+        return encontrados, faltantes, versoes
+
+    @staticmethod
+    def obter_secoes(codpes: int, secoes: list[str]) -> dict[str, Any] | bool:
+        """
+        Recebe o número USP e devolve apenas as seções pedidas do lattes.
+
+        Se o currículo completo já estiver em cache, as seções são copiadas dele.
+        Caso contrário, o XML é lido em streaming e só as seções pedidas são
+        convertidas, o que consome uma fração da memória e do tempo de
+        `obter_array`. O resultado tem a mesma estrutura de `obter_array` e pode
+        ser passado como `lattes_array` para os métodos `listar_*`.
+
+        Args:
+            codpes (int): Número USP.
+            secoes (list[str]): Caminhos das seções em notação de ponto, ex:
+                ['PRODUCAO-BIBLIOGRAFICA.ARTIGOS-PUBLICADOS', 'DADOS-GERAIS'].
+
+        Returns:
+            dict | bool: Currículo parcial ou False se não encontrado.
+        """
+        completo = Lattes._cache.get(codpes, lambda: Lattes._versao(codpes))
+        if completo is not None:
+            parcial: dict[str, Any] = {}
+            if "@attributes" in completo:
+                parcial["@attributes"] = completo["@attributes"]
+            for secao in secoes:
+                chaves = secao.replace("/", ".").split(".")
+                valor = get_path(completo, ".".join(chaves))
+                if valor is not None:
+                    no = parcial
+                    for chave in chaves[:-1]:
+                        no = no.setdefault(chave, {})
+                    no[chaves[-1]] = valor
+            return parcial
+
+        xml_bytes = Lattes._obter_xml_bytes(codpes)
+        if not xml_bytes:
+            return False
+        try:
+            try:
+                return extrair_secoes(xml_bytes, secoes)
+            except ET.ParseError:
+                return extrair_secoes(Lattes._decodificar(xml_bytes, codpes), secoes)
+        except Exception as e:
+            logger.error(f"Erro ao extrair seções do XML Lattes para {codpes}: {e}")
+            return False
+
+    @staticmethod
+    def extrair_relatorio(
+        codpes: int,
+        secoes: list[str] | None = None,
+        filtro: dict[str, Any] | None = None,
+        lattes_array: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Extrai várias seções do lattes de uma só vez, para relatórios.
+
+        O currículo é lido uma única vez (apenas as seções necessárias, via
+        `obter_secoes`) e cada seção é montada pelo método `listar_*`
+        correspondente sobre esse mesmo conteúdo.
+
+        Args:
+            codpes (int): Número USP.
+            secoes (list[str], optional): Seções desejadas, entre as chaves de
+                `Lattes._SECOES_RELATORIO` (ex: 'artigos', 'livros', 'premios').
+                Padrão: todas.
+            filtro (dict, optional): Filtro aplicado às seções de produção, com
+                as chaves 'tipo', 'limit_ini' e 'limit_fim' (mesma semântica de
+                `verificar_filtro`). Padrão: o de cada método.
+            lattes_array (dict, optional): Currículo já carregado.
+
+        Returns:
+            dict: Seção => resultado do método correspondente.
+
+        Raises:
+            ValueError: Se alguma seção não for reconhecida.
+        """
+        secoes = list(Lattes._SECOES_RELATORIO) if secoes is None else secoes
+        desconhecidas = [s for s in secoes if s not in Lattes._SECOES_RELATORIO]
+        if desconhecidas:
+            raise ValueError(f"Seções desconhecidas: {', '.join(desconhecidas)}")
+
+        lattes = lattes_array
+        if not lattes:
+            caminhos = list(
+                dict.fromkeys(Lattes._SECOES_RELATORIO[s][1] for s in secoes)
+            )
+            lattes = Lattes.obter_secoes(codpes, caminhos)
+        if not lattes:
+            return {secao: False for secao in secoes}
+
+        relatorio = {}
+        for secao in secoes:
+            metodo, _, kwargs, aceita_filtro = Lattes._SECOES_RELATORIO[secao]
+            if aceita_filtro and filtro:
+                kwargs = {**kwargs, **filtro}
+            relatorio[secao] = getattr(Lattes, metodo)(
+                codpes, lattes_array=lattes, **kwargs
+            )
+        return relatorio
+
+    @staticmethod
+    def cache_stats() -> dict[str, int]:
+        """
+        Retorna métricas do cache de currículos (itens, bytes, hits, misses,
+        evictions e invalidações por atualização do currículo).
+        """
+        return Lattes._cache.stats()
+
     @staticmethod
     def listar_premios(
         codpes: int, lattes_array: dict[str, Any] | None = None
@@ -1591,3 +2305,20 @@ class Lattes:
         except Exception as e:
             logger.warning(f"Erro ao retornar gênero: {e}")
             return None
+
+
+def _converter_zip(codpes: int, zip_content: bytes) -> tuple[int, dict | None, int]:
+    """
+    Descompacta e converte um zip do lattes: (codpes, lattes ou None, tamanho).
+    """
+    xml_bytes = Lattes._descompactar(zip_content, codpes)
+    if not xml_bytes:
+        return codpes, None, 0
+    return codpes, Lattes._converter(xml_bytes, codpes), len(xml_bytes)
+
+
+def _converter_zips(
+    itens: list[tuple[int, bytes]],
+) -> list[tuple[int, dict | None, int]]:
+    # Executada nos processos de Lattes.obter_arrays_paralelo
+    return [_converter_zip(codpes, zip_content) for codpes, zip_content in itens]
@@ -0,0 +1,205 @@
+"""
+Formatos compactos de linha (ver o parâmetro ``row_format`` de `DB.fetch_all`).
+
+Por padrão cada linha é um dicionário, que repete os nomes das colunas e ocupa
+várias vezes a memória dos próprios valores. Para listagens grandes, sobretudo
+as de ``SELECT *`` em PESSOA/LOCALIZAPESSOA, há formatos mais enxutos:
+
+- ``"dict"`` (padrão): um dicionário por linha;
+- ``"tuple"``: tuplas simples. `DB.fetch_all` devolve uma `Tabela`, lista de
+  tuplas com o cabeçalho compartilhado em `Tabela.colunas`;
+- ``"namedtuple"``: namedtuples, com uma classe por conjunto de colunas
+  (criada uma vez e reaproveitada entre consultas);
+- ``"slots"``: dataclasses com ``__slots__``, mutáveis, também geradas uma vez
+  por conjunto de colunas.
+
+Em todos os formatos as colunas repetidas (ex: ``codpes`` em
+``SELECT LOCALIZAPESSOA.*, PESSOA.*``) aparecem uma única vez, com o último
+valor, como no dicionário. Nomes que não são identificadores válidos viram
+``_<posição>`` nos formatos com atributos.
+"""
+
+from collections import namedtuple
+from collections.abc import Callable, Sequence
+from dataclasses import make_dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any
+
+from .utils import clean_string
+
+FORMATOS = ("dict", "tuple", "namedtuple", "slots")
+
+
+class Tabela(list):
+    """
+    Lista de tuplas com um único cabeçalho (formato ``"tuple"``).
+
+    Attributes:
+        colunas (tuple[str, ...]): Nomes das colunas, na ordem das tuplas.
+    """
+
+    def __init__(self, colunas: Sequence[str], linhas: Any = ()) -> None:
+        super().__init__(linhas)
+        self.colunas = tuple(colunas)
+
+    def como_dicts(self) -> list[dict[str, Any]]:
+        """
+        Converte as linhas para o formato ``"dict"``.
+        """
+        return [dict(zip(self.colunas, linha, strict=True)) for linha in self]
+
+    def __repr__(self) -> str:
+        return f"Tabela(colunas={self.colunas!r}, linhas={list.__repr__(self)})"
+
+
+class Pagina(list):
+    """
+    Página de uma listagem paginada por chave (ver `DB.fetch_page`).
+
+    Attributes:
+        proxima (Any): Valor da chave a passar em ``apos`` para buscar a página
+            seguinte, ou None se esta é a última.
+    """
+
+    def __init__(self, linhas: Any = (), proxima: Any = None) -> None:
+        super().__init__(linhas)
+        self.proxima = proxima
+
+    def __repr__(self) -> str:
+        return f"Pagina(proxima={self.proxima!r}, linhas={list.__repr__(self)})"
+
+
+@lru_cache(maxsize=256)
+def classe_namedtuple(colunas: tuple[str, ...]) -> type:
+    """
+    Retorna a namedtuple ``Linha`` para um conjunto de colunas.
+    """
+    return namedtuple("Linha", colunas, rename=True, module=__name__)
+
+
+@lru_cache(maxsize=256)
+def classe_slots(colunas: tuple[str, ...]) -> type:
+    """
+    Retorna a dataclass ``Linha`` (com ``__slots__``) para um conjunto de colunas.
+    """
+    campos = classe_namedtuple(colunas)._fields
+    classe = make_dataclass("Linha", [(campo, Any) for campo in campos], slots=True)
+    classe.__module__ = __name__
+    return classe
+
+
+def colunas_texto(result: Any) -> tuple[bool | None, ...] | None:
+    """
+    Monta o plano de limpeza de um resultado a partir de ``cursor.description``.
+
+    Para cada coluna: True se o driver a declara como texto (CHAR, VARCHAR...),
+    False se não, e None se o driver não informa o tipo (ex: sqlite3). O tipo
+    texto é o objeto ``STRING`` do módulo DB-API (ex: ``pymssql.STRING``).
+
+    Args:
+        result (CursorResult): Resultado recém-executado.
+
+    Returns:
+        tuple[bool | None, ...] | None: Uma entrada por coluna, ou None se o
+        driver não descreve os tipos.
+    """
+    try:
+        descricao = result.cursor.description
+        tipo_texto = getattr(result.context.dialect.dbapi, "STRING", None)
+    except AttributeError:
+        return None
+    if not descricao or tipo_texto is None:
+        return None
+    return tuple(
+        None if coluna[1] is None else coluna[1] == tipo_texto for coluna in descricao
+    )
+
+
+def fabrica(
+    colunas: Sequence[str],
+    formato: str = "dict",
+    texto: Sequence[bool | None] | None = None,
+) -> Callable[[Any], Any]:
+    """
+    Retorna a função que converte uma linha do cursor no formato pedido.
+
+    A limpeza das strings segue o plano `texto` (ver `colunas_texto`), montado
+    uma vez por consulta: só as colunas de texto passam por ``strip``, e só as
+    de tipo desconhecido passam por `clean_string`.
+
+    Args:
+        colunas (Sequence[str]): Nomes das colunas do resultado, como vêm do
+            cursor (podem se repetir).
+        formato (str): Um de `FORMATOS`.
+        texto (Sequence[bool | None], optional): Plano de limpeza, uma entrada
+            por coluna. Sem ele, todas as colunas são de tipo desconhecido.
+
+    Returns:
+        Callable: Função que recebe uma linha (sequência de valores) e devolve
+        a linha convertida, com strings já limpas.
+
+    Raises:
+        ValueError: Se o formato não existir.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de linha inválido: {formato}. Use um de {FORMATOS}.")
+
+    posicoes = {nome: i for i, nome in enumerate(colunas)}
+    nomes = tuple(posicoes)
+    if not posicoes:
+
+        def valores(row: Any) -> tuple[Any, ...]:
+            return ()
+
+    elif len(posicoes) == 1:
+        (indice,) = posicoes.values()
+
+        def valores(row: Any) -> tuple[Any, ...]:
+            return (row[indice],)
+
+    else:
+        valores = itemgetter(*posicoes.values())
+
+    if texto is None:
+        texto = (None,) * len(colunas)
+    # Posições, já na linha convertida, das colunas a limpar
+    textos = [j for j, i in enumerate(posicoes.values()) if texto[i]]
+    incertas = [j for j, i in enumerate(posicoes.values()) if texto[i] is None]
+
+    if not textos and not incertas:
+        limpar = valores
+    elif len(incertas) == len(nomes):
+
+        def limpar(row: Any) -> list[Any]:
+            return list(map(clean_string, valores(row)))
+
+    else:
+
+        def limpar(row: Any) -> list[Any]:
+            linha = list(valores(row))
+            for j in textos:
+                valor = linha[j]
+                if valor is not None:
+                    linha[j] = valor.strip()
+            for j in incertas:
+                linha[j] = clean_string(linha[j])
+            return linha
+
+    if formato == "dict":
+        return lambda row: dict(zip(nomes, limpar(row), strict=True))
+    if formato == "tuple":
+        return lambda row: tuple(limpar(row))
+    if formato == "namedtuple":
+        criar = classe_namedtuple(nomes)._make
+        return lambda row: criar(limpar(row))
+    classe = classe_slots(nomes)
+    return lambda row: classe(*limpar(row))
+
+
+def cabecalho(colunas: Sequence[str]) -> tuple[str, ...]:
+    """
+    Retorna os nomes das colunas sem repetições, na ordem das linhas geradas
+    por `fabrica`.
+    """
+    return tuple(dict.fromkeys(colunas))
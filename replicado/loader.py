@@ -0,0 +1,128 @@
+import logging
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from replicado.connection import DB
+
+logger = logging.getLogger(__name__)
+
+
+class Adiado:
+    """
+    Resultado pendente de um `BatchLoader`.
+
+    O valor só é buscado no primeiro acesso a `valor`, junto com todas as
+    outras chaves registradas no mesmo loader até aquele momento.
+    """
+
+    def __init__(self, loader: "BatchLoader", chave: Hashable) -> None:
+        self._loader = loader
+        self._chave = chave
+
+    @property
+    def valor(self) -> Any:
+        return self._loader.obter(self._chave)
+
+
+class BatchLoader:
+    """
+    Agrupa consultas por chave (padrão DataLoader) para evitar o problema N+1.
+
+    Em vez de uma consulta por linha, os chamadores registram as chaves com
+    `load` e o loader busca todas as pendentes com uma única consulta ``IN``
+    por lote (ver `DB.fetch_all_in`). Os resultados ficam guardados no loader,
+    que deve viver apenas durante uma operação (ex: uma chamada de método).
+
+    Args:
+        query (str): SQL com o marcador ``{lista_in}``.
+        chave (str | Callable): Coluna (ou função sobre a linha) que identifica
+            a chave de cada linha retornada.
+        muitos (bool): Se True, cada chave resolve para a lista de linhas; se
+            False, para a primeira linha (ou None).
+        params (dict, optional): Demais parâmetros da query.
+        valor_in (Callable, optional): Converte a chave no valor da cláusula IN,
+            útil para chaves compostas. Padrão: a própria chave.
+        nome (str): Prefixo dos parâmetros da lista. Padrão: 'chave'.
+        tamanho_lote (int, optional): Chaves por consulta. Padrão: DB.IN_LOTE.
+
+    Example:
+        >>> loader = BatchLoader(
+        ...     "SELECT codpes, nompes FROM PESSOA WHERE codpes IN ({lista_in})",
+        ...     chave="codpes",
+        ... )
+        >>> nomes = [loader.load(c) for c in (1, 2, 3)]
+        >>> nomes[0].valor  # uma consulta para as três chaves
+    """
+
+    def __init__(
+        self,
+        query: str,
+        chave: str | Callable[[dict[str, Any]], Hashable] = "codpes",
+        muitos: bool = False,
+        params: dict[str, Any] | None = None,
+        valor_in: Callable[[Hashable], Any] | None = None,
+        nome: str = "chave",
+        tamanho_lote: int | None = None,
+    ) -> None:
+        self.query = query
+        self.chave = (lambda row: row[chave]) if isinstance(chave, str) else chave
+        self.muitos = muitos
+        self.params = params
+        self.valor_in = valor_in
+        self.nome = nome
+        self.tamanho_lote = tamanho_lote
+        self._pendentes: dict[Hashable, None] = {}
+        self._resultados: dict[Hashable, Any] = {}
+
+    def load(self, chave: Hashable) -> Adiado:
+        """
+        Registra uma chave e devolve o resultado adiado.
+        """
+        if chave not in self._resultados:
+            self._pendentes[chave] = None
+        return Adiado(self, chave)
+
+    def load_many(self, chaves: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """
+        Registra várias chaves e devolve seus resultados imediatamente.
+        """
+        chaves = list(dict.fromkeys(chaves))
+        for chave in chaves:
+            self.load(chave)
+        self.despachar()
+        return {chave: self._resultados[chave] for chave in chaves}
+
+    def obter(self, chave: Hashable) -> Any:
+        """
+        Retorna o resultado de uma chave, despachando as pendentes se preciso.
+        """
+        if chave not in self._resultados:
+            self.load(chave)
+            self.despachar()
+        return self._resultados[chave]
+
+    def despachar(self) -> None:
+        """
+        Busca todas as chaves pendentes, uma consulta IN por lote.
+        """
+        if not self._pendentes:
+            return
+        pendentes = list(self._pendentes)
+        self._pendentes.clear()
+        for chave in pendentes:
+            self._resultados[chave] = [] if self.muitos else None
+
+        valores = map(self.valor_in, pendentes) if self.valor_in else pendentes
+        logger.debug(f"BatchLoader: {len(pendentes)} chaves pendentes")
+
+        for row in DB.fetch_all_in(
+            self.query, valores, self.params, self.nome, self.tamanho_lote
+        ):
+            chave = self.chave(row)
+            if chave not in self._resultados:
+                # Linha de uma chave não pedida (ex: mesma chave IN, outra edição)
+                continue
+            if self.muitos:
+                self._resultados[chave].append(row)
+            elif self._resultados[chave] is None:
+                self._resultados[chave] = row
@@ -0,0 +1,595 @@
+"""
+Instrumentação das consultas e dos métodos públicos do replicado.
+
+Desligada por padrão. Quando ligada, cada chamada a um método público (ex:
+`Pessoa.listar_docentes`) e cada consulta feita pelo `DB` são medidas:
+tempo total, tempo no banco, linhas e bytes lidos e acertos de cache. As
+medidas alimentam três saídas independentes:
+
+- o registro em memória, com percentis por método (`estatisticas`), ligado
+  por ``REPLICADO_METRICAS=1``;
+- o log de consultas lentas (logger ``replicado.metricas``, nível WARNING),
+  para consultas acima de ``REPLICADO_CONSULTA_LENTA`` segundos;
+- a exportação de spans no formato JSON do OpenTelemetry (OTLP), para um
+  arquivo JSONL ou um coletor local (``REPLICADO_SPANS``)::
+
+    REPLICADO_SPANS=/var/log/replicado/spans.jsonl
+    REPLICADO_SPANS=http://localhost:4318
+
+Tudo também pode ser configurado em código::
+
+    from replicado import metricas
+
+    metricas.configure(ativo=True, consulta_lenta=2.0)
+    ...
+    metricas.estatisticas()["Pessoa.listar_docentes"]["p90"]
+
+Métodos que devolvem iteradores (``iterar_*``) são medidos até o iterador
+ser esgotado ou fechado, contando apenas o tempo gasto dentro dele.
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Chamadas mantidas por método para o cálculo dos percentis
+AMOSTRAS: int = int(os.getenv("REPLICADO_METRICAS_AMOSTRAS", "1000"))
+
+# Intervalo (segundos) entre as gravações/envios de spans
+_INTERVALO_EXPORTACAO = 2.0
+_ATRIBUTO_INSTRUMENTADO = "__replicado_metricas__"
+
+
+@dataclass
+class _Config:
+    metricas: bool = False
+    consulta_lenta: float = 0.0
+    exportador: "_Exportador | None" = None
+    # Alguma saída ligada; recalculado em `configure`
+    ligado: bool = False
+
+
+@dataclass
+class _Estatistica:
+    chamadas: int = 0
+    erros: int = 0
+    consultas: int = 0
+    linhas: int = 0
+    bytes: int = 0
+    cache_hits: int = 0
+    tempo_total: float = 0.0
+    tempo_db: float = 0.0
+    amostras: deque = field(default_factory=lambda: deque(maxlen=AMOSTRAS))
+
+
+@dataclass
+class Medicao:
+    """
+    Medidas de uma consulta em andamento (ver `consulta`).
+
+    O cronômetro pode ser pausado enquanto as linhas estão com quem as
+    consome (ex: entre os ``yield`` de `DB.iter_rows`).
+    """
+
+    linhas: int = 0
+    bytes: int = 0
+    tempo: float = 0.0
+    _inicio: float | None = None
+
+    def pausar(self) -> None:
+        if self._inicio is not None:
+            self.tempo += time.perf_counter() - self._inicio
+            self._inicio = None
+
+    def retomar(self) -> None:
+        self._inicio = time.perf_counter()
+
+    def contar(self, linha: Any) -> None:
+        """
+        Soma uma linha (sequência de valores, como vem do cursor) às medidas.
+        """
+        self.linhas += 1
+        self.bytes += sum(map(sys.getsizeof, linha))
+
+
+@dataclass
+class _Chamada:
+    nome: str
+    pai: "_Chamada | None"
+    trace_id: str
+    span_id: str = field(default_factory=lambda: _novo_id(64))
+    inicio_ns: int = field(default_factory=time.time_ns)
+    tempo: float = 0.0
+    tempo_db: float = 0.0
+    consultas: int = 0
+    linhas: int = 0
+    bytes: int = 0
+    cache_hits: int = 0
+    erro: BaseException | None = None
+
+
+def _novo_id(bits: int) -> str:
+    # Identificadores de trace (128 bits) e span (64 bits), em hexadecimal
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+_config = _Config()
+_lock = threading.Lock()
+_estatisticas: dict[str, _Estatistica] = {}
+_atual: contextvars.ContextVar[_Chamada | None] = contextvars.ContextVar(
+    "replicado_metricas_chamada", default=None
+)
+
+
+class _Exportador:
+    """
+    Grava os spans em lotes, numa thread em segundo plano: acrescenta linhas
+    a um arquivo JSONL ou envia ao endpoint ``/v1/traces`` de um coletor OTLP.
+    """
+
+    def __init__(self, destino: str) -> None:
+        self.destino = destino
+        self.http = destino.startswith(("http://", "https://"))
+        if self.http and not destino.rstrip("/").endswith("/v1/traces"):
+            self.destino = destino.rstrip("/") + "/v1/traces"
+        self.pendentes: deque = deque()
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    def enviar(self, span: dict[str, Any]) -> None:
+        self.pendentes.append(span)
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(
+                        target=self._laco, name="replicado-spans", daemon=True
+                    )
+                    self.thread.start()
+
+    def _laco(self) -> None:
+        while True:
+            time.sleep(_INTERVALO_EXPORTACAO)
+            self.descarregar()
+
+    def descarregar(self) -> None:
+        with self.lock:
+            spans = []
+            while self.pendentes:
+                spans.append(self.pendentes.popleft())
+            if not spans:
+                return
+            try:
+                if self.http:
+                    self._postar(spans)
+                else:
+                    with open(self.destino, "a", encoding="utf-8") as arquivo:
+                        arquivo.writelines(
+                            json.dumps(span, ensure_ascii=False) + "\n"
+                            for span in spans
+                        )
+            except OSError as e:
+                logger.warning(f"Falha ao exportar {len(spans)} spans: {e}")
+
+    def _postar(self, spans: list[dict[str, Any]]) -> None:
+        corpo = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _atributos({"service.name": "replicado"})
+                    },
+                    "scopeSpans": [{"scope": {"name": "replicado"}, "spans": spans}],
+                }
+            ]
+        }
+        requisicao = urllib.request.Request(
+            self.destino,
+            data=json.dumps(corpo).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(requisicao, timeout=5):
+            pass
+
+
+def configure(
+    ativo: bool | None = None,
+    consulta_lenta: float | None = None,
+    spans: str | None = None,
+) -> None:
+    """
+    Liga ou desliga as saídas da instrumentação. Parâmetros omitidos mantêm o
+    valor atual (inicialmente, o das variáveis de ambiente).
+
+    Args:
+        ativo (bool, optional): Registro em memória de `estatisticas`.
+        consulta_lenta (float, optional): Limite, em segundos, acima do qual
+            uma consulta é registrada no log. 0 desliga.
+        spans (str, optional): Arquivo JSONL ou URL do coletor OTLP/HTTP para
+            os spans. String vazia desliga.
+    """
+    if ativo is not None:
+        _config.metricas = ativo
+    if consulta_lenta is not None:
+        _config.consulta_lenta = consulta_lenta
+    if spans is not None:
+        if _config.exportador is not None:
+            _config.exportador.descarregar()
+        _config.exportador = _Exportador(spans) if spans else None
+    _config.ligado = (
+        _config.metricas or _config.consulta_lenta > 0 or _config.exportador is not None
+    )
+
+
+def _configurar_do_ambiente() -> None:
+    configure(
+        ativo=os.getenv("REPLICADO_METRICAS", "0").lower() in ("1", "true", "on"),
+        consulta_lenta=float(os.getenv("REPLICADO_CONSULTA_LENTA", "0")),
+        spans=os.getenv("REPLICADO_SPANS", ""),
+    )
+
+
+def descarregar() -> None:
+    """
+    Grava/envia imediatamente os spans pendentes (feito também na saída do
+    processo).
+    """
+    if _config.exportador is not None:
+        _config.exportador.descarregar()
+
+
+def estatisticas() -> dict[str, dict[str, float]]:
+    """
+    Retorna as medidas acumuladas por método desde o início (ou desde `zerar`).
+
+    Consultas feitas fora de um método público aparecem como ``DB.<função>``
+    (ex: 'DB.fetch_all'). As medidas de um método incluem as das consultas e
+    dos métodos que ele chamou.
+
+    Returns:
+        dict[str, dict]: Para cada método, ``chamadas``, ``erros``,
+        ``consultas``, ``linhas``, ``bytes`` (tamanho aproximado dos valores
+        lidos), ``cache_hits``, ``tempo_total`` e ``tempo_db`` (segundos), e os
+        percentis ``p50``, ``p90``, ``p99`` e ``max`` do tempo por chamada,
+        sobre as últimas ``REPLICADO_METRICAS_AMOSTRAS`` chamadas.
+    """
+    with _lock:
+        itens = sorted(_estatisticas.items())
+        copias = [(nome, est, sorted(est.amostras)) for nome, est in itens]
+
+    resultado = {}
+    for nome, est, amostras in copias:
+        resultado[nome] = {
+            "chamadas": est.chamadas,
+            "erros": est.erros,
+            "consultas": est.consultas,
+            "linhas": est.linhas,
+            "bytes": est.bytes,
+            "cache_hits": est.cache_hits,
+            "tempo_total": est.tempo_total,
+            "tempo_db": est.tempo_db,
+            "p50": _percentil(amostras, 50),
+            "p90": _percentil(amostras, 90),
+            "p99": _percentil(amostras, 99),
+            "max": amostras[-1] if amostras else 0.0,
+        }
+    return resultado
+
+
+def _percentil(amostras: list[float], p: float) -> float:
+    # Método do posto mais próximo, sobre amostras já ordenadas
+    if not amostras:
+        return 0.0
+    return amostras[max(0, -(-len(amostras) * p // 100) - 1)]
+
+
+def zerar() -> None:
+    """
+    Descarta as medidas acumuladas em `estatisticas`.
+    """
+    with _lock:
+        _estatisticas.clear()
+
+
+def _registrar(nome: str, tempo: float, erro: bool, **medidas: float) -> None:
+    with _lock:
+        est = _estatisticas.get(nome)
+        if est is None:
+            est = _estatisticas[nome] = _Estatistica()
+        est.chamadas += 1
+        est.erros += erro
+        est.tempo_total += tempo
+        est.amostras.append(tempo)
+        for chave, valor in medidas.items():
+            setattr(est, chave, getattr(est, chave) + valor)
+
+
+def _atributos(valores: dict[str, Any]) -> list[dict[str, Any]]:
+    atributos = []
+    for chave, valor in valores.items():
+        if isinstance(valor, bool):
+            tipado = {"boolValue": valor}
+        elif isinstance(valor, int):
+            tipado = {"intValue": str(valor)}
+        elif isinstance(valor, float):
+            tipado = {"doubleValue": valor}
+        else:
+            tipado = {"stringValue": str(valor)}
+        atributos.append({"key": chave, "value": tipado})
+    return atributos
+
+
+def _exportar_span(
+    nome: str,
+    trace_id: str,
+    span_id: str,
+    pai: str | None,
+    cliente: bool,
+    inicio_ns: int,
+    duracao: float,
+    erro: BaseException | None,
+    atributos: dict[str, Any],
+) -> None:
+    exportador = _config.exportador
+    if exportador is None:
+        return
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": nome,
+        # SPAN_KIND_CLIENT (consulta ao banco) ou SPAN_KIND_INTERNAL
+        "kind": 3 if cliente else 1,
+        "startTimeUnixNano": str(inicio_ns),
+        "endTimeUnixNano": str(inicio_ns + int(duracao * 1e9)),
+        "attributes": _atributos(atributos),
+        "status": {"code": 2, "message": repr(erro)} if erro else {"code": 0},
+    }
+    if pai is not None:
+        span["parentSpanId"] = pai
+    exportador.enviar(span)
+
+
+@contextmanager
+def consulta(tipo: str, query: Any) -> Iterator[Medicao | None]:
+    """
+    Mede uma consulta do `DB`. Devolve None, sem custo algum, quando a
+    instrumentação está desligada.
+
+    Quem consulta deve chamar `Medicao.contar` para cada linha lida.
+
+    Args:
+        tipo (str): Função do DB que faz a consulta (ex: 'fetch_all').
+        query (str | TextClause): A consulta, para o log e os spans.
+    """
+    if not _config.ligado:
+        yield None
+        return
+
+    medicao = Medicao()
+    inicio_ns = time.time_ns()
+    erro = None
+    medicao.retomar()
+    try:
+        yield medicao
+    except BaseException as e:
+        erro = e
+        raise
+    finally:
+        medicao.pausar()
+        _concluir_consulta(tipo, query, medicao, inicio_ns, erro)
+
+
+def _concluir_consulta(
+    tipo: str,
+    query: Any,
+    medicao: Medicao,
+    inicio_ns: int,
+    erro: BaseException | None,
+) -> None:
+    chamada = _atual.get()
+    origem = chamada.nome if chamada is not None else f"DB.{tipo}"
+    sql = " ".join(str(query).split())
+
+    if 0 < _config.consulta_lenta <= medicao.tempo:
+        logger.warning(
+            f"Consulta lenta em {origem}: {medicao.tempo:.3f}s, "
+            f"{medicao.linhas} linhas | SQL: {sql}"
+        )
+
+    if chamada is not None:
+        chamada.tempo_db += medicao.tempo
+        chamada.consultas += 1
+        chamada.linhas += medicao.linhas
+        chamada.bytes += medicao.bytes
+    elif _config.metricas:
+        _registrar(
+            origem,
+            medicao.tempo,
+            erro is not None,
+            consultas=1,
+            tempo_db=medicao.tempo,
+            linhas=medicao.linhas,
+            bytes=medicao.bytes,
+        )
+
+    _exportar_span(
+        f"DB.{tipo}",
+        chamada.trace_id if chamada is not None else _novo_id(128),
+        _novo_id(64),
+        chamada.span_id if chamada is not None else None,
+        True,
+        inicio_ns,
+        medicao.tempo,
+        erro,
+        {
+            "db.statement": sql,
+            "db.response.returned_rows": medicao.linhas,
+            "replicado.bytes": medicao.bytes,
+        },
+    )
+
+
+def registrar_cache(acerto: bool) -> None:
+    """
+    Conta um acerto do cache de resultados no método em andamento.
+    """
+    chamada = _atual.get()
+    if acerto and chamada is not None:
+        chamada.cache_hits += 1
+
+
+def _iniciar(nome: str) -> _Chamada:
+    pai = _atual.get()
+    return _Chamada(nome, pai, pai.trace_id if pai else _novo_id(128))
+
+
+def _executar(chamada: _Chamada, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Executa `func` como parte da chamada, somando o tempo gasto.
+    """
+    token = _atual.set(chamada)
+    inicio = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    except StopIteration:
+        raise
+    except BaseException as e:
+        chamada.erro = e
+        raise
+    finally:
+        chamada.tempo += time.perf_counter() - inicio
+        _atual.reset(token)
+
+
+def _concluir(chamada: _Chamada) -> None:
+    pai = chamada.pai
+    if pai is not None:
+        # As medidas das chamadas internas também contam para quem chamou
+        pai.tempo_db += chamada.tempo_db
+        pai.consultas += chamada.consultas
+        pai.linhas += chamada.linhas
+        pai.bytes += chamada.bytes
+        pai.cache_hits += chamada.cache_hits
+
+    if _config.metricas:
+        _registrar(
+            chamada.nome,
+            chamada.tempo,
+            chamada.erro is not None,
+            consultas=chamada.consultas,
+            tempo_db=chamada.tempo_db,
+            linhas=chamada.linhas,
+            bytes=chamada.bytes,
+            cache_hits=chamada.cache_hits,
+        )
+
+    _exportar_span(
+        chamada.nome,
+        chamada.trace_id,
+        chamada.span_id,
+        pai.span_id if pai is not None else None,
+        False,
+        chamada.inicio_ns,
+        chamada.tempo,
+        chamada.erro,
+        {
+            "replicado.consultas": chamada.consultas,
+            "replicado.linhas": chamada.linhas,
+            "replicado.bytes": chamada.bytes,
+            "replicado.cache_hits": chamada.cache_hits,
+            "replicado.tempo_db": chamada.tempo_db,
+        },
+    )
+
+
+def _iterar(chamada: _Chamada, iterador: Iterator[Any]) -> Iterator[Any]:
+    """
+    Consome `iterador` como parte da chamada, que termina quando ele se
+    esgota ou é fechado.
+    """
+    try:
+        while True:
+            try:
+                item = _executar(chamada, next, iterador)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        fechar = getattr(iterador, "close", None)
+        if fechar is not None:
+            _executar(chamada, fechar)
+        _concluir(chamada)
+
+
+def _envolver(nome: str, func: Callable) -> Callable:
+    """
+    Cria a versão instrumentada de um método público.
+    """
+    if inspect.isgeneratorfunction(func):
+        # Continua sendo uma função geradora (ver replicado.aio)
+        @functools.wraps(func)
+        def gerador(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            if not _config.ligado:
+                return (yield from func(*args, **kwargs))
+            yield from _iterar(_iniciar(nome), func(*args, **kwargs))
+
+        return gerador
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _config.ligado:
+            return func(*args, **kwargs)
+        chamada = _iniciar(nome)
+        try:
+            resultado = _executar(chamada, func, *args, **kwargs)
+        except BaseException:
+            _concluir(chamada)
+            raise
+        if isinstance(resultado, Iterator):
+            return _iterar(chamada, resultado)
+        _concluir(chamada)
+        return resultado
+
+    return wrapper
+
+
+def instrumentar(cls: type) -> type:
+    """
+    Envolve os métodos estáticos públicos de uma classe de consultas com a
+    medição desta instrumentação. Quando ela está desligada, o custo por
+    chamada é o de uma verificação.
+
+    Args:
+        cls (type): Classe de consultas (ex: `Pessoa`).
+
+    Returns:
+        type: A própria classe.
+    """
+    for nome, atributo in list(vars(cls).items()):
+        if nome.startswith("_") or not isinstance(atributo, staticmethod):
+            continue
+        func = atributo.__func__
+        if getattr(func, _ATRIBUTO_INSTRUMENTADO, False):
+            continue
+        envolvido = _envolver(f"{cls.__name__}.{nome}", func)
+        setattr(envolvido, _ATRIBUTO_INSTRUMENTADO, True)
+        setattr(cls, nome, staticmethod(envolvido))
+    return cls
+
+
+_configurar_do_ambiente()
+atexit.register(descarregar)
@@ -3,7 +3,7 @@ import os
 from typing import Any
 
 from replicado.connection import DB
-from replicado.pessoa import Pessoa
+from replicado.loader import BatchLoader
 
 nlogger = logging.getLogger(__name__)
 
@@ -84,10 +84,23 @@ class Pesquisa:
             nlogger.error(f"Erro ao listar IC: {e}")
             return []
 
+        # Enrich with course info (uma consulta para todos os alunos)
+        cursos = BatchLoader(
+            f"""
+                SELECT V.codpes, V.codcurgrd, C.nomcur
+                FROM VINCULOPESSOAUSP V
+                INNER JOIN CURSOGR C ON (V.codcurgrd = C.codcur)
+                WHERE V.codpes IN ({{lista_in}})
+                    AND V.tipvin = 'ALUNOGR'
+                    AND V.codclg IN ({unidades})
+            """,
+            chave="codpes",
+            nome="codpes",
+        ).load_many(ic["aluno"] for ic in results)
+
         iniciacao_cientifica = []
         for ic in results:
-            # Enrich with course info
-            curso = Pessoa.retornar_curso_por_codpes(ic["aluno"])
+            curso = cursos[ic["aluno"]]
             ic["codcur"] = curso["codcurgrd"] if curso else None
             ic["nome_curso"] = curso["nomcur"] if curso else None
             ic["cod_projeto"] = f"IC-{ic['aluno']}"  # Fake ID
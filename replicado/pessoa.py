@@ -1,5 +1,6 @@
 import logging
 import os
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 from replicado.connection import DB
@@ -13,6 +14,12 @@ class Pessoa:
     Classe para métodos relacionados a dados de pessoas (tabela PESSOA e satélites).
     """
 
+    # Queries fixas das consultas mais frequentes, compiladas uma única vez
+    _SQL_NOME = DB.compilar("SELECT nompesttd FROM PESSOA WHERE codpes = :codpes")
+    _SQL_EMAIL = DB.compilar(
+        "SELECT codema FROM EMAILPESSOA WHERE codpes = :codpes AND stamtr = 'S'"
+    )
+
     @staticmethod
     def dump(codpes: int, fields: list[str] = None) -> dict[str, Any] | None:
         """
@@ -59,17 +66,56 @@ class Pessoa:
                 emails.append(email)
         return emails
 
+    @staticmethod
+    def emails_lote(codpes_list: Iterable[int]) -> dict[int, list[str]]:
+        """
+        Versão em lote de `emails`: uma consulta a cada DB.IN_LOTE pessoas.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP.
+
+        Returns:
+            dict[int, list[str]]: Emails por codpes (lista vazia se não houver).
+        """
+        emails = Pessoa._mapa_lote(codpes_list, list)
+        query = "SELECT codpes, codema FROM EMAILPESSOA WHERE codpes IN ({lista_in})"
+        for row in DB.fetch_all_in(query, emails):
+            email = row["codema"]
+            if email and email not in emails[row["codpes"]]:
+                emails[row["codpes"]].append(email)
+        return emails
+
     @staticmethod
     def email(codpes: int) -> str | None:
         """
         Retorna o email de correspondência (stamtr = 'S').
         """
-        query = "SELECT codema FROM EMAILPESSOA WHERE codpes = :codpes AND stamtr = 'S'"
-        result = DB.fetch(query, {"codpes": codpes})
+        result = DB.fetch(Pessoa._SQL_EMAIL, {"codpes": codpes})
         if result:
             return result["codema"]
         return None
 
+    @staticmethod
+    def email_lote(codpes_list: Iterable[int]) -> dict[int, str | None]:
+        """
+        Versão em lote de `email`.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP.
+
+        Returns:
+            dict[int, str | None]: Email de correspondência por codpes.
+        """
+        emails = Pessoa._mapa_lote(codpes_list)
+        query = """
+            SELECT codpes, codema FROM EMAILPESSOA
+            WHERE codpes IN ({lista_in}) AND stamtr = 'S'
+        """
+        for row in DB.fetch_all_in(query, emails):
+            if emails[row["codpes"]] is None:
+                emails[row["codpes"]] = row["codema"]
+        return emails
+
     @staticmethod
     def telefones(codpes: int) -> list[str]:
         """
@@ -80,24 +126,61 @@ class Pessoa:
 
         telefones = []
         for row in result:
-            ddd = clean_string(row["codddd"])
-            num = clean_string(row["numtel"])
-            fone = f"({ddd}) {num}"
+            fone = Pessoa._formatar_telefone(row)
             if fone not in telefones:
                 telefones.append(fone)
         return telefones
 
     @staticmethod
-    def procurar_por_nome(
+    def telefones_lote(codpes_list: Iterable[int]) -> dict[int, list[str]]:
+        """
+        Versão em lote de `telefones`.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP.
+
+        Returns:
+            dict[int, list[str]]: Telefones formatados por codpes.
+        """
+        telefones = Pessoa._mapa_lote(codpes_list, list)
+        query = """
+            SELECT codpes, codddd, numtel FROM TELEFPESSOA
+            WHERE codpes IN ({lista_in})
+        """
+        for row in DB.fetch_all_in(query, telefones):
+            fone = Pessoa._formatar_telefone(row)
+            if fone not in telefones[row["codpes"]]:
+                telefones[row["codpes"]].append(fone)
+        return telefones
+
+    @staticmethod
+    def _formatar_telefone(row: dict[str, Any]) -> str:
+        ddd = clean_string(row["codddd"])
+        num = clean_string(row["numtel"])
+        return f"({ddd}) {num}"
+
+    @staticmethod
+    def _mapa_lote(
+        codpes_list: Iterable[int], padrao: type | None = None
+    ) -> dict[int, Any]:
+        """
+        Cria o dicionário de resultados de um método em lote, com uma entrada
+        por codpes (sem repetições, na ordem recebida).
+        """
+        return {int(c): padrao() if padrao else None for c in codpes_list}
+
+    @staticmethod
+    def _query_procurar_por_nome(
         nome: str,
-        fonetico: bool = True,
-        ativos: bool = True,
-        tipvin: str | None = None,
-        codundclgs: str | None = None,
-        tipvinext: str | None = None,
-    ) -> list[dict[str, Any]]:
+        fonetico: bool,
+        ativos: bool,
+        tipvin: str | None,
+        codundclgs: str | None,
+        tipvinext: str | None,
+    ) -> tuple[str, dict[str, Any]]:
         """
-        Busca pessoas por nome ou parte do nome.
+        Monta a query de `procurar_por_nome`, sem ORDER BY e com os
+        marcadores ``{top}`` e ``{apos}`` de `DB.fetch_page`.
         """
         params = {}
 
@@ -127,24 +210,87 @@ class Pessoa:
 
         if ativos:
             sql = f"""
-                SELECT P.*, L.* FROM PESSOA P
+                SELECT {{top}}P.*, L.* FROM PESSOA P
                 INNER JOIN LOCALIZAPESSOA L on L.codpes = P.codpes
-                WHERE L.tipdsg IS NULL
+                WHERE {{apos}} AND L.tipdsg IS NULL
                 AND {query_busca}
                 {additional_filters}
-                ORDER BY P.nompesttd ASC
             """
         else:
             sql = f"""
-                SELECT DISTINCT P.* FROM PESSOA P
+                SELECT DISTINCT {{top}}P.* FROM PESSOA P
                 LEFT JOIN LOCALIZAPESSOA L on L.codpes = P.codpes
-                WHERE {query_busca}
+                WHERE {{apos}} AND {query_busca}
                 {additional_filters}
-                ORDER BY P.nompesttd ASC
             """
 
+        return sql, params
+
+    @staticmethod
+    def procurar_por_nome(
+        nome: str,
+        fonetico: bool = True,
+        ativos: bool = True,
+        tipvin: str | None = None,
+        codundclgs: str | None = None,
+        tipvinext: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Busca pessoas por nome ou parte do nome.
+        """
+        sql, params = Pessoa._query_procurar_por_nome(
+            nome, fonetico, ativos, tipvin, codundclgs, tipvinext
+        )
+        sql = sql.format(top="", apos="1 = 1") + " ORDER BY P.nompesttd ASC"
         return DB.fetch_all(sql, params)
 
+    @staticmethod
+    def pagina_procurar_por_nome(
+        nome: str,
+        fonetico: bool = True,
+        ativos: bool = True,
+        tipvin: str | None = None,
+        codundclgs: str | None = None,
+        tipvinext: str | None = None,
+        apos: int | None = None,
+        tamanho: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Versão paginada de `procurar_por_nome`, ordenada por `codpes` (e não
+        pelo nome): devolve as pessoas seguintes ao codpes `apos`.
+
+        Com `ativos`, uma pessoa aparece uma vez por vínculo; todos os
+        vínculos de uma pessoa ficam na mesma página (ver `DB.fetch_page`).
+        """
+        sql, params = Pessoa._query_procurar_por_nome(
+            nome, fonetico, ativos, tipvin, codundclgs, tipvinext
+        )
+        return DB.fetch_page(
+            sql, "P.codpes", params, apos, tamanho, chave_unica=not ativos
+        )
+
+    @staticmethod
+    def paginas_procurar_por_nome(
+        nome: str,
+        fonetico: bool = True,
+        ativos: bool = True,
+        tipvin: str | None = None,
+        codundclgs: str | None = None,
+        tipvinext: str | None = None,
+        apos: int | None = None,
+        tamanho: int | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Percorre todas as pessoas encontradas, uma página de
+        `pagina_procurar_por_nome` por vez.
+        """
+        sql, params = Pessoa._query_procurar_por_nome(
+            nome, fonetico, ativos, tipvin, codundclgs, tipvinext
+        )
+        yield from DB.iter_pages(
+            sql, "P.codpes", params, apos, tamanho, chave_unica=not ativos
+        )
+
     @staticmethod
     def obter_nome(codpes: int | list[int]) -> str | dict[int, str] | None:
         """
@@ -155,13 +301,14 @@ class Pessoa:
         if is_list:
             if not codpes:
                 return {}
-            codpes_str = ",".join(map(str, codpes))
-            query = f"SELECT codpes, nompesttd FROM PESSOA WHERE codpes IN ({codpes_str}) ORDER BY nompes"
-            result = DB.fetch_all(query)
+            query = """
+                SELECT codpes, nompesttd FROM PESSOA
+                WHERE codpes IN ({lista_in}) ORDER BY nompes
+            """
+            result = DB.fetch_all_in(query, map(int, codpes))
             return {row["codpes"]: row["nompesttd"] for row in result}
         else:
-            query = "SELECT nompesttd FROM PESSOA WHERE codpes = :codpes"
-            result = DB.fetch(query, {"codpes": codpes})
+            result = DB.fetch(Pessoa._SQL_NOME, {"codpes": codpes})
             if result:
                 return result["nompesttd"]
             return None
@@ -180,6 +327,34 @@ class Pessoa:
         """
         return DB.fetch(query, {"codpes": codpes})
 
+    @staticmethod
+    def obter_endereco_lote(
+        codpes_list: Iterable[int],
+    ) -> dict[int, dict[str, Any] | None]:
+        """
+        Versão em lote de `obter_endereco`.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP.
+
+        Returns:
+            dict[int, dict | None]: Endereço por codpes (None se não houver).
+        """
+        enderecos = Pessoa._mapa_lote(codpes_list)
+        query = """
+            SELECT EP.codpes, TL.nomtiplgr, EP.epflgr, EP.numlgr, EP.cpllgr,
+                EP.nombro, L.cidloc, L.sglest, EP.codendptl
+            FROM ENDPESSOA AS EP
+            JOIN LOCALIDADE AS L ON EP.codloc = L.codloc
+            JOIN TIPOLOGRADOURO AS TL ON EP.codtiplgr = TL.codtiplgr
+            WHERE EP.codpes IN ({lista_in})
+        """
+        for row in DB.fetch_all_in(query, enderecos):
+            codpes = row.pop("codpes")
+            if enderecos[codpes] is None:
+                enderecos[codpes] = row
+        return enderecos
+
     @staticmethod
     def listar_vinculos_ativos(
         codpes: int, designados: bool = True
@@ -197,6 +372,33 @@ class Pessoa:
         """
         return DB.fetch_all(sql, {"codpes": codpes})
 
+    @staticmethod
+    def listar_vinculos_ativos_lote(
+        codpes_list: Iterable[int], designados: bool = True
+    ) -> dict[int, list[dict[str, Any]]]:
+        """
+        Versão em lote de `listar_vinculos_ativos`.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP.
+            designados (bool): Inclui as designações. Padrão: True.
+
+        Returns:
+            dict[int, list[dict]]: Vínculos ativos por codpes.
+        """
+        vinculos = Pessoa._mapa_lote(codpes_list, list)
+        designados_clause = "" if designados else "AND tipdsg IS NULL"
+
+        sql = f"""
+            SELECT *
+            FROM LOCALIZAPESSOA
+            WHERE codpes IN ({{lista_in}})
+            {designados_clause}
+        """
+        for row in DB.fetch_all_in(sql, vinculos):
+            vinculos[row["codpes"]].append(row)
+        return vinculos
+
     @staticmethod
     def total_vinculo(vinculo: str, codundclg: int) -> int:
         """
@@ -212,9 +414,11 @@ class Pessoa:
         return result["total"] if result else 0
 
     @staticmethod
-    def listar_servidores(filtros: dict[str, Any] = None) -> list[dict[str, Any]]:
+    def _query_servidores(
+        filtros: dict[str, Any] | None = None,
+    ) -> tuple[str, dict[str, Any]]:
         """
-        Retorna lista de servidores não docentes ativos na unidade.
+        Monta a query (e os parâmetros) de servidores não docentes ativos.
         """
         codundclg = os.getenv("REPLICADO_CODUNDCLG")
         if not filtros:
@@ -243,28 +447,72 @@ class Pessoa:
             WHERE {where_clause}
             ORDER BY LOCALIZAPESSOA.nompes
         """
-        return DB.fetch_all(query, params)
+        return query, params
+
+    @staticmethod
+    def listar_servidores(
+        filtros: dict[str, Any] = None, row_format: str = "dict"
+    ) -> list[dict[str, Any]]:
+        """
+        Retorna lista de servidores não docentes ativos na unidade.
+
+        Args:
+            filtros (dict, optional): Filtros adicionais (coluna: valor).
+            row_format (str): Formato das linhas ('dict', 'tuple', 'namedtuple'
+                ou 'slots'); os compactos ocupam bem menos memória. Ver
+                `replicado.linhas`.
+        """
+        return DB.fetch_all(*Pessoa._query_servidores(filtros), row_format=row_format)
+
+    @staticmethod
+    def iterar_servidores(
+        filtros: dict[str, Any] = None, row_format: str = "dict"
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `listar_servidores`: devolve um servidor por vez.
+        """
+        return DB.iter_rows(*Pessoa._query_servidores(filtros), row_format=row_format)
+
+    _QUERY_ESTAGIARIOS = """
+        SELECT LOCALIZAPESSOA.*, PESSOA.*
+        FROM LOCALIZAPESSOA
+        INNER JOIN PESSOA ON (LOCALIZAPESSOA.codpes = PESSOA.codpes)
+        WHERE LOCALIZAPESSOA.tipvin LIKE 'ESTAGIARIORH'
+        AND LOCALIZAPESSOA.codundclg = :codundclg
+        AND LOCALIZAPESSOA.sitatl = 'A'
+        ORDER BY LOCALIZAPESSOA.nompes
+    """
 
     @staticmethod
-    def listar_estagiarios(codundclg: int) -> list[dict[str, Any]]:
+    def listar_estagiarios(
+        codundclg: int, row_format: str = "dict"
+    ) -> list[dict[str, Any]]:
         """
         Retorna estagiários ativos na unidade.
+
+        Args:
+            codundclg (int): Código da unidade.
+            row_format (str): Formato das linhas; ver `listar_servidores`.
         """
-        query = """
-            SELECT LOCALIZAPESSOA.*, PESSOA.*
-            FROM LOCALIZAPESSOA
-            INNER JOIN PESSOA ON (LOCALIZAPESSOA.codpes = PESSOA.codpes)
-            WHERE LOCALIZAPESSOA.tipvin LIKE 'ESTAGIARIORH'
-            AND LOCALIZAPESSOA.codundclg = :codundclg
-            AND LOCALIZAPESSOA.sitatl = 'A'
-            ORDER BY LOCALIZAPESSOA.nompes
+        return DB.fetch_all(
+            Pessoa._QUERY_ESTAGIARIOS, {"codundclg": codundclg}, row_format=row_format
+        )
+
+    @staticmethod
+    def iterar_estagiarios(
+        codundclg: int, row_format: str = "dict"
+    ) -> Iterator[dict[str, Any]]:
         """
-        return DB.fetch_all(query, {"codundclg": codundclg})
+        Versão em streaming de `listar_estagiarios`.
+        """
+        return DB.iter_rows(
+            Pessoa._QUERY_ESTAGIARIOS, {"codundclg": codundclg}, row_format=row_format
+        )
 
     @staticmethod
-    def listar_designados(categoria: int = 0) -> list[dict[str, Any]]:
+    def _query_designados(categoria: int = 0) -> str:
         """
-        Listar servidores designados ativos.
+        Monta a query de servidores designados ativos.
         """
         codundclg = os.getenv("REPLICADO_CODUNDCLG")
 
@@ -289,21 +537,34 @@ class Pessoa:
                         AND L.sitatl = 'A')
             ORDER BY L.nompes
         """
-        return DB.fetch_all(sql)
+        return sql
 
     @staticmethod
-    def listar_docentes(
-        codset_list: str | None = None, sitatl_list: str = "A"
+    def listar_designados(
+        categoria: int = 0, row_format: str = "dict"
     ) -> list[dict[str, Any]]:
         """
-        Lista docentes (ativos e/ou aposentados) da unidade.
+        Listar servidores designados ativos.
 
         Args:
-            codset_list (str, optional): Códigos de setor separados por vírgula.
-            sitatl_list (str): Situação ('A', 'P' ou 'A,P'). Defaults to 'A'.
+            categoria (int): 1 servidores, 2 docentes, 0 ambos.
+            row_format (str): Formato das linhas; ver `listar_servidores`.
+        """
+        return DB.fetch_all(Pessoa._query_designados(categoria), row_format=row_format)
 
-        Returns:
-            List[Dict[str, Any]]: Lista de docentes.
+    @staticmethod
+    def iterar_designados(
+        categoria: int = 0, row_format: str = "dict"
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `listar_designados`.
+        """
+        return DB.iter_rows(Pessoa._query_designados(categoria), row_format=row_format)
+
+    @staticmethod
+    def _query_docentes(codset_list: str | None = None, sitatl_list: str = "A") -> str:
+        """
+        Monta a query de docentes (ativos e/ou aposentados) da unidade.
         """
         unidades = os.getenv("REPLICADO_CODUNDCLG")
         where_setores = f"AND L.codset IN ({codset_list})" if codset_list else ""
@@ -312,7 +573,7 @@ class Pessoa:
         sitatl_parts = [f"'{s.strip()}'" for s in sitatl_list.split(",") if s.strip()]
         sitatl_in = ",".join(sitatl_parts)
 
-        query = f"""
+        return f"""
             SELECT * FROM LOCALIZAPESSOA L
             WHERE (L.tipvinext = 'Docente' OR L.tipvinext = 'Docente Aposentado')
                 AND L.codundclg IN ({unidades})
@@ -321,7 +582,47 @@ class Pessoa:
             ORDER BY L.nompes
         """
 
-        return DB.fetch_all(query)
+    @staticmethod
+    def listar_docentes(
+        codset_list: str | None = None,
+        sitatl_list: str = "A",
+        row_format: str = "dict",
+    ) -> list[dict[str, Any]]:
+        """
+        Lista docentes (ativos e/ou aposentados) da unidade.
+
+        Args:
+            codset_list (str, optional): Códigos de setor separados por vírgula.
+            sitatl_list (str): Situação ('A', 'P' ou 'A,P'). Defaults to 'A'.
+            row_format (str): Formato das linhas; ver `listar_servidores`.
+
+        Returns:
+            List[Dict[str, Any]]: Lista de docentes.
+        """
+        return DB.fetch_all(
+            Pessoa._query_docentes(codset_list, sitatl_list), row_format=row_format
+        )
+
+    @staticmethod
+    def iterar_docentes(
+        codset_list: str | None = None,
+        sitatl_list: str = "A",
+        row_format: str = "dict",
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `listar_docentes`: devolve um docente por vez.
+
+        Args:
+            codset_list (str, optional): Códigos de setor separados por vírgula.
+            sitatl_list (str): Situação ('A', 'P' ou 'A,P'). Defaults to 'A'.
+            row_format (str): Formato das linhas; ver `listar_servidores`.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Iterador de docentes.
+        """
+        return DB.iter_rows(
+            Pessoa._query_docentes(codset_list, sitatl_list), row_format=row_format
+        )
 
     @staticmethod
     def listar_aex(codpes: int) -> list[dict[str, Any]]:
@@ -389,6 +690,26 @@ class Pessoa:
         result = DB.fetch(query, {"codpes": codpes})
         return result["nomcnhpes"] if result else None
 
+    @staticmethod
+    def obter_nome_social_lote(codpes_list: Iterable[int]) -> dict[int, str | None]:
+        """
+        Versão em lote de `obter_nome_social`.
+
+        Args:
+            codpes_list (Iterable[int]): Números USP.
+
+        Returns:
+            dict[int, str | None]: Nome social autorizado por codpes.
+        """
+        nomes = Pessoa._mapa_lote(codpes_list)
+        query = """
+            SELECT codpes, nomcnhpes FROM PESSOA
+            WHERE codpes IN ({lista_in}) AND stautlnomsoc = 'S'
+        """
+        for row in DB.fetch_all_in(query, nomes):
+            nomes[row["codpes"]] = row["nomcnhpes"]
+        return nomes
+
     @staticmethod
     def obter_diversidade(codpes: int) -> dict[str, Any] | None:
         """
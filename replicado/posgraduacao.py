@@ -1,8 +1,10 @@
 import logging
 import os
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
+from replicado.cache import REFERENCE_TTL, cached
 from replicado.connection import DB
 
 nlogger = logging.getLogger(__name__)
@@ -30,20 +32,44 @@ class Posgraduacao:
                 return True
         return False
 
+    _QUERY_ATIVOS = """
+        SELECT LOCALIZAPESSOA.*, PESSOA.* FROM LOCALIZAPESSOA
+        INNER JOIN PESSOA ON (LOCALIZAPESSOA.codpes = PESSOA.codpes)
+        WHERE LOCALIZAPESSOA.tipvin = 'ALUNOPOS'
+        AND LOCALIZAPESSOA.codundclg = :codundclgi
+        AND LOCALIZAPESSOA.sitatl = 'A'
+        ORDER BY PESSOA.nompes ASC
+    """
+
     @staticmethod
-    def ativos(codundclgi: int) -> list[dict[str, Any]]:
+    def ativos(codundclgi: int, row_format: str = "dict") -> list[dict[str, Any]]:
         """
         Retorna todos alunos de pós-graduação ativos na unidade.
+
+        Args:
+            codundclgi (int): Código da unidade.
+            row_format (str): Formato das linhas ('dict', 'tuple', 'namedtuple'
+                ou 'slots'); os compactos ocupam bem menos memória. Ver
+                `replicado.linhas`.
         """
-        query = """
-            SELECT LOCALIZAPESSOA.*, PESSOA.* FROM LOCALIZAPESSOA
-            INNER JOIN PESSOA ON (LOCALIZAPESSOA.codpes = PESSOA.codpes)
-            WHERE LOCALIZAPESSOA.tipvin = 'ALUNOPOS'
-            AND LOCALIZAPESSOA.codundclg = :codundclgi
-            AND LOCALIZAPESSOA.sitatl = 'A'
-            ORDER BY PESSOA.nompes ASC
+        return DB.fetch_all(
+            Posgraduacao._QUERY_ATIVOS,
+            {"codundclgi": codundclgi},
+            row_format=row_format,
+        )
+
+    @staticmethod
+    def iterar_ativos(
+        codundclgi: int, row_format: str = "dict"
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `ativos`: devolve um aluno por vez.
         """
-        return DB.fetch_all(query, {"codundclgi": codundclgi})
+        return DB.iter_rows(
+            Posgraduacao._QUERY_ATIVOS,
+            {"codundclgi": codundclgi},
+            row_format=row_format,
+        )
 
     @staticmethod
     def contar_ativos(codare: int | None = None) -> int:
@@ -75,6 +101,7 @@ class Posgraduacao:
         return result["total"] if result else 0
 
     @staticmethod
+    @cached("posgraduacao", ttl=REFERENCE_TTL)
     def programas(
         codundclgi: int | None = None,
         codcur: int | None = None,
@@ -292,9 +319,11 @@ class Posgraduacao:
         return results
 
     @staticmethod
-    def listar_defesas(intervalo: dict[str, str] | None = None) -> list[dict[str, Any]]:
+    def _query_defesas(
+        intervalo: dict[str, str] | None = None,
+    ) -> tuple[str, dict[str, Any]]:
         """
-        Listar defesas em um intervalo de tempo (inicio, fim).
+        Monta a query (e os parâmetros) de defesas em um intervalo de tempo.
         """
         if not intervalo:
             now_year = datetime.now().year
@@ -329,9 +358,23 @@ class Posgraduacao:
             )
         """
 
-        return DB.fetch_all(
-            query, {"inicio": intervalo["inicio"], "fim": intervalo["fim"]}
-        )
+        return query, {"inicio": intervalo["inicio"], "fim": intervalo["fim"]}
+
+    @staticmethod
+    def listar_defesas(intervalo: dict[str, str] | None = None) -> list[dict[str, Any]]:
+        """
+        Listar defesas em um intervalo de tempo (inicio, fim).
+        """
+        return DB.fetch_all(*Posgraduacao._query_defesas(intervalo))
+
+    @staticmethod
+    def iterar_defesas(
+        intervalo: dict[str, str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Versão em streaming de `listar_defesas`.
+        """
+        return DB.iter_rows(*Posgraduacao._query_defesas(intervalo))
 
     @staticmethod
     def areas_programas(
@@ -346,36 +389,29 @@ class Posgraduacao:
             codundclgi = int(codundclgi_env.split(",")[0]) if codundclgi_env else 0
 
         programas = Posgraduacao.programas(codundclgi, codcur)
-        programas_areas = {}
+        codcurs = [p["codcur"] for p in programas]
 
-        for p in programas:
-            curr_codcur = p["codcur"]
-
-            # 1. Get areas for the course
-            query_areas = "SELECT codare FROM AREA WHERE codcur = :codcur"
-            cod_areas = DB.fetch_all(query_areas, {"codcur": curr_codcur})
-
-            areas_list = []
-            for a in cod_areas:
-                codare = a["codare"]
-                query_detail = """
-                    SELECT TOP 1 N.codcur, N.codare, N.nomare
-                    FROM NOMEAREA as N
-                    INNER JOIN CREDAREA as C ON N.codare = C.codare
-                    WHERE N.codare = :codare
-                    AND C.dtadtvare IS NULL
-                """
-                area_detail = DB.fetch(query_detail, {"codare": codare})
-                if area_detail:
-                    areas_list.append(
-                        {
-                            "codare": area_detail["codare"],
-                            "nomare": area_detail["nomare"],
-                        }
-                    )
-
-            if areas_list:
-                programas_areas[curr_codcur] = areas_list
+        # Áreas ativas de todos os programas numa única consulta; o nome de
+        # cada área é o da primeira linha encontrada
+        query = """
+            SELECT A.codcur, N.codare, N.nomare
+            FROM AREA AS A
+            INNER JOIN NOMEAREA AS N ON A.codare = N.codare
+            INNER JOIN CREDAREA AS C ON N.codare = C.codare
+            WHERE A.codcur IN ({lista_in})
+            AND C.dtadtvare IS NULL
+        """
+        areas: dict[int, dict[int, dict[str, Any]]] = {}
+        for row in DB.fetch_all_in(query, codcurs, nome="codcur"):
+            areas.setdefault(row["codcur"], {}).setdefault(
+                row["codare"], {"codare": row["codare"], "nomare": row["nomare"]}
+            )
+
+        # Mantém a ordem dos programas (por nome do curso)
+        programas_areas = {}
+        for curr_codcur in dict.fromkeys(codcurs):
+            if curr_codcur in areas:
+                programas_areas[curr_codcur] = list(areas[curr_codcur].values())
 
         return programas_areas
 
@@ -394,21 +430,26 @@ class Posgraduacao:
         else:
             codares = [codare]
 
+        # Uma consulta para todas as áreas, agrupada por área em Python para
+        # manter a saída na ordem de `codares`
+        query = """
+            SELECT DISTINCT V.codare,V.codpes,L.nompes,V.nivpgm,L.codema, V.dtainivin
+            FROM VINCULOPESSOAUSP as V
+            INNER JOIN LOCALIZAPESSOA as L ON (V.codpes = L.codpes)
+            WHERE V.tipvin = 'ALUNOPOS'
+            AND V.sitatl = 'A'
+            AND L.codundclg = :codundclgi
+            AND V.codare IN ({lista_in})
+            ORDER BY L.nompes ASC
+        """
+        alunos_areas: dict[int, list[dict[str, Any]]] = {c: [] for c in codares}
+        for aluno in DB.fetch_all_in(
+            query, codares, {"codundclgi": codundclgi}, nome="codare"
+        ):
+            alunos_areas.setdefault(aluno["codare"], []).append(aluno)
+
         alunos_programa = []
-        for c_are in codares:
-            query = """
-                SELECT DISTINCT V.codare,V.codpes,L.nompes,V.nivpgm,L.codema, V.dtainivin
-                FROM VINCULOPESSOAUSP as V
-                INNER JOIN LOCALIZAPESSOA as L ON (V.codpes = L.codpes)
-                WHERE V.tipvin = 'ALUNOPOS'
-                AND V.sitatl = 'A'
-                AND L.codundclg = :codundclgi
-                AND V.codare = :codare
-                ORDER BY L.nompes ASC
-            """
-            alunos_area = DB.fetch_all(
-                query, {"codundclgi": codundclgi, "codare": c_are}
-            )
+        for alunos_area in alunos_areas.values():
             alunos_programa.extend(alunos_area)
 
         return alunos_programa
@@ -424,22 +465,30 @@ class Posgraduacao:
             return result["dsclin"] if result else None
         return None
 
+    _QUERY_EGRESSOS_AREA = """
+        SELECT p.nompesttd AS nompes, p.codpes AS codpes, a.nivpgm, a.dtadfapgm
+        FROM HISTPROGRAMA AS h, PESSOA AS p, AGPROGRAMA AS a, TRABALHOPROG AS t
+        WHERE h.tiphstpgm = 'CON'
+        AND t.codare = h.codare AND t.codpes = h.codpes AND t.numseqpgm = h.numseqpgm
+        AND p.codpes = h.codpes
+        AND a.codpes = h.codpes AND a.codare = h.codare AND a.numseqpgm = h.numseqpgm
+        AND h.codare = :codare
+        ORDER BY h.dtaocopgm DESC, h.codpes ASC
+    """
+
     @staticmethod
     def egressos_area(codare: int) -> list[dict[str, Any]]:
         """
         Retorna lista de alunos que defenderam pós-graduação em determinada área.
         """
-        query = """
-            SELECT p.nompesttd AS nompes, p.codpes AS codpes, a.nivpgm, a.dtadfapgm
-            FROM HISTPROGRAMA AS h, PESSOA AS p, AGPROGRAMA AS a, TRABALHOPROG AS t
-            WHERE h.tiphstpgm = 'CON'
-            AND t.codare = h.codare AND t.codpes = h.codpes AND t.numseqpgm = h.numseqpgm
-            AND p.codpes = h.codpes
-            AND a.codpes = h.codpes AND a.codare = h.codare AND a.numseqpgm = h.numseqpgm
-            AND h.codare = :codare
-            ORDER BY h.dtaocopgm DESC, h.codpes ASC
+        return DB.fetch_all(Posgraduacao._QUERY_EGRESSOS_AREA, {"codare": codare})
+
+    @staticmethod
+    def iterar_egressos_area(codare: int) -> Iterator[dict[str, Any]]:
         """
-        return DB.fetch_all(query, {"codare": codare})
+        Versão em streaming de `egressos_area`.
+        """
+        return DB.iter_rows(Posgraduacao._QUERY_EGRESSOS_AREA, {"codare": codare})
 
     @staticmethod
     def contar_egressos_area_agrupado_por_ano(codare: int) -> dict[int, int]:
@@ -0,0 +1,636 @@
+"""
+Cópia local (SQLite) das tabelas de referência mais consultadas do replicado.
+
+Relatórios voltam sempre às mesmas tabelas de dimensão (PESSOA, SETOR,
+CURSOGR...). `atualizar` copia essas tabelas, filtradas pela unidade
+(REPLICADO_CODUNDCLG), para um arquivo SQLite; com REPLICADO_SNAPSHOT apontando
+para esse arquivo, o `DB` passa a responder localmente as consultas que só
+usam tabelas copiadas por inteiro (ex: UNIDADE, DISCIPLINAGR), sem ir ao
+servidor::
+
+    from replicado import snapshot
+
+    snapshot.atualizar("/var/lib/replicado/snapshot.db")  # ou: replicado snapshot
+    snapshot.configure("/var/lib/replicado/snapshot.db")
+
+A consulta é traduzida do dialeto do Sybase (``TOP``, ``CONVERT``,
+``GETDATE``...) para o do SQLite. Consultas com construções sem tradução, ou
+que falharem no SQLite, continuam indo ao replicado. O snapshot mais antigo que
+REPLICADO_SNAPSHOT_MAX_IDADE horas deixa de ser usado até ser atualizado, e um
+arquivo que não é um snapshot (vazio, corrompido, outro banco) é ignorado até
+ser substituído.
+
+As tabelas filtradas contêm apenas as pessoas, setores e cursos da unidade
+configurada, e uma consulta sobre elas (ex: o nome de um ex-aluno ou de alguém
+de outra unidade) teria resposta vazia ou incompleta. Por isso, por padrão,
+consultas que usam alguma tabela filtrada vão ao replicado. Aplicações que só
+consultam a própria unidade podem liberá-las com ``configure(..., parciais=True)``
+(ou REPLICADO_SNAPSHOT_PARCIAIS=1).
+"""
+
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import DBAPIError
+
+from .linhas import colunas_texto, fabrica
+
+logger = logging.getLogger(__name__)
+
+# Tabela -> filtro pela unidade ({codundclg}); None copia a tabela inteira
+TABELAS: dict[str, str | None] = {
+    "PESSOA": (
+        "codpes IN (SELECT codpes FROM LOCALIZAPESSOA WHERE codundclg IN ({codundclg}))"
+    ),
+    "LOCALIZAPESSOA": "codundclg IN ({codundclg})",
+    "SETOR": "codund IN ({codundclg})",
+    "UNIDADE": None,
+    "CURSOGR": "codclg IN ({codundclg})",
+    "HABILITACAOGR": (
+        "codcur IN (SELECT codcur FROM CURSOGR WHERE codclg IN ({codundclg}))"
+    ),
+    "DISCIPLINAGR": None,
+    "AREA": "codcur IN (SELECT codcur FROM CURSO WHERE codclg IN ({codundclg}))",
+    "NOMEAREA": "codcur IN (SELECT codcur FROM CURSO WHERE codclg IN ({codundclg}))",
+}
+
+# Colunas indexadas no snapshot, quando existirem na tabela
+COLUNAS_INDICE = (
+    "codpes",
+    "codund",
+    "codundclg",
+    "codset",
+    "codclg",
+    "codcur",
+    "codhab",
+    "coddis",
+    "codare",
+)
+
+MAX_IDADE: float = float(os.getenv("REPLICADO_SNAPSHOT_MAX_IDADE", "24"))
+PARCIAIS: bool = os.getenv("REPLICADO_SNAPSHOT_PARCIAIS", "0").lower() in ("1", "true")
+
+# Tabelas copiadas só em parte (filtradas pela unidade)
+_FILTRADAS = frozenset(tabela for tabela, filtro in TABELAS.items() if filtro)
+
+_TABELA_META = "_replicado_snapshot"
+# Intervalo (segundos) entre verificações de troca do arquivo por outro processo
+_VERIFICAR_A_CADA = 5.0
+
+# Tipos gravados como texto ISO e reconvertidos na leitura (detect_types)
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(" "))
+sqlite3.register_adapter(date, lambda valor: valor.isoformat())
+sqlite3.register_converter("DECIMAL", lambda valor: Decimal(valor.decode()))
+sqlite3.register_converter(
+    "DATETIME", lambda valor: datetime.fromisoformat(valor.decode())
+)
+sqlite3.register_converter("DATE", lambda valor: date.fromisoformat(valor.decode()))
+
+
+@dataclass
+class _Estado:
+    caminho: str
+    engine: Engine
+    tabelas: frozenset[str]
+    atualizado_em: datetime
+    mtime: int
+    verificado_em: float
+
+
+_caminho: str | None = None
+_max_idade: float = MAX_IDADE
+_parciais: bool = PARCIAIS
+_configurado = False
+_estado: _Estado | None = None
+# Arquivo que não pôde ser aberto: (caminho, mtime, verificado_em)
+_invalido: tuple[str, int | None, float] | None = None
+_rejeitadas: set[str] = set()
+_lock = threading.Lock()
+
+
+def configure(
+    caminho: str | None,
+    max_idade: float | None = None,
+    parciais: bool | None = None,
+) -> None:
+    """
+    Define o snapshot usado pelo `DB`. Use None para desativar o roteamento.
+
+    Args:
+        caminho (str | None): Arquivo do snapshot.
+        max_idade (float, optional): Idade máxima, em horas, para o snapshot
+            ser usado (0 desativa o limite). Padrão: REPLICADO_SNAPSHOT_MAX_IDADE.
+        parciais (bool, optional): Se True, responde localmente também as
+            consultas sobre tabelas filtradas pela unidade, cujo resultado
+            pode estar incompleto. Padrão: REPLICADO_SNAPSHOT_PARCIAIS (False).
+    """
+    global _caminho, _max_idade, _parciais, _configurado
+    with _lock:
+        _caminho = caminho
+        _max_idade = MAX_IDADE if max_idade is None else max_idade
+        _parciais = PARCIAIS if parciais is None else parciais
+        _configurado = True
+        _descartar_estado()
+
+
+def get_caminho() -> str | None:
+    """
+    Retorna o arquivo do snapshot em uso (ou None se o roteamento estiver
+    desativado).
+    """
+    global _caminho, _configurado
+    if not _configurado:
+        with _lock:
+            if not _configurado:
+                _caminho = os.getenv("REPLICADO_SNAPSHOT") or None
+                _configurado = True
+    return _caminho
+
+
+def _descartar_estado() -> None:
+    global _estado, _invalido
+    if _estado is not None:
+        _estado.engine.dispose()
+    _estado = None
+    _invalido = None
+    _rejeitadas.clear()
+
+
+def _carregar_estado(caminho: str) -> _Estado | None:
+    """
+    Abre o snapshot (somente leitura) e lê as tabelas disponíveis.
+    """
+    try:
+        mtime = os.stat(caminho).st_mtime_ns
+    except FileNotFoundError:
+        logger.warning(f"Snapshot {caminho} não encontrado; usando o replicado")
+        return None
+
+    engine = create_engine(
+        f"sqlite:///file:{caminho}?mode=ro&uri=true",
+        connect_args={
+            "detect_types": sqlite3.PARSE_DECLTYPES,
+            "check_same_thread": False,
+        },
+    )
+    try:
+        with engine.connect() as conn:
+            meta = conn.exec_driver_sql(
+                f"SELECT tabela, atualizado_em FROM {_TABELA_META}"
+            ).all()
+    except (DBAPIError, sqlite3.DatabaseError) as e:
+        # Arquivo vazio, corrompido ou de outro banco
+        erro = getattr(e, "orig", e)
+        logger.warning(f"Snapshot {caminho} inválido ({erro}); usando o replicado")
+        engine.dispose()
+        return None
+    if not meta:
+        engine.dispose()
+        return None
+    return _Estado(
+        caminho=caminho,
+        engine=engine,
+        tabelas=frozenset(tabela.upper() for tabela, _ in meta),
+        atualizado_em=min(datetime.fromisoformat(em) for _, em in meta),
+        mtime=mtime,
+        verificado_em=time.monotonic(),
+    )
+
+
+def _get_estado() -> _Estado | None:
+    """
+    Retorna o snapshot aberto, reabrindo-o se o arquivo foi substituído.
+    """
+    global _estado, _invalido
+    caminho = get_caminho()
+    if caminho is None:
+        return None
+
+    estado = _estado
+    if estado is not None and time.monotonic() - estado.verificado_em < (
+        _VERIFICAR_A_CADA
+    ):
+        return estado
+    invalido = _invalido
+    if (
+        estado is None
+        and invalido is not None
+        and invalido[0] == caminho
+        and time.monotonic() - invalido[2] < _VERIFICAR_A_CADA
+    ):
+        return None
+
+    with _lock:
+        estado = _estado
+        try:
+            mtime = os.stat(caminho).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if estado is not None and estado.caminho == caminho and estado.mtime == mtime:
+            estado.verificado_em = time.monotonic()
+            return estado
+        if (
+            estado is None
+            and _invalido is not None
+            and _invalido[:2] == (caminho, mtime)
+        ):
+            # Mesmo arquivo que já falhou: só tenta de novo quando for trocado
+            _invalido = (caminho, mtime, time.monotonic())
+            return None
+        _descartar_estado()
+        _estado = _carregar_estado(caminho)
+        if _estado is None:
+            _invalido = (caminho, mtime, time.monotonic())
+        else:
+            logger.info(
+                f"Snapshot {caminho} carregado: {len(_estado.tabelas)} tabelas, "
+                f"atualizado em {_estado.atualizado_em:%Y-%m-%d %H:%M}"
+            )
+        return _estado
+
+
+def _tabelas_da_query(sql: str) -> set[str]:
+    """
+    Retorna os nomes (em maiúsculas) das tabelas citadas em FROM e JOIN.
+    """
+    tabelas = set()
+    for trecho in re.findall(
+        r"\bFROM\s+([\w.]+(?:\s+(?:AS\s+)?\w+)?(?:\s*,\s*[\w.]+(?:\s+(?:AS\s+)?\w+)?)*)",
+        sql,
+        flags=re.IGNORECASE,
+    ):
+        for item in trecho.split(","):
+            tabelas.add(item.split()[0].split(".")[-1].upper())
+    for tabela in re.findall(r"\bJOIN\s+([\w.]+)", sql, flags=re.IGNORECASE):
+        tabelas.add(tabela.split(".")[-1].upper())
+    return tabelas
+
+
+def _argumentos(sql: str, inicio: int) -> tuple[list[str], int] | None:
+    """
+    Separa os argumentos de uma chamada cujo '(' está em `inicio`.
+
+    Returns:
+        tuple[list[str], int] | None: Argumentos e posição após o ')'.
+    """
+    nivel, atual, args = 0, inicio + 1, []
+    for i in range(inicio, len(sql)):
+        caractere = sql[i]
+        if caractere == "(":
+            nivel += 1
+        elif caractere == ")":
+            nivel -= 1
+            if nivel == 0:
+                args.append(sql[atual:i].strip())
+                return args, i + 1
+        elif caractere == "," and nivel == 1:
+            args.append(sql[atual:i].strip())
+            atual = i + 1
+    return None
+
+
+_TIPOS_CONVERT = {
+    "int": "INTEGER",
+    "integer": "INTEGER",
+    "smallint": "INTEGER",
+    "bigint": "INTEGER",
+    "tinyint": "INTEGER",
+    "numeric": "NUMERIC",
+    "decimal": "NUMERIC",
+    "float": "REAL",
+    "real": "REAL",
+    "char": "TEXT",
+    "varchar": "TEXT",
+    "nchar": "TEXT",
+    "nvarchar": "TEXT",
+    "text": "TEXT",
+}
+
+# Funções do Sybase -> (número de argumentos, modelo no SQLite)
+_FUNCOES: dict[str, tuple[int, str]] = {
+    "ISNULL": (2, "IFNULL({0}, {1})"),
+    "LEN": (1, "LENGTH({0})"),
+    "YEAR": (1, "CAST(strftime('%Y', {0}) AS INTEGER)"),
+    "MONTH": (1, "CAST(strftime('%m', {0}) AS INTEGER)"),
+    "DAY": (1, "CAST(strftime('%d', {0}) AS INTEGER)"),
+}
+
+# Construções sem tradução: a consulta vai direto ao replicado
+_SEM_TRADUCAO = re.compile(
+    r"\b(DATEADD|DATEDIFF|DATEPART|DATENAME|CHARINDEX|PATINDEX|STUFF|REPLICATE|STR"
+    r"|APPLY|PIVOT|NOLOCK|FOR\s+XML)\b|'\s*\+|\+\s*'|#\w|\bN'",
+    flags=re.IGNORECASE,
+)
+
+
+def traduzir(sql: str) -> str | None:
+    """
+    Traduz uma consulta do dialeto do Sybase para o do SQLite.
+
+    Cobre ``SELECT TOP n`` (externo), ``CONVERT(tipo, expr)``, ``GETDATE()``,
+    ``ISNULL``, ``LEN``, ``YEAR``, ``MONTH`` e ``DAY``.
+
+    Args:
+        sql (str): Consulta no dialeto do Sybase.
+
+    Returns:
+        str | None: A consulta para o SQLite, ou None se ela usar construções
+        sem tradução.
+    """
+    if _SEM_TRADUCAO.search(sql):
+        return None
+
+    tops = re.findall(r"\bTOP\s+\(?\s*(\d+|:\w+)\s*\)?", sql, flags=re.IGNORECASE)
+    limite = ""
+    if tops:
+        externo = re.match(
+            r"\s*SELECT\s+(DISTINCT\s+)?TOP\s+\(?\s*(\d+|:\w+)\s*\)?",
+            sql,
+            flags=re.IGNORECASE,
+        )
+        if len(tops) > 1 or not externo:
+            return None
+        sql = f"SELECT {externo.group(1) or ''}{sql[externo.end() :]}"
+        limite = f" LIMIT {externo.group(2)}"
+
+    sql = re.sub(
+        r"\bGETDATE\s*\(\s*\)", "datetime('now', 'localtime')", sql, flags=re.I
+    )
+
+    padrao = re.compile(r"\b(CONVERT|" + "|".join(_FUNCOES) + r")\s*\(", re.I)
+    posicao = 0
+    while encontrado := padrao.search(sql, posicao):
+        nome = encontrado.group(1).upper()
+        chamada = _argumentos(sql, encontrado.end() - 1)
+        if chamada is None:
+            return None
+        args, fim = chamada
+        if nome == "CONVERT":
+            tipo = re.sub(r"\(.*\)", "", args[0]).strip().lower()
+            if len(args) != 2 or tipo not in _TIPOS_CONVERT:
+                return None
+            novo = f"CAST({args[1]} AS {_TIPOS_CONVERT[tipo]})"
+        else:
+            quantidade, modelo = _FUNCOES[nome]
+            if len(args) != quantidade:
+                return None
+            novo = modelo.format(*args)
+        # Reexamina a partir do início da troca, para chamadas aninhadas
+        sql = sql[: encontrado.start()] + novo + sql[fim:]
+        posicao = encontrado.start() + 1
+
+    return sql.rstrip().rstrip(";") + limite
+
+
+@lru_cache(maxsize=512)
+def _plano(sql: str, tabelas: frozenset[str]) -> str | None:
+    """
+    Retorna a consulta traduzida se ela puder ser respondida pelo snapshot.
+    """
+    if not re.match(r"\s*(SELECT|WITH)\b", sql, flags=re.IGNORECASE):
+        return None
+    citadas = _tabelas_da_query(sql)
+    if not citadas or not citadas <= tabelas:
+        return None
+    return traduzir(sql)
+
+
+def rotear(query: Any) -> tuple[Engine, str] | None:
+    """
+    Decide se uma consulta do `DB` deve ser respondida pelo snapshot.
+
+    Args:
+        query (str | TextClause): Consulta no dialeto do Sybase.
+
+    Returns:
+        tuple[Engine, str] | None: Engine do snapshot e consulta traduzida, ou
+        None se a consulta deve ir ao replicado.
+    """
+    estado = _get_estado()
+    if estado is None:
+        return None
+    if _max_idade and datetime.now() - estado.atualizado_em > timedelta(
+        hours=_max_idade
+    ):
+        logger.debug(f"Snapshot {estado.caminho} desatualizado; usando o replicado")
+        return None
+
+    sql = getattr(query, "text", query)
+    if sql in _rejeitadas:
+        return None
+    tabelas = estado.tabelas if _parciais else estado.tabelas - _FILTRADAS
+    traduzida = _plano(sql, tabelas)
+    if traduzida is None:
+        return None
+    return estado.engine, traduzida
+
+
+def rejeitar(query: Any) -> None:
+    """
+    Marca uma consulta que falhou no snapshot, para que volte ao replicado.
+    """
+    _rejeitadas.add(getattr(query, "text", query))
+
+
+def _tipo_coluna(valor: Any, tipo_driver: Any, dbapi: Any) -> str:
+    """
+    Escolhe o tipo declarado da coluna no SQLite, pelo primeiro valor não nulo
+    ou, na falta dele, pelo tipo informado pelo driver.
+    """
+    if isinstance(valor, bool | int):
+        return "INTEGER"
+    if isinstance(valor, float):
+        return "REAL"
+    if isinstance(valor, Decimal):
+        return "DECIMAL"
+    if isinstance(valor, datetime):
+        return "DATETIME"
+    if isinstance(valor, date):
+        return "DATE"
+    if isinstance(valor, bytes):
+        return "BLOB"
+    if isinstance(valor, str):
+        return "TEXT"
+    for nome, tipo in (
+        ("DATETIME", "DATETIME"),
+        ("DECIMAL", "DECIMAL"),
+        ("NUMBER", "NUMERIC"),
+        ("BINARY", "BLOB"),
+        ("STRING", "TEXT"),
+    ):
+        objeto = getattr(dbapi, nome, None)
+        if tipo_driver is not None and objeto is not None and tipo_driver == objeto:
+            return tipo
+    return ""
+
+
+def _copiar(
+    local: sqlite3.Connection,
+    tabela: str,
+    codundclg: str | None,
+    batch_size: int,
+) -> int:
+    """
+    Copia uma tabela do replicado para o snapshot, em lotes.
+    """
+    from replicado.connection import DB
+
+    filtro = TABELAS.get(tabela)
+    query = f"SELECT * FROM {tabela}"
+    if filtro:
+        if not codundclg:
+            raise ValueError(
+                f"A tabela {tabela} é filtrada pela unidade: defina "
+                "REPLICADO_CODUNDCLG ou informe codundclg."
+            )
+        query += f" WHERE {filtro.format(codundclg=codundclg)}"
+
+    logger.info(f"Snapshot: copiando {tabela}")
+    total = 0
+    with DB._conectar() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(DB.compilar(query))
+        nomes = list(result.keys())
+        converter = fabrica(nomes, "tuple", colunas_texto(result))
+        descricao = result.cursor.description or [(n, None) for n in nomes]
+        dbapi = result.context.dialect.dbapi
+
+        lote = [converter(row) for row in result.fetchmany(batch_size)]
+        tipos = [
+            _tipo_coluna(
+                next((linha[i] for linha in lote if linha[i] is not None), None),
+                descricao[i][1],
+                dbapi,
+            )
+            for i in range(len(nomes))
+        ]
+        local.execute(f'DROP TABLE IF EXISTS "{tabela}"')
+        local.execute(
+            f'CREATE TABLE "{tabela}" ('
+            + ", ".join(
+                f'"{nome}" {tipo}'.rstrip()
+                for nome, tipo in zip(nomes, tipos, strict=True)
+            )
+            + ")"
+        )
+        inserir = f'INSERT INTO "{tabela}" VALUES ({", ".join("?" * len(nomes))})'
+        while lote:
+            local.executemany(inserir, lote)
+            total += len(lote)
+            lote = [converter(row) for row in result.fetchmany(batch_size)]
+
+    for coluna in COLUNAS_INDICE:
+        if coluna in nomes:
+            local.execute(
+                f'CREATE INDEX "ix_{tabela}_{coluna}" ON "{tabela}" ("{coluna}")'
+            )
+    local.execute(
+        f"INSERT OR REPLACE INTO {_TABELA_META} VALUES (?, ?, ?, ?, ?)",
+        (tabela, total, query, codundclg, datetime.now().isoformat(" ", "seconds")),
+    )
+    logger.info(f"Snapshot: {tabela} com {total} linhas")
+    return total
+
+
+def atualizar(
+    caminho: str | None = None,
+    tabelas: list[str] | None = None,
+    codundclg: str | None = None,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    """
+    Cria ou atualiza o snapshot, copiando as tabelas do replicado.
+
+    O arquivo novo é montado ao lado do atual e só o substitui no fim, de modo
+    que os leitores nunca veem um snapshot pela metade. Agende a atualização
+    (ex: cron com ``replicado snapshot``) ou chame-a sob demanda.
+
+    Args:
+        caminho (str, optional): Arquivo do snapshot. Padrão: REPLICADO_SNAPSHOT.
+        tabelas (list[str], optional): Tabelas a (re)copiar, entre as de
+            `TABELAS`. Padrão: todas. As demais já presentes são mantidas.
+        codundclg (str, optional): Unidades do filtro. Padrão:
+            REPLICADO_CODUNDCLG.
+        batch_size (int, optional): Linhas por lote. Padrão: ``DB.BATCH_SIZE``.
+
+    Returns:
+        dict[str, int]: Linhas copiadas por tabela.
+
+    Raises:
+        ValueError: Sem caminho, com tabela desconhecida ou sem unidade.
+    """
+    from replicado.connection import DB
+
+    caminho = caminho or get_caminho() or os.getenv("REPLICADO_SNAPSHOT")
+    if not caminho:
+        raise ValueError("Informe o caminho ou defina REPLICADO_SNAPSHOT.")
+    nomes = [tabela.upper() for tabela in tabelas] if tabelas else list(TABELAS)
+    desconhecidas = [tabela for tabela in nomes if tabela not in TABELAS]
+    if desconhecidas:
+        raise ValueError(f"Tabelas fora do snapshot: {desconhecidas}")
+    codundclg = codundclg or os.getenv("REPLICADO_CODUNDCLG")
+
+    temporario = f"{caminho}.tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    if tabelas and os.path.exists(caminho):
+        shutil.copyfile(caminho, temporario)
+
+    contagem = {}
+    try:
+        with closing(sqlite3.connect(temporario)) as local:
+            local.execute(
+                f"CREATE TABLE IF NOT EXISTS {_TABELA_META} (tabela TEXT PRIMARY KEY,"
+                " linhas INTEGER, consulta TEXT, codundclg TEXT, atualizado_em TEXT)"
+            )
+            for tabela in nomes:
+                contagem[tabela] = _copiar(
+                    local, tabela, codundclg, batch_size or DB.BATCH_SIZE
+                )
+                local.commit()
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    with _lock:
+        aberto = _estado.caminho if _estado is not None else None
+        if caminho in (aberto, _invalido and _invalido[0]):
+            _descartar_estado()
+    return contagem
+
+
+def status(caminho: str | None = None) -> list[dict[str, Any]]:
+    """
+    Lista as tabelas do snapshot, com linhas e data da última atualização.
+
+    Args:
+        caminho (str, optional): Arquivo do snapshot. Padrão: REPLICADO_SNAPSHOT.
+    """
+    caminho = caminho or get_caminho()
+    if not caminho or not os.path.exists(caminho):
+        return []
+    with closing(sqlite3.connect(f"file:{caminho}?mode=ro", uri=True)) as local:
+        local.row_factory = sqlite3.Row
+        return [
+            dict(row)
+            for row in local.execute(
+                f"SELECT tabela, linhas, codundclg, atualizado_em FROM {_TABELA_META}"
+                " ORDER BY tabela"
+            )
+        ]
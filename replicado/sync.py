@@ -0,0 +1,172 @@
+import logging
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from replicado.connection import DB
+from replicado.lattes import Lattes, LattesStore, _converter_zip
+from replicado.utils import lotes
+
+logger = logging.getLogger(__name__)
+
+MARCA_LATTES = "lattes_dtaultalt"
+
+
+@dataclass
+class ResultadoSincronizacao:
+    """
+    Resumo de uma sincronização de currículos Lattes.
+
+    Attributes:
+        alterados (list[int]): codpes dos currículos baixados nesta execução.
+        falhas (list[int]): codpes cujo currículo não pôde ser convertido.
+        marca_anterior (datetime | None): dtaultalt de corte usada na consulta.
+        marca_atual (datetime | None): Nova marca: a maior dtaultalt vista ou,
+            se houve falhas, a menor dtaultalt entre os currículos que falharam.
+    """
+
+    alterados: list[int] = field(default_factory=list)
+    falhas: list[int] = field(default_factory=list)
+    marca_anterior: datetime | None = None
+    marca_atual: datetime | None = None
+
+
+def listar_alterados(
+    desde: datetime | None = None, codpes_list: list[int] | None = None
+) -> list[dict[str, Any]]:
+    """
+    Lista os currículos com dtaultalt igual ou posterior a `desde`, numa única
+    consulta (ou uma por lote, se `codpes_list` for informada).
+
+    Args:
+        desde (datetime, optional): Data de corte. Sem ela, lista todos.
+        codpes_list (list[int], optional): Restringe às pessoas informadas.
+
+    Returns:
+        list[dict]: Linhas com codpes e dtaultalt, em ordem de dtaultalt.
+    """
+    filtro = "WHERE dtaultalt >= :desde" if desde else "WHERE 1 = 1"
+    params: dict[str, Any] = {"desde": desde} if desde else {}
+    if codpes_list is None:
+        query = f"SELECT codpes, dtaultalt FROM DIM_PESSOA_XMLUSP {filtro}"
+        return sorted(DB.fetch_all(query, params), key=lambda r: r["dtaultalt"])
+
+    alterados = []
+    for lote in lotes(dict.fromkeys(int(c) for c in codpes_list), Lattes.LOTE * 10):
+        lista_in, params_in = DB.cria_lista_in("codpes", lote)
+        query = f"""
+            SELECT codpes, dtaultalt FROM DIM_PESSOA_XMLUSP
+            {filtro} AND codpes IN ({lista_in})
+        """
+        alterados.extend(DB.fetch_all(query, {**params, **params_in}))
+    return sorted(alterados, key=lambda r: r["dtaultalt"])
+
+
+def sincronizar_lattes(
+    store: LattesStore | None = None,
+    desde: datetime | None = None,
+    codpes_list: list[int] | None = None,
+    ao_alterar: Callable[[int, dict[str, Any]], None] | None = None,
+    tamanho_lote: int | None = None,
+    completo: bool = False,
+) -> ResultadoSincronizacao:
+    """
+    Baixa apenas os currículos Lattes alterados desde a última sincronização.
+
+    A data de corte (marca) fica gravada no próprio armazenamento local. A cada
+    execução, consulta em lote os currículos com dtaultalt a partir da marca,
+    descarta os que já estão no armazenamento com a mesma versão, baixa o
+    restante em lotes e só então avança a marca. Se a execução falhar no
+    meio, a próxima recomeça da marca anterior; se alguns currículos falharem,
+    a marca para na dtaultalt do mais antigo deles, para que sejam tentados
+    de novo.
+
+    A marca só é gravada em execuções completas, sem `desde` nem
+    `codpes_list`: uma execução parcial não pode avançá-la para as demais
+    pessoas. Com `completo`, a marca gravada é ignorada (todos os currículos
+    são conferidos) e substituída ao final da execução; se a execução falhar
+    no meio, a marca anterior continua valendo.
+
+    Args:
+        store (LattesStore, optional): Armazenamento local. Padrão: o
+            configurado em REPLICADO_LATTES_STORE.
+        desde (datetime, optional): Data de corte explícita (ignora a marca).
+        codpes_list (list[int], optional): Restringe às pessoas informadas.
+        ao_alterar (Callable, optional): Chamado com (codpes, lattes) para cada
+            currículo baixado.
+        tamanho_lote (int, optional): Pessoas por consulta de download.
+        completo (bool, optional): Ignora a marca gravada e confere todos.
+
+    Returns:
+        ResultadoSincronizacao: Currículos alterados e marcas usadas.
+
+    Raises:
+        ValueError: Se não houver armazenamento local configurado, ou se
+            `completo` for combinado com `desde` ou `codpes_list`.
+    """
+    if store is None:
+        store = Lattes._store
+    if store is None:
+        raise ValueError(
+            "Sincronização requer armazenamento local (REPLICADO_LATTES_STORE)."
+        )
+
+    if completo and (desde is not None or codpes_list is not None):
+        raise ValueError("Sincronização completa não aceita `desde` nem `codpes_list`.")
+
+    gravar_marca = desde is None and codpes_list is None
+    if desde is None and not completo:
+        marca = store.obter_marca(MARCA_LATTES)
+        desde = datetime.fromisoformat(marca) if marca else None
+
+    resultado = ResultadoSincronizacao(marca_anterior=desde, marca_atual=desde)
+    linhas = listar_alterados(desde, codpes_list)
+    versoes = {row["codpes"]: row["dtaultalt"] for row in linhas}
+    if linhas:
+        resultado.marca_atual = linhas[-1]["dtaultalt"]
+
+    # Mesma dtaultalt já guardada: nada a baixar
+    guardadas = store.versoes(list(versoes))
+    for codpes, versao in list(versoes.items()):
+        if guardadas.get(codpes) == LattesStore._chave_versao(versao):
+            del versoes[codpes]
+    logger.info(f"Sincronização Lattes: {len(versoes)} currículos a baixar")
+
+    for codpes, dados, tamanho in _baixar(list(versoes), tamanho_lote, resultado):
+        store.set(codpes, versoes[codpes], dados, tamanho)
+        resultado.alterados.append(codpes)
+        if ao_alterar:
+            ao_alterar(codpes, dados)
+
+    if resultado.falhas:
+        # A consulta usa dtaultalt >= marca: as falhas entram na próxima
+        resultado.marca_atual = min(
+            (versoes[c] for c in resultado.falhas if c in versoes),
+            default=resultado.marca_anterior,
+        )
+    if gravar_marca and resultado.marca_atual is not None:
+        store.gravar_marca(
+            MARCA_LATTES, LattesStore._chave_versao(resultado.marca_atual)
+        )
+    logger.info(
+        f"Sincronização Lattes concluída: {len(resultado.alterados)} alterados, "
+        f"{len(resultado.falhas)} falhas"
+    )
+    return resultado
+
+
+def _baixar(
+    codpes_list: list[int],
+    tamanho_lote: int | None,
+    resultado: ResultadoSincronizacao,
+) -> Iterator[tuple[int, dict[str, Any], int]]:
+    baixados = set()
+    for codpes, zip_content in Lattes.obter_zips(codpes_list, tamanho_lote):
+        baixados.add(codpes)
+        codpes, dados, tamanho = _converter_zip(codpes, zip_content)
+        if dados is None:
+            resultado.falhas.append(codpes)
+            continue
+        yield codpes, dados, tamanho
+    resultado.falhas.extend(c for c in codpes_list if c not in baixados)
@@ -1,7 +1,10 @@
 import io
 import unicodedata
+import xml.etree.ElementTree as ET
 import zipfile
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
 
@@ -102,6 +105,22 @@ def unzip(zip_content: bytes) -> bytes | None:
         return None
 
 
+def lotes(valores: Iterable[Any], tamanho: int) -> Iterator[list[Any]]:
+    """
+    Divide os valores em listas de até `tamanho` elementos.
+
+    Args:
+        valores (Iterable): Valores a dividir.
+        tamanho (int): Tamanho máximo de cada lote.
+
+    Yields:
+        list: Próximo lote.
+    """
+    it = iter(valores)
+    while lote := list(islice(it, tamanho)):
+        yield lote
+
+
 def etree_to_dict(t: Any) -> dict[str, Any]:
     """
     Converte um ElementTree para dicionário, estrutura similar ao json_encode(simplexml) do PHP.
@@ -150,3 +169,90 @@ def get_path(data: dict[str, Any], path: str, default: Any = None) -> Any:
         else:
             return default
     return val
+
+
+def extrair_secoes(xml: bytes | str, caminhos: list[str]) -> dict[str, Any]:
+    """
+    Extrai apenas as seções pedidas de um XML, sem montar o documento inteiro.
+
+    Percorre o XML com `iterparse`, convertendo (via `etree_to_dict`) somente os
+    elementos nos caminhos informados e descartando os demais à medida que são
+    lidos. A leitura termina assim que todas as seções de primeiro nível
+    envolvidas forem fechadas.
+
+    Args:
+        xml (bytes | str): Conteúdo do XML.
+        caminhos (list[str]): Caminhos em notação de ponto (ou barra) relativos
+            à raiz, ex: 'PRODUCAO-BIBLIOGRAFICA.ARTIGOS-PUBLICADOS'.
+
+    Returns:
+        dict: Estrutura parcial no mesmo formato de `etree_to_dict` (sem a tag
+        raiz), contendo só as seções encontradas e os atributos de seus
+        ancestrais.
+    """
+    alvos = {tuple(c.replace("/", ".").split(".")) for c in caminhos}
+    prefixos = {alvo[:i] for alvo in alvos for i in range(1, len(alvo))}
+    pendentes = {alvo[0] for alvo in alvos}
+
+    resultado: dict[str, Any] = {}
+    pilha: list[ET.Element] = []
+    caminho: list[str] = []
+    dentro: int | None = None  # profundidade da seção sendo capturada
+
+    fonte = io.BytesIO(xml) if isinstance(xml, bytes) else io.StringIO(xml)
+    for evento, elem in ET.iterparse(fonte, events=("start", "end")):
+        if evento == "start":
+            if pilha:
+                caminho.append(elem.tag)
+            else:
+                if elem.attrib:
+                    resultado["@attributes"] = dict(elem.attrib)
+            pilha.append(elem)
+            if dentro is None:
+                atual = tuple(caminho)
+                if atual in alvos:
+                    dentro = len(pilha)
+                elif atual in prefixos and elem.attrib:
+                    _no(resultado, atual)["@attributes"] = dict(elem.attrib)
+            continue
+
+        if dentro is not None and len(pilha) == dentro:
+            _inserir(resultado, tuple(caminho), etree_to_dict(elem)[elem.tag])
+            dentro = None
+
+        pilha.pop()
+        if dentro is None and pilha:
+            # Libera o elemento já processado (ou fora das seções pedidas)
+            elem.clear()
+            pilha[-1].remove(elem)
+
+        if len(caminho) == 1:
+            pendentes.discard(caminho[0])
+            if not pendentes:
+                break
+        if caminho:
+            caminho.pop()
+
+    return resultado
+
+
+def _no(raiz: dict[str, Any], caminho: tuple[str, ...]) -> dict[str, Any]:
+    no = raiz
+    for chave in caminho:
+        filho = no.get(chave)
+        if not isinstance(filho, dict):
+            filho = {}
+            no[chave] = filho
+        no = filho
+    return no
+
+
+def _inserir(raiz: dict[str, Any], caminho: tuple[str, ...], valor: Any) -> None:
+    pai = _no(raiz, caminho[:-1])
+    chave = caminho[-1]
+    if chave not in pai:
+        pai[chave] = valor
+    elif isinstance(pai[chave], list):
+        pai[chave].append(valor)
+    else:
+        pai[chave] = [pai[chave], valor]
@@ -0,0 +1,114 @@
+"""
+Compara o tempo e o pico de memória da conversão XML -> dict do Lattes.
+
+- antigo: decodifica o XML, converte em dict, serializa em JSON e lê de volta.
+- direto: converte os bytes do XML direto em dict (Lattes._converter).
+- seção: extrai em streaming só a seção pedida com --secao (extrair_secoes).
+
+Uso:
+    python scripts/benchmark_lattes_parse.py [arquivo.xml|arquivo.zip ...]
+
+Sem arquivos, gera um currículo sintético (ajuste o tamanho com --artigos).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from replicado.lattes import Lattes
+from replicado.utils import etree_to_dict, extrair_secoes, unzip
+
+
+def gerar_cv(artigos: int) -> bytes:
+    """Gera um XML no formato do Lattes com o número de artigos informado."""
+    itens = []
+    for i in range(artigos):
+        itens.append(
+            f'<ARTIGO-PUBLICADO SEQUENCIA-PRODUCAO="{i}">'
+            f'<DADOS-BASICOS-DO-ARTIGO TITULO-DO-ARTIGO="Artigo número {i}" '
+            f'ANO-DO-ARTIGO="{2000 + i % 25}" IDIOMA="Português"/>'
+            f'<DETALHAMENTO-DO-ARTIGO TITULO-DO-PERIODICO-OU-REVISTA="Revista {i}" '
+            f'VOLUME="{i % 40}" PAGINA-INICIAL="1" PAGINA-FINAL="10"/>'
+            f'<AUTORES NOME-COMPLETO-DO-AUTOR="Autor {i}" ORDEM-DE-AUTORIA="1"/>'
+            f'<AUTORES NOME-COMPLETO-DO-AUTOR="Coautor {i}" ORDEM-DE-AUTORIA="2"/>'
+            f'<PALAVRAS-CHAVE PALAVRA-CHAVE-1="ciência" PALAVRA-CHAVE-2="dados"/>'
+            "</ARTIGO-PUBLICADO>"
+        )
+    xml = (
+        '<?xml version="1.0" encoding="ISO-8859-1"?>'
+        '<CURRICULO-VITAE NUMERO-IDENTIFICADOR="0000000000000000">'
+        '<DADOS-GERAIS NOME-COMPLETO="Pessoa de Teste"/>'
+        "<PRODUCAO-BIBLIOGRAFICA><ARTIGOS-PUBLICADOS>"
+        + "".join(itens)
+        + "</ARTIGOS-PUBLICADOS></PRODUCAO-BIBLIOGRAFICA></CURRICULO-VITAE>"
+    )
+    return xml.encode("iso-8859-1")
+
+
+def antigo(xml_bytes: bytes) -> dict:
+    """Caminho anterior: bytes -> str -> dict -> JSON -> dict."""
+    root = ET.fromstring(Lattes._decodificar(xml_bytes, 0))
+    d = etree_to_dict(root)
+    if root.tag in d:
+        d = d[root.tag]
+    return json.loads(json.dumps(d))
+
+
+def direto(xml_bytes: bytes) -> dict:
+    return Lattes._converter(xml_bytes, 0)
+
+
+def medir(func, xml_bytes: bytes, repeticoes: int) -> tuple[float, float, dict]:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func(xml_bytes)
+    tempo = (time.perf_counter() - inicio) / repeticoes
+
+    tracemalloc.start()
+    func(xml_bytes)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico / 1024 / 1024, resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("arquivos", nargs="*", help="XML ou ZIP do Lattes")
+    parser.add_argument("--artigos", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--secao", default="DADOS-GERAIS")
+    args = parser.parse_args()
+
+    amostras = []
+    for caminho in args.arquivos:
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        if caminho.endswith(".zip"):
+            conteudo = unzip(conteudo)
+        amostras.append((os.path.basename(caminho), conteudo))
+    if not amostras:
+        amostras.append((f"sintético ({args.artigos} artigos)", gerar_cv(args.artigos)))
+
+    for nome, xml_bytes in amostras:
+        print(f"{nome}: {len(xml_bytes) / 1024 / 1024:.1f} MB de XML")
+        t_antigo, m_antigo, r_antigo = medir(antigo, xml_bytes, args.repeticoes)
+        t_direto, m_direto, r_direto = medir(direto, xml_bytes, args.repeticoes)
+        assert r_antigo == r_direto, "Resultados diferentes entre os caminhos"
+        print(f"  antigo: {t_antigo * 1000:8.1f} ms  pico {m_antigo:7.1f} MB")
+        print(f"  direto: {t_direto * 1000:8.1f} ms  pico {m_direto:7.1f} MB")
+
+        def secao(xml: bytes) -> dict:
+            return extrair_secoes(xml, [args.secao])
+
+        t_secao, m_secao, _ = medir(secao, xml_bytes, args.repeticoes)
+        print(f"  seção:  {t_secao * 1000:8.1f} ms  pico {m_secao:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
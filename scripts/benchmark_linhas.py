@@ -0,0 +1,92 @@
+"""
+Mede o custo por linha da conversão de resultados largos (``SELECT *``).
+
+Monta um SQLite em memória com uma tabela no formato de PESSOA (muitas colunas
+CHAR com espaços à direita) e compara, sobre as mesmas linhas já lidas do
+cursor:
+
+- antigo: dicionário por linha com `clean_string` em todas as células;
+- sem tipos: o plano de colunas quando o driver não descreve os tipos
+  (caso do sqlite3), ainda limpando célula a célula;
+- com tipos: o plano quando o driver informa quais colunas são texto (caso do
+  pymssql), que só faz ``strip`` nessas colunas.
+
+Uso:
+    python scripts/benchmark_linhas.py [--linhas 20000] [--colunas 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, text
+
+from replicado.linhas import fabrica
+from replicado.utils import clean_string
+
+
+def criar_linhas(linhas: int, colunas: int) -> tuple[list[str], list]:
+    nomes = [f"c{i}" for i in range(colunas)]
+    # Uma coluna de texto a cada três, como em PESSOA/LOCALIZAPESSOA
+    tipos = ["CHAR(20)" if i % 3 == 0 else "INTEGER" for i in range(colunas)]
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE PESSOA ("
+                + ", ".join(f"{n} {t}" for n, t in zip(nomes, tipos, strict=True))
+                + ")"
+            )
+        )
+        conn.execute(
+            text(f"INSERT INTO PESSOA VALUES ({', '.join(':' + n for n in nomes)})"),
+            [
+                {
+                    n: f"valor {j % 97}   " if t.startswith("CHAR") else j
+                    for n, t in zip(nomes, tipos, strict=True)
+                }
+                for j in range(linhas)
+            ],
+        )
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT * FROM PESSOA")).all()
+    return tipos, rows
+
+
+def medir(func, rows: list) -> float:
+    melhor = float("inf")
+    for _ in range(3):
+        inicio = time.perf_counter()
+        func(rows)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor / len(rows) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=20000)
+    parser.add_argument("--colunas", type=int, default=60)
+    args = parser.parse_args()
+
+    tipos, rows = criar_linhas(args.linhas, args.colunas)
+    nomes = list(rows[0]._mapping.keys())
+    sem_tipos = fabrica(nomes, "dict")
+    com_tipos = fabrica(nomes, "dict", [t.startswith("CHAR") for t in tipos])
+
+    def antigo(rows: list) -> list:
+        return [{k: clean_string(v) for k, v in row._mapping.items()} for row in rows]
+
+    assert antigo(rows[:10]) == [com_tipos(row) for row in rows[:10]]
+    base = medir(antigo, rows)
+    print(f"{args.linhas} linhas x {args.colunas} colunas (µs por linha)")
+    print(f"{'antigo':>10}: {base:6.2f}")
+    for nome, converter in [("sem tipos", sem_tipos), ("com tipos", com_tipos)]:
+        tempo = medir(lambda rows, c=converter: [c(row) for row in rows], rows)
+        print(f"{nome:>10}: {tempo:6.2f}  ({base / tempo:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Conta as idas ao banco de Posgraduacao.areas_programas e alunos_programa.
+
+Monta um SQLite em memória com N programas de pós, cada um com M áreas, e
+compara a implementação antiga (uma consulta por programa e por área) com a
+atual (consultas em conjunto, agrupadas em Python).
+
+Uso:
+    python scripts/benchmark_posgraduacao_roundtrips.py [--alunos 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, text
+
+from replicado import cache
+from replicado.connection import DB
+from replicado.posgraduacao import Posgraduacao
+
+TABELAS = [
+    "CREATE TABLE CURSO (codcur INTEGER, codclg INTEGER, tipcur TEXT, dtainiccp TEXT)",
+    "CREATE TABLE NOMECURSO (codcur INTEGER, nomcur TEXT, dtafimcur TEXT)",
+    "CREATE TABLE AREA (codcur INTEGER, codare INTEGER)",
+    "CREATE TABLE NOMEAREA (codcur INTEGER, codare INTEGER, nomare TEXT, dtafimare TEXT)",
+    "CREATE TABLE CREDAREA (codare INTEGER, dtadtvare TEXT)",
+    "CREATE TABLE VINCULOPESSOAUSP (codpes INTEGER, codare INTEGER, nivpgm TEXT, "
+    "dtainivin TEXT, tipvin TEXT, sitatl TEXT)",
+    "CREATE TABLE LOCALIZAPESSOA (codpes INTEGER, nompes TEXT, codema TEXT, "
+    "codundclg INTEGER)",
+]
+
+
+def criar_banco(programas: int, areas: int, alunos: int) -> list[str]:
+    engine = create_engine("sqlite://")
+    codpes = 0
+    with engine.begin() as conn:
+        for tabela in TABELAS:
+            conn.execute(text(tabela))
+        for p in range(1, programas + 1):
+            conn.execute(
+                text(f"INSERT INTO CURSO VALUES ({p}, 45, 'POS', '2000-01-01')")
+            )
+            conn.execute(
+                text(f"INSERT INTO NOMECURSO VALUES ({p}, 'Programa {p}', NULL)")
+            )
+            for a in range(areas):
+                codare = p * 100 + a
+                conn.execute(text(f"INSERT INTO AREA VALUES ({p}, {codare})"))
+                conn.execute(
+                    text(f"INSERT INTO NOMEAREA VALUES ({p}, {codare}, 'Área', NULL)")
+                )
+                conn.execute(text(f"INSERT INTO CREDAREA VALUES ({codare}, NULL)"))
+                for _ in range(alunos):
+                    codpes += 1
+                    conn.execute(
+                        text(
+                            f"INSERT INTO VINCULOPESSOAUSP VALUES ({codpes}, {codare}, "
+                            "'DO', '2020-01-01', 'ALUNOPOS', 'A')"
+                        )
+                    )
+                    conn.execute(
+                        text(
+                            f"INSERT INTO LOCALIZAPESSOA VALUES ({codpes}, "
+                            f"'Aluno {codpes}', 'a@usp.br', 45)"
+                        )
+                    )
+
+    consultas = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: consultas.append(sql),
+    )
+    DB._engine = engine
+    return consultas
+
+
+def areas_programas_antigo(codundclgi: int) -> dict:
+    """Implementação anterior: uma consulta por programa e uma por área."""
+    programas_areas = {}
+    for p in Posgraduacao.programas(codundclgi):
+        cod_areas = DB.fetch_all(
+            "SELECT codare FROM AREA WHERE codcur = :codcur", {"codcur": p["codcur"]}
+        )
+        areas_list = []
+        for a in cod_areas:
+            area = DB.fetch(
+                """
+                SELECT N.codcur, N.codare, N.nomare
+                FROM NOMEAREA as N
+                INNER JOIN CREDAREA as C ON N.codare = C.codare
+                WHERE N.codare = :codare AND C.dtadtvare IS NULL
+                """,
+                {"codare": a["codare"]},
+            )
+            if area:
+                areas_list.append({"codare": area["codare"], "nomare": area["nomare"]})
+        if areas_list:
+            programas_areas[p["codcur"]] = areas_list
+    return programas_areas
+
+
+def medir(consultas: list[str], func, *args) -> tuple[int, float]:
+    cache.invalidate()
+    consultas.clear()
+    inicio = time.perf_counter()
+    func(*args)
+    return len(consultas), (time.perf_counter() - inicio) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alunos", type=int, default=5, help="Alunos por área")
+    args = parser.parse_args()
+
+    print(f"{'programas':>9} {'áreas':>6} | {'antigo':>14} | {'atual':>14}")
+    for programas, areas in [(1, 1), (5, 3), (20, 5), (50, 5)]:
+        consultas = criar_banco(programas, areas, args.alunos)
+        n_antigo, t_antigo = medir(consultas, areas_programas_antigo, 45)
+        n_atual, t_atual = medir(consultas, Posgraduacao.areas_programas, 45)
+        n_alunos, _ = medir(consultas, Posgraduacao.alunos_programa, 45, 1)
+        print(
+            f"{programas:>9} {areas:>6} | {n_antigo:>4} idas {t_antigo:5.1f}ms"
+            f" | {n_atual:>4} idas {t_atual:5.1f}ms"
+            f"  (alunos_programa: {n_alunos} idas)"
+        )
+
+
+if __name__ == "__main__":
+    main()
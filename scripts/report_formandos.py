@@ -68,13 +68,19 @@ def main():
                 })
 
     print(f"Processando {len(alunos)} alunos...")
-    
+
+    # Médias sujas de todos os alunos de uma vez (uma consulta por lote)
+    try:
+        medias = Graduacao.obter_medias_ponderadas([a['codpes'] for a in alunos])
+    except Exception as e:
+        print(f"❌ Erro ao calcular as médias: {e}")
+        medias = {}
+
     results = []
     for aluno in alunos:
         codpes = aluno['codpes']
         try:
-            # Obtém média suja
-            media = Graduacao.obter_media_ponderada_suja(codpes)
+            media = medias[codpes]
             # Formata média para PT-BR (vírgula como decimal)
             if isinstance(media, (float, int)):
                 aluno['media_suja'] = str(media).replace('.', ',')
@@ -0,0 +1,11 @@
+import pytest
+
+from replicado import cache
+
+
+@pytest.fixture(autouse=True)
+def limpar_cache():
+    """Garante que resultados em cache não vazem de um teste para outro."""
+    cache.invalidate()
+    yield
+    cache.invalidate()
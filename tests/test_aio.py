@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from replicado import aio
+
+
+@pytest.fixture(autouse=True)
+def executor():
+    aio.configure(4)
+    yield
+    aio.configure()
+
+
+def lento(query, params=None):
+    time.sleep(0.2)
+    return {"codema": f"{params['codpes']}@usp.br"}
+
+
+def test_chamadas_concorrentes_se_sobrepoem() -> None:
+    async def principal():
+        inicio = time.perf_counter()
+        emails = await asyncio.gather(*(aio.Pessoa.email(c) for c in range(4)))
+        return emails, time.perf_counter() - inicio
+
+    with patch("replicado.connection.DB.fetch", side_effect=lento):
+        emails, duracao = asyncio.run(principal())
+
+    assert emails == [f"{c}@usp.br" for c in range(4)]
+    assert duracao < 0.6  # em série seriam 0.8s
+
+
+def test_concorrencia_limitada() -> None:
+    aio.configure(1)
+    ativos, maximo = [0], [0]
+    lock = threading.Lock()
+
+    def contar(query, params=None):
+        with lock:
+            ativos[0] += 1
+            maximo[0] = max(maximo[0], ativos[0])
+        time.sleep(0.05)
+        with lock:
+            ativos[0] -= 1
+
+    async def principal():
+        await asyncio.gather(*(aio.Pessoa.email(c) for c in range(3)))
+
+    with patch("replicado.connection.DB.fetch", side_effect=contar):
+        asyncio.run(principal())
+
+    assert maximo[0] == 1
+
+
+def test_erros_propagam() -> None:
+    async def principal():
+        return await asyncio.gather(
+            aio.Pessoa.email(1), aio.Pessoa.email(2), return_exceptions=True
+        )
+
+    with patch(
+        "replicado.connection.DB.fetch",
+        side_effect=[{"codema": "a@usp.br"}, RuntimeError("falhou")],
+    ):
+        resultados = asyncio.run(principal())
+
+    assert "a@usp.br" in resultados
+    assert any(isinstance(r, RuntimeError) for r in resultados)
+
+
+def test_iteradores_viram_assincronos() -> None:
+    async def principal():
+        return [linha async for linha in aio.Pessoa.iterar_estagiarios(45)]
+
+    with patch("replicado.connection.DB.iter_rows") as mock_iter:
+        mock_iter.return_value = iter([{"codpes": c} for c in range(5)])
+        linhas = asyncio.run(principal())
+
+    assert linhas == [{"codpes": c} for c in range(5)]
+    assert aio.Pessoa.__name__ == "Pessoa"
+
+
+def test_paginas_viram_assincronas() -> None:
+    paginas = [[{"numpat": "001"}, {"numpat": "002"}], [{"numpat": "003"}]]
+
+    async def principal():
+        iterador = aio.Bempatrimoniado.paginas_bens()
+        assert not asyncio.iscoroutine(iterador)
+        return [pagina async for pagina in iterador]
+
+    with patch("replicado.connection.DB.iter_pages") as mock_paginas:
+        mock_paginas.return_value = iter(paginas)
+        assert asyncio.run(principal()) == paginas
+    for metodo in (
+        aio.Estrutura.paginas_locais_unidade,
+        aio.Financeiro.paginas_bens_por_local,
+        aio.Pessoa.paginas_procurar_por_nome,
+    ):
+        assert hasattr(metodo(1), "__aiter__")
@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+from replicado import cache
+from replicado.cache import MemoryBackend, SQLiteBackend, cached
+from replicado.estrutura import Estrutura
+from replicado.graduacao import Graduacao
+
+
+def test_metodo_em_cache() -> None:
+    """Dados de referência são buscados no replicado uma única vez."""
+    with patch("replicado.connection.DB.fetch") as mock_fetch:
+        mock_fetch.return_value = {"nomcur": "Computação"}
+        assert Graduacao.nome_curso(45) == "Computação"
+        assert Graduacao.nome_curso(45) == "Computação"
+        assert mock_fetch.call_count == 1
+
+        Graduacao.nome_curso(46)
+        assert mock_fetch.call_count == 2
+
+
+def test_invalidate_namespace() -> None:
+    """invalidate descarta apenas o namespace informado."""
+    with (
+        patch("replicado.connection.DB.fetch_all") as mock_fetch_all,
+        patch("replicado.connection.DB.fetch") as mock_fetch,
+    ):
+        mock_fetch_all.return_value = [{"codund": 45}]
+        mock_fetch.return_value = {"nomcur": "Computação"}
+        Estrutura.listar_unidades()
+        Graduacao.nome_curso(45)
+
+        cache.invalidate("estrutura")
+        Estrutura.listar_unidades()
+        Graduacao.nome_curso(45)
+
+        assert mock_fetch_all.call_count == 2
+        assert mock_fetch.call_count == 1
+
+
+def test_valor_copiado() -> None:
+    """Alterar o resultado retornado não altera o que está em cache."""
+    with patch("replicado.connection.DB.fetch_all") as mock_fetch_all:
+        mock_fetch_all.return_value = [{"codund": 45}]
+        Estrutura.listar_unidades()[0]["codund"] = 0
+        assert Estrutura.listar_unidades() == [{"codund": 45}]
+
+
+def test_memory_backend_lru_ttl() -> None:
+    """O backend em memória respeita o limite de itens e o TTL."""
+    backend = MemoryBackend(max_itens=2)
+    backend.set("a", "ns", 1, ttl=60)
+    backend.set("b", "ns", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", "ns", 3, ttl=60)
+
+    assert backend.get("b") == (False, None)
+    assert backend.get("a") == (True, 1)
+
+    backend.set("d", "ns", 4, ttl=-1)
+    assert backend.get("d") == (False, None)
+
+
+def test_sqlite_backend(tmp_path) -> None:
+    """O backend SQLite é compartilhado entre instâncias do mesmo arquivo."""
+    caminho = str(tmp_path / "cache.db")
+    SQLiteBackend(caminho).set("x", "ns", [{"a": 1}], ttl=60)
+
+    outro = SQLiteBackend(caminho, max_itens=1)
+    assert outro.get("x") == (True, [{"a": 1}])
+
+    outro.set("y", "ns", 2, ttl=60)
+    assert len(outro) == 1
+
+    outro.invalidate("ns")
+    assert outro.get("y") == (False, None)
+
+
+def test_cache_desativado() -> None:
+    """Com o cache desativado, toda chamada vai ao replicado."""
+    chamadas = []
+
+    @cached("teste")
+    def consulta(x: int) -> int:
+        chamadas.append(x)
+        return x
+
+    anterior = cache.get_backend()
+    cache.configure(None)
+    try:
+        consulta(1)
+        consulta(1)
+    finally:
+        cache.configure(anterior)
+    assert chamadas == [1, 1]
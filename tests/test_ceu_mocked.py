@@ -10,11 +10,14 @@ class TestCEU(unittest.TestCase):
     @patch.dict(os.environ, {"REPLICADO_CODUNDCLG": "12,34"})
     def test_listar_cursos(self, mock_fetch) -> None:
         # First call: listarCursos main query
-        # Second call: ministrantes for course 1
+        # Second call: ministrantes for all courses (batched)
 
         curso_mock = {"codcurceu": 1, "codedicurceu": 1, "nomcurceu": "Curso Teste"}
 
-        ministrante_mock = [{"nompes": "Ministrante A"}]
+        ministrante_mock = [
+            {"codcurceu": 1, "codedicurceu": 1, "nompes": "Ministrante A"},
+            {"codcurceu": 1, "codedicurceu": 2, "nompes": "Outra Edição"},
+        ]
 
         mock_fetch.side_effect = [[curso_mock], ministrante_mock]
 
@@ -22,6 +25,7 @@ class TestCEU(unittest.TestCase):
         self.assertEqual(len(cursos), 1)
         self.assertEqual(cursos[0]["nomcurceu"], "Curso Teste")
         self.assertEqual(cursos[0]["ministrantes"], "Ministrante A")
+        self.assertEqual(mock_fetch.call_count, 2)
 
     @patch("replicado.connection.DB.fetch_all")
     def test_listar_cursos_deptos(self, mock_fetch) -> None:
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from replicado import concurrent
+from replicado.connection import DB
+from replicado.graduacao import Graduacao
+from replicado.lattes import LattesCache
+from replicado.posgraduacao import Posgraduacao
+
+
+@pytest.fixture(autouse=True)
+def executor():
+    concurrent.configure(4)
+    yield
+    concurrent.configure()
+
+
+def test_gather_em_paralelo() -> None:
+    def lento(query, params=None):
+        time.sleep(0.2)
+        return {"total": 1}
+
+    with patch("replicado.connection.DB.fetch", side_effect=lento):
+        inicio = time.perf_counter()
+        painel = concurrent.gather(
+            graduacao=Graduacao.contar_ativos,
+            pos=Posgraduacao.contar_ativos,
+            pos_area=lambda: Posgraduacao.contar_ativos(codare=1),
+        )
+        duracao = time.perf_counter() - inicio
+
+    assert painel == {"graduacao": 1, "pos": 1, "pos_area": 1}
+    assert duracao < 0.5  # em série seriam 0.6s
+
+
+def test_gather_erros_por_chamada() -> None:
+    def falha():
+        raise RuntimeError("primeira")
+
+    def outra_falha():
+        raise KeyError("segunda")
+
+    resultados = concurrent.gather(
+        lambda: 1, falha, outra_falha, return_exceptions=True
+    )
+    assert resultados[0] == 1
+    assert isinstance(resultados[1], RuntimeError)
+    assert isinstance(resultados[2], KeyError)
+
+    with pytest.raises(RuntimeError, match="primeira") as erro:
+        concurrent.gather(lambda: 1, falha, outra_falha)
+    assert "segunda" in erro.value.__notes__[0]
+
+    with pytest.raises(ValueError):
+        concurrent.gather(falha, nome=falha)
+
+
+def test_gather_aninhado_nao_trava() -> None:
+    concurrent.configure(1)
+    resultado = concurrent.gather(
+        lambda: concurrent.gather(lambda: 1, lambda: 2), timeout=5
+    )
+    assert resultado == [[1, 2]]
+
+
+def test_get_engine_criada_uma_vez() -> None:
+    original = DB._engine
+    DB._engine = None
+    barreira = threading.Barrier(8)
+
+    def criar_lento(*args, **kwargs):
+        time.sleep(0.05)
+        return object()
+
+    env = {
+        "REPLICADO_HOST": "localhost",
+        "REPLICADO_PORT": "1433",
+        "REPLICADO_DATABASE": "db",
+        "REPLICADO_USERNAME": "user",
+        "REPLICADO_PASSWORD": "pass",
+    }
+    try:
+        with (
+            patch.dict(os.environ, env),
+            patch(
+                "replicado.connection.create_engine", side_effect=criar_lento
+            ) as mock_create,
+        ):
+            concurrent.configure(8)
+            engines = concurrent.gather(
+                *[lambda: barreira.wait() is not None and DB.get_engine()] * 8
+            )
+        assert mock_create.call_count == 1
+        assert len({id(e) for e in engines}) == 1
+    finally:
+        DB._engine = original
+
+
+def test_db_sob_concorrencia() -> None:
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'db.sqlite')}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE T (codpes INTEGER)"))
+            conn.execute(
+                text("INSERT INTO T VALUES (:c)"), [{"c": c} for c in range(100)]
+            )
+        original = DB._engine
+        DB._engine = engine
+        DB.reset_pool_stats()
+        try:
+            resultados = concurrent.gather(
+                *[
+                    lambda c=c: DB.fetch(
+                        "SELECT codpes FROM T WHERE codpes = :c", {"c": c}
+                    )
+                    for c in range(100)
+                ]
+            )
+        finally:
+            DB._engine = original
+            engine.dispose()
+
+    assert [r["codpes"] for r in resultados] == list(range(100))
+    assert DB.pool_stats()["checkouts"] == 100
+
+
+def test_lattes_cache_sob_concorrencia() -> None:
+    cache = LattesCache(max_bytes=1000, revalidar=0)
+
+    def usar(codpes):
+        for i in range(200):
+            chave = (codpes * 7 + i) % 50
+            if cache.get(chave, lambda: "v1") is None:
+                cache.set(chave, "v1", {"codpes": chave}, 30)
+
+    concurrent.configure(8)
+    concurrent.gather(*[lambda c=c: usar(c) for c in range(8)])
+
+    stats = cache.stats()
+    assert stats["bytes"] == stats["itens"] * 30 <= 1000
+    assert stats["hits"] + stats["misses"] == 8 * 200
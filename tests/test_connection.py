@@ -36,3 +36,384 @@ def test_missing_env_vars() -> None:
     with patch.dict(os.environ, {}, clear=True):
         with pytest.raises(ValueError, match="Variáveis de ambiente de conexão"):
             DB.get_engine()
+
+
+@pytest.fixture
+def sqlite_db():
+    """Substitui a engine do DB por um SQLite em memória com dados de exemplo."""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE LOCALUSP (codlocusp INTEGER, codund INTEGER, idfloc TEXT)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO LOCALUSP VALUES (:c, :u, :i)"),
+            [{"c": i, "u": 45, "i": f"Sala {i}   "} for i in range(1, 11)],
+        )
+    original = DB._engine
+    DB._engine = engine
+    yield engine
+    DB._engine = original
+
+
+def test_iter_rows_streaming(sqlite_db) -> None:
+    """iter_rows devolve as linhas sob demanda, já limpas."""
+    rows = DB.iter_rows("SELECT * FROM LOCALUSP ORDER BY codlocusp", batch_size=3)
+    primeira = next(rows)
+    assert primeira == {"codlocusp": 1, "codund": 45, "idfloc": "Sala 1"}
+    assert len(list(rows)) == 9
+
+
+def test_iter_rows_modulo() -> None:
+    """As variantes iterar_* dos módulos usam o mesmo SQL das listar_*."""
+    from replicado.estrutura import Estrutura
+
+    with patch("replicado.connection.DB.iter_rows") as mock_iter:
+        mock_iter.return_value = iter([{"codlocusp": 1}])
+        assert list(Estrutura.iterar_locais_unidade(45)) == [{"codlocusp": 1}]
+        query, params = mock_iter.call_args[0]
+        assert "FROM LOCALUSP" in query
+        assert params == {"codund": 45}
+
+
+def test_pool_config_from_env() -> None:
+    """A configuração do pool é lida das variáveis REPLICADO_POOL_*."""
+    from replicado.connection import PoolConfig
+
+    env = {
+        "REPLICADO_POOL_SIZE": "20",
+        "REPLICADO_POOL_MAX_OVERFLOW": "0",
+        "REPLICADO_POOL_RECYCLE": "1800",
+        "REPLICADO_POOL_LIFO": "true",
+        "REPLICADO_POOL_PRE_PING_INTERVAL": "60",
+    }
+    with patch.dict(os.environ, env, clear=True):
+        config = PoolConfig.from_env()
+
+    kwargs = config.engine_kwargs()
+    assert kwargs["pool_size"] == 20
+    assert kwargs["max_overflow"] == 0
+    assert kwargs["pool_recycle"] == 1800
+    assert kwargs["pool_use_lifo"] is True
+    # Com intervalo, o ping por checkout do SQLAlchemy fica desligado
+    assert kwargs["pool_pre_ping"] is False
+
+
+def test_configure_null_pool() -> None:
+    """DB.configure recria a engine com a nova configuração de pool."""
+    from sqlalchemy.pool import NullPool
+
+    from replicado.connection import PoolConfig
+
+    env = {
+        "REPLICADO_HOST": "localhost",
+        "REPLICADO_PORT": "1433",
+        "REPLICADO_DATABASE": "test_db",
+        "REPLICADO_USERNAME": "user",
+        "REPLICADO_PASSWORD": "pass",
+    }
+    DB._engine = None
+    try:
+        with (
+            patch("replicado.connection.create_engine") as mock_create_engine,
+            patch.dict(os.environ, env),
+        ):
+            DB.configure(PoolConfig(null_pool=True))
+            DB.get_engine()
+            kwargs = mock_create_engine.call_args.kwargs
+            assert kwargs["poolclass"] is NullPool
+            assert "pool_size" not in kwargs
+    finally:
+        DB.configure()
+
+
+def test_pool_stats(sqlite_db) -> None:
+    """Cada checkout é contabilizado nas métricas do pool."""
+    DB.reset_pool_stats()
+    DB.fetch_all("SELECT * FROM LOCALUSP")
+    list(DB.iter_rows("SELECT * FROM LOCALUSP"))
+
+    stats = DB.pool_stats()
+    assert stats["checkouts"] == 2
+    assert stats["espera_max"] >= stats["espera_media"] >= 0
+    assert stats.get("em_uso", 0) == 0
+
+
+def test_pre_ping_interval(sqlite_db) -> None:
+    """Com intervalo, só conexões ociosas há mais tempo são testadas."""
+    from replicado.connection import PoolConfig
+
+    DB._pool_config = PoolConfig(pre_ping_interval=60)
+    try:
+        DB.reset_pool_stats()
+        with patch("replicado.connection.time.monotonic", return_value=1000.0):
+            DB.fetch("SELECT 1")
+            DB.fetch("SELECT 1")
+        assert DB.pool_stats()["pings"] == 0
+
+        with patch("replicado.connection.time.monotonic", return_value=2000.0):
+            DB.fetch("SELECT 1")
+        assert DB.pool_stats()["pings"] == 1
+    finally:
+        DB._pool_config = None
+
+
+def test_compilar_cache(sqlite_db) -> None:
+    """Queries repetidas reaproveitam o mesmo TextClause."""
+    from sqlalchemy import text
+
+    query = "SELECT idfloc FROM LOCALUSP WHERE codlocusp = :c"
+    assert DB.compilar(query) is DB.compilar(query)
+
+    clausula = text(query)
+    assert DB.compilar(clausula) is clausula
+    assert DB.fetch(clausula, {"c": 2}) == {"idfloc": "Sala 2"}
+
+    hits = DB.compilar_cache_info().hits
+    DB.fetch(query, {"c": 3})
+    assert DB.compilar_cache_info().hits == hits + 1
+
+
+def test_fetch_columns_array(sqlite_db) -> None:
+    """fetch_columns devolve uma coluna por campo, já limpa e tipada."""
+    colunas = DB.fetch_columns(
+        "SELECT * FROM LOCALUSP ORDER BY codlocusp", formato="array", batch_size=3
+    )
+    assert list(colunas) == ["codlocusp", "codund", "idfloc"]
+    assert colunas["codlocusp"].typecode == "q"
+    assert list(colunas["codlocusp"]) == list(range(1, 11))
+    assert colunas["idfloc"][0] == "Sala 1"
+
+
+def test_coluna_muda_de_tipo() -> None:
+    """A coluna passa de inteiros para reais ou lista conforme os valores."""
+    from replicado.colunar import Coluna, montar
+
+    reais, nulos, grandes = Coluna(), Coluna(), Coluna()
+    reais.extend((1, 2))
+    reais.extend((0.5,))
+    nulos.extend((1, 2))
+    nulos.extend((None, " a "))
+    grandes.extend((1,))
+    grandes.extend((2**70, 3))
+
+    colunas = montar(["r", "n", "g"], [reais, nulos, grandes], formato="array")
+    assert colunas["r"].typecode == "d"
+    assert list(colunas["r"]) == [1.0, 2.0, 0.5]
+    assert colunas["n"] == [1, 2, None, "a"]
+    assert colunas["g"] == [1, 2**70, 3]
+
+    with pytest.raises(ValueError, match="Formato inválido"):
+        montar(["r"], [reais], formato="csv")
+
+
+def test_fetch_columns_numpy_arrow(sqlite_db) -> None:
+    np = pytest.importorskip("numpy")
+    colunas = DB.fetch_columns("SELECT * FROM LOCALUSP", formato="numpy")
+    assert colunas["codlocusp"].dtype == np.int64
+    assert colunas["idfloc"][0] == "Sala 1"
+
+    pytest.importorskip("pyarrow")
+    tabela = DB.fetch_columns("SELECT * FROM LOCALUSP", formato="arrow")
+    assert tabela.num_rows == 10
+    assert tabela.column("idfloc")[0].as_py() == "Sala 1"
+
+
+def test_colunas_modulos() -> None:
+    """As variantes colunas_* usam o mesmo SQL das listagens."""
+    from replicado.bempatrimoniado import Bempatrimoniado
+    from replicado.estrutura import Estrutura
+
+    with patch("replicado.connection.DB.fetch_columns") as mock_colunas:
+        Estrutura.colunas_locais_unidade(45, formato="array")
+        query, params = mock_colunas.call_args[0]
+        assert "FROM LOCALUSP" in query
+        assert params == {"codund": 45}
+        assert mock_colunas.call_args[1] == {"formato": "array"}
+
+        Bempatrimoniado.colunas_bens({"stabem": "Ativo"})
+        query, params = mock_colunas.call_args[0]
+        assert "FROM BEMPATRIMONIADO" in query
+        assert "TOP" not in query
+
+
+def test_row_format(sqlite_db) -> None:
+    """Os formatos compactos trazem os mesmos valores que o dicionário."""
+    from replicado.linhas import Tabela
+
+    query = "SELECT codlocusp, idfloc, codund AS codlocusp FROM LOCALUSP"
+    dicts = DB.fetch_all(query)
+    assert dicts[0] == {"codlocusp": 45, "idfloc": "Sala 1"}
+
+    tabela = DB.fetch_all(query, row_format="tuple")
+    assert isinstance(tabela, Tabela)
+    assert tabela.colunas == ("codlocusp", "idfloc")
+    assert tabela[0] == (45, "Sala 1")
+    assert tabela.como_dicts() == dicts
+
+    nomeadas = DB.fetch_all(query, row_format="namedtuple")
+    assert nomeadas[0].idfloc == "Sala 1"
+    assert type(nomeadas[0]) is type(DB.fetch_all(query, row_format="namedtuple")[1])
+    assert nomeadas[0]._asdict() == dicts[0]
+
+    slots = DB.fetch_all(query, row_format="slots")
+    assert slots[0].codlocusp == 45
+    assert not hasattr(slots[0], "__dict__")
+
+    assert next(DB.iter_rows(query, row_format="tuple")) == (45, "Sala 1")
+    assert DB.fetch(query, row_format="namedtuple").idfloc == "Sala 1"
+    with pytest.raises(ValueError, match="Formato de linha inválido"):
+        DB.fetch_all(query, row_format="lista")
+
+
+def test_row_format_fetch_all_in(sqlite_db) -> None:
+    """fetch_all_in mantém o cabeçalho da Tabela entre os lotes."""
+    tabela = DB.fetch_all_in(
+        "SELECT codlocusp FROM LOCALUSP WHERE codlocusp IN ({lista_in})",
+        range(1, 8),
+        nome="cod",
+        tamanho_lote=3,
+        row_format="tuple",
+    )
+    assert tabela.colunas == ("codlocusp",)
+    assert sorted(tabela) == [(i,) for i in range(1, 8)]
+
+
+def test_row_format_modulos() -> None:
+    """As listagens grandes repassam row_format para o DB."""
+    from replicado.pessoa import Pessoa
+    from replicado.posgraduacao import Posgraduacao
+
+    with patch("replicado.connection.DB.fetch_all") as mock_fetch_all:
+        Pessoa.listar_servidores(row_format="namedtuple")
+        assert mock_fetch_all.call_args[1] == {"row_format": "namedtuple"}
+        Posgraduacao.ativos(45, row_format="tuple")
+        assert mock_fetch_all.call_args[1] == {"row_format": "tuple"}
+
+
+def test_plano_colunas_texto() -> None:
+    """Só as colunas declaradas como texto pelo driver passam por strip."""
+    from types import SimpleNamespace
+
+    from replicado.linhas import colunas_texto, fabrica
+
+    dbapi = SimpleNamespace(STRING="STRING")
+    result = SimpleNamespace(
+        cursor=SimpleNamespace(
+            description=[("nompes", "STRING"), ("codpes", "NUMBER"), ("x", None)]
+        ),
+        context=SimpleNamespace(dialect=SimpleNamespace(dbapi=dbapi)),
+    )
+    texto = colunas_texto(result)
+    assert texto == (True, False, None)
+
+    converter = fabrica(["nompes", "codpes", "x"], "dict", texto)
+    assert converter(("Ana   ", " 1 ", " y ")) == {
+        "nompes": "Ana",
+        "codpes": " 1 ",
+        "x": "y",
+    }
+    assert converter((None, 1, None)) == {"nompes": None, "codpes": 1, "x": None}
+
+    # Driver sem STRING (ex: sqlite3): sem plano, limpeza valor a valor
+    result.context.dialect.dbapi = SimpleNamespace()
+    assert colunas_texto(result) is None
+
+
+@pytest.fixture
+def sqlite_top(sqlite_db, monkeypatch):
+    """SQLite não tem TOP: traduz as consultas como o snapshot faz."""
+    from replicado import snapshot
+
+    fetch_all = DB.fetch_all
+    monkeypatch.setattr(
+        DB,
+        "fetch_all",
+        lambda query, params=None, **kwargs: fetch_all(
+            snapshot.traduzir(query), params, **kwargs
+        ),
+    )
+    return sqlite_db
+
+
+def test_fetch_page(sqlite_top) -> None:
+    """A paginação por chave percorre a listagem sem repetir nem pular linhas."""
+    from replicado.estrutura import Estrutura
+
+    pagina = Estrutura.pagina_locais_unidade(45, tamanho=4)
+    assert [r["codlocusp"] for r in pagina] == [1, 2, 3, 4]
+    assert pagina[0]["idfloc"] == "Sala 1"
+    assert pagina.proxima == 4
+
+    pagina = Estrutura.pagina_locais_unidade(45, apos=8, tamanho=4)
+    assert [r["codlocusp"] for r in pagina] == [9, 10]
+    assert pagina.proxima is None
+
+    paginas = list(Estrutura.paginas_locais_unidade(45, tamanho=4))
+    assert [[r["codlocusp"] for r in p] for p in paginas] == [
+        [1, 2, 3, 4],
+        [5, 6, 7, 8],
+        [9, 10],
+    ]
+    # Última página cheia: a consulta seguinte vem vazia e não é devolvida
+    assert [len(p) for p in Estrutura.paginas_locais_unidade(45, tamanho=5)] == [5, 5]
+    assert list(Estrutura.paginas_locais_unidade(99)) == []
+
+
+def test_fetch_page_chave_repetida(sqlite_top) -> None:
+    """Com chave_unica=False, as linhas de uma chave ficam na mesma página."""
+    from sqlalchemy import text
+
+    with sqlite_top.begin() as conn:
+        conn.execute(text("CREATE TABLE VINCULO (codpes INTEGER, tipvin TEXT)"))
+        conn.execute(
+            text("INSERT INTO VINCULO VALUES (:c, :t)"),
+            [
+                {"c": c, "t": t}
+                for c, t in [(1, "A"), (1, "B"), (2, "A"), (2, "B"), (2, "C"), (3, "A")]
+            ],
+        )
+
+    query = "SELECT {top}V.* FROM VINCULO V WHERE {apos}"
+    paginas = list(DB.iter_pages(query, "V.codpes", tamanho=2, chave_unica=False))
+    assert [[(r["codpes"], r["tipvin"]) for r in p] for p in paginas] == [
+        [(1, "A"), (1, "B")],
+        [(2, "A"), (2, "B"), (2, "C")],
+        [(3, "A")],
+    ]
+    assert [p.proxima for p in paginas] == [1, 2, None]
+
+
+def test_pagina_modulos() -> None:
+    """As listagens paginadas ordenam pela chave natural e filtram por ela."""
+    from replicado.bempatrimoniado import Bempatrimoniado
+    from replicado.financeiro import Financeiro
+    from replicado.pessoa import Pessoa
+
+    with patch("replicado.connection.DB.fetch_all", return_value=[]) as mock:
+        Bempatrimoniado.pagina_bens({"stabem": "Ativo"}, apos="001.000", tamanho=50)
+        sql, params = mock.call_args[0]
+        assert sql.startswith("SELECT TOP 50 * FROM BEMPATRIMONIADO")
+        assert "WHERE numpat > :pagina_apos AND (" in sql
+        assert sql.endswith("ORDER BY numpat")
+        assert params == {"stabem": "Ativo", "pagina_apos": "001.000"}
+
+        Financeiro.pagina_bens_por_local(10)
+        sql, params = mock.call_args[0]
+        assert f"TOP {DB.PAGE_SIZE} " in sql
+        assert params == {"codlocusp": 10}
+
+        Pessoa.pagina_procurar_por_nome("ANA", ativos=False, apos=5)
+        sql, params = mock.call_args[0]
+        assert "SELECT DISTINCT TOP" in sql
+        assert "P.codpes > :pagina_apos" in sql
+        assert sql.endswith("ORDER BY P.codpes")
+
+        Pessoa.procurar_por_nome("ANA")
+        sql, params = mock.call_args[0]
+        assert "{" not in sql and "TOP" not in sql
+        assert sql.endswith("ORDER BY P.nompesttd ASC")
@@ -12,8 +12,8 @@ class TestConvenio(unittest.TestCase):
     def test_listar_convenios(self, mock_fetch) -> None:
         # Mock calls:
         # 1. listar convenios
-        # 2. listar coordenadores (for conv 1)
-        # 3. listar organizacoes (for conv 1)
+        # 2. listar coordenadores (all convenios)
+        # 3. listar organizacoes (all convenios)
 
         conv_mock = {
             "codcvn": 1,
@@ -22,8 +22,8 @@ class TestConvenio(unittest.TestCase):
             "dataFim": datetime(2023, 12, 31),
         }
 
-        coord_mock = [{"nompesttd": "Coord A"}]
-        org_mock = [{"nomeOrganizacao": "Org A"}]
+        coord_mock = [{"codcvn": 1, "nompesttd": "Coord A"}]
+        org_mock = [{"codcvn": 1, "nomeOrganizacao": "Org A"}]
 
         mock_fetch.side_effect = [[conv_mock], coord_mock, org_mock]
 
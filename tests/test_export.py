@@ -0,0 +1,123 @@
+import csv
+import gzip
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from replicado import cli
+from replicado.export import exportar, resolver
+from replicado.pessoa import Pessoa
+
+
+def _docentes(n: int):
+    for i in range(n):
+        yield {"codpes": i, "nompes": f"Docente {i}", "dtanas": datetime(1980, 1, 1)}
+
+
+def test_exportar_csv_gzip(tmp_path) -> None:
+    destino = tmp_path / "docentes.csv.gz"
+    chamadas = []
+    total = exportar(
+        _docentes(2500), str(destino), tamanho_lote=1000, progresso=chamadas.append
+    )
+    assert total == 2500
+    assert chamadas == [1000, 2000, 2500]
+    with gzip.open(destino, "rt", encoding="utf-8") as arquivo:
+        linhas = list(csv.DictReader(arquivo))
+    assert len(linhas) == 2500
+    assert linhas[1] == {
+        "codpes": "1",
+        "nompes": "Docente 1",
+        "dtanas": "1980-01-01 00:00:00",
+    }
+    assert not (tmp_path / "docentes.csv.gz.tmp").exists()
+
+
+def test_exportar_jsonl(tmp_path) -> None:
+    destino = tmp_path / "bens.jsonl"
+    exportar([{"numpat": 1, "valor": Decimal("10.50"), "data": None}], str(destino))
+    assert json.loads(destino.read_text(encoding="utf-8")) == {
+        "numpat": 1,
+        "valor": "10.50",
+        "data": None,
+    }
+
+
+def test_exportar_parquet(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    destino = tmp_path / "docentes.parquet"
+    linhas = [{"codpes": 1, "obs": None}] + [{"codpes": 2, "obs": 3}]
+    exportar(linhas, str(destino), tamanho_lote=1)
+    tabela = pq.read_table(destino)
+    assert tabela.column("obs").to_pylist() == [None, "3"]
+
+
+def test_exportar_parquet_alarga_esquema(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    destino = tmp_path / "bens.parquet"
+    linhas = [
+        {"numpat": 1, "valor": Decimal("10.50"), "qtd": 1, "obs": None},
+        {"numpat": 2, "valor": Decimal("3.1"), "qtd": 2, "obs": "a"},
+        # Lotes seguintes não cabem nos tipos do primeiro
+        {"numpat": 3, "valor": Decimal("123456.789"), "qtd": 2.5, "obs": 7},
+        {"numpat": 4, "valor": 5, "qtd": None, "obs": None},
+    ]
+    assert exportar(linhas, str(destino), tamanho_lote=2) == 4
+
+    tabela = pq.read_table(destino)
+    assert str(tabela.schema.field("valor").type) == "decimal128(38, 3)"
+    assert tabela.column("valor").to_pylist() == [
+        Decimal("10.500"),
+        Decimal("3.100"),
+        Decimal("123456.789"),
+        Decimal("5.000"),
+    ]
+    assert tabela.column("qtd").to_pylist() == [1.0, 2.0, 2.5, None]
+    assert tabela.column("obs").to_pylist() == [None, "a", "7", None]
+    assert list(tmp_path.iterdir()) == [destino]
+
+
+def test_exportar_interrompido_nao_deixa_arquivo(tmp_path) -> None:
+    def falha():
+        yield {"codpes": 1}
+        raise RuntimeError("conexão perdida")
+
+    destino = tmp_path / "parcial.csv"
+    with pytest.raises(RuntimeError):
+        exportar(falha(), str(destino), tamanho_lote=1)
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(ValueError, match="Formato de exportação inválido"):
+        exportar([], str(tmp_path / "dados.xlsx"))
+
+
+def test_resolver() -> None:
+    assert resolver("Pessoa.listar_docentes") == Pessoa.iterar_docentes
+    assert resolver("Posgraduacao.egressos_area").__name__ == "iterar_egressos_area"
+    assert resolver("Pessoa.email") == Pessoa.email
+    with pytest.raises(ValueError, match="desconhecido"):
+        resolver("Pessoa.nao_existe")
+    with pytest.raises(ValueError, match="desconhecido"):
+        resolver("os.system")
+
+
+def test_cli_export(tmp_path) -> None:
+    destino = tmp_path / "docentes.jsonl"
+    with patch.object(Pessoa, "iterar_docentes", return_value=_docentes(3)) as mock:
+        codigo = cli.main(
+            [
+                "export",
+                "Pessoa.listar_docentes",
+                str(destino),
+                "-p",
+                "sitatl_list=A,P",
+                "-p",
+                "codset_list=600",
+            ]
+        )
+    assert codigo == 0
+    mock.assert_called_once_with(sitatl_list="A,P", codset_list=600)
+    assert len(destino.read_text(encoding="utf-8").splitlines()) == 3
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+
+from replicado.graduacao import Graduacao
+
+HISTORICO = {
+    1: [
+        {"creaul": 4, "cretrb": 0, "notfim": 7.0, "notfim2": None},
+        {"creaul": 2, "cretrb": 2, "notfim": 3.0, "notfim2": 5.5},
+        {"creaul": 2, "cretrb": None, "notfim": "", "notfim2": ""},
+    ],
+    2: [{"creaul": 3, "cretrb": 1, "notfim": "8.25", "notfim2": ""}],
+    3: [],
+}
+
+
+class TestMediasPonderadas(unittest.TestCase):
+    @patch("replicado.connection.DB.fetch_all")
+    def test_mesmo_resultado_que_individual(self, mock_fetch_all) -> None:
+        individuais = {}
+        for codpes, disciplinas in HISTORICO.items():
+            mock_fetch_all.return_value = disciplinas
+            individuais[codpes] = Graduacao.obter_media_ponderada_suja(codpes)
+
+        mock_fetch_all.reset_mock()
+        mock_fetch_all.return_value = [
+            {"codpes": codpes, **row}
+            for codpes, disciplinas in HISTORICO.items()
+            for row in disciplinas
+        ]
+
+        medias = Graduacao.obter_medias_ponderadas([1, 2, 3, 2])
+
+        self.assertEqual(medias, individuais)
+        self.assertEqual(medias, {1: 6.2, 2: 8.2, 3: 0.0})
+        mock_fetch_all.assert_called_once()
+        query, params = mock_fetch_all.call_args[0]
+        self.assertIn("MAX(codpgm)", query)
+        self.assertIn("IN (:codpes_0, :codpes_1, :codpes_2)", query)
+        self.assertEqual(params, {"codpes_0": 1, "codpes_1": 2, "codpes_2": 3})
+
+    @patch("replicado.connection.DB.fetch_all")
+    def test_codpgm_e_rstfim(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = []
+
+        Graduacao.obter_medias_ponderadas([1], codpgm=2, rstfim=["A", "NULL"])
+
+        query, params = mock_fetch_all.call_args[0]
+        self.assertNotIn("MAX(codpgm)", query)
+        self.assertIn("H.rstfim IN ('A') OR H.rstfim IS NULL", query)
+        self.assertEqual(params["codpgm"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
+import io
+import os
+import tempfile
 import unittest
+import zipfile
+from datetime import datetime
 from unittest.mock import patch
 
-from replicado.lattes import Lattes
+from replicado.lattes import Lattes, LattesCache, LattesStore
 
 
 class TestLattes(unittest.TestCase):
@@ -288,3 +293,253 @@ class TestLattes(unittest.TestCase):
         res_dr = Lattes.retornar_banca_doutorado(123, lattes_array=mock_array)
         self.assertIn("Banca DR", res_dr[0])
         self.assertIn("Cand A", res_dr[0])
+
+
+class TestLattesCache(unittest.TestCase):
+    def test_evicao_por_tamanho(self) -> None:
+        cache = LattesCache(max_bytes=100, revalidar=300)
+        cache.set(1, "v1", {"a": 1}, 40)
+        cache.set(2, "v1", {"b": 2}, 40)
+        cache.get(1)
+        cache.set(3, "v1", {"c": 3}, 40)
+
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), {"a": 1})
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["bytes"], 80)
+
+        # Currículos maiores que o limite não são armazenados
+        cache.set(4, "v1", {}, 101)
+        self.assertIsNone(cache.get(4))
+
+    def test_revalidacao_por_dtaultalt(self) -> None:
+        cache = LattesCache(max_bytes=100, revalidar=0)
+        cache.set(1, "2024-01-01", {"a": 1}, 10)
+
+        self.assertEqual(cache.get(1, lambda: "2024-01-01"), {"a": 1})
+        self.assertIsNone(cache.get(1, lambda: "2024-02-01"))
+        self.assertEqual(cache.stats()["invalidacoes"], 1)
+
+    @patch("replicado.lattes.Lattes._versao", return_value="2024-01-01")
+    @patch(
+        "replicado.lattes.Lattes._obter_xml_bytes", return_value=b"<CV><A>1</A></CV>"
+    )
+    def test_obter_array_usa_cache(self, mock_xml, mock_versao) -> None:
+        Lattes._cache.clear()
+        self.assertEqual(Lattes.obter_array(123), {"A": "1"})
+        self.assertEqual(Lattes.obter_array(123), {"A": "1"})
+        mock_xml.assert_called_once()
+        Lattes._cache.clear()
+
+    @patch("replicado.lattes.Lattes._versao", return_value="2024-02-01")
+    @patch(
+        "replicado.lattes.Lattes._obter_xml_bytes", return_value=b"<CV><A>2</A></CV>"
+    )
+    def test_obter_array_revalida_uma_vez(self, mock_xml, mock_versao) -> None:
+        Lattes._cache.clear()
+        Lattes._cache.set(123, "2024-01-01", {"A": "1"}, 10)
+        with patch.object(Lattes._cache, "revalidar", 0):
+            self.assertEqual(Lattes.obter_array(123), {"A": "2"})
+        # A versão da revalidação é a mesma usada para guardar o novo currículo
+        mock_versao.assert_called_once_with(123)
+        self.assertEqual(Lattes._cache.get(123), {"A": "2"})
+        Lattes._cache.clear()
+
+    def test_converter_xml_latin1(self) -> None:
+        xml = (
+            '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            '<CURRICULO-VITAE><DADOS-GERAIS NOME-COMPLETO="João"/>'
+            "<A>1</A><A>2</A></CURRICULO-VITAE>"
+        ).encode("iso-8859-1")
+        self.assertEqual(
+            Lattes._converter(xml, 123),
+            {
+                "DADOS-GERAIS": {"@attributes": {"NOME-COMPLETO": "João"}},
+                "A": ["1", "2"],
+            },
+        )
+
+    @patch("replicado.lattes.Lattes.obter_array", return_value={"A": "1"})
+    def test_obter_json(self, mock_array) -> None:
+        self.assertEqual(Lattes.obter_json(123), '{"A": "1"}')
+
+    @patch("replicado.lattes.Lattes._versao", return_value="2024-01-01")
+    @patch("replicado.lattes.Lattes._obter_xml_bytes")
+    def test_obter_secoes(self, mock_xml, mock_versao) -> None:
+        Lattes._cache.clear()
+        mock_xml.return_value = (
+            b"<CURRICULO-VITAE><DADOS-GERAIS/><PRODUCAO-BIBLIOGRAFICA>"
+            b"<ARTIGOS-PUBLICADOS><ARTIGO-PUBLICADO SEQUENCIA-PRODUCAO='1'>"
+            b"<DADOS-BASICOS-DO-ARTIGO TITULO-DO-ARTIGO='Artigo 1' "
+            b"ANO-DO-ARTIGO='2021'/>"
+            b"</ARTIGO-PUBLICADO></ARTIGOS-PUBLICADOS></PRODUCAO-BIBLIOGRAFICA>"
+            b"</CURRICULO-VITAE>"
+        )
+        secao = "PRODUCAO-BIBLIOGRAFICA.ARTIGOS-PUBLICADOS"
+
+        parcial = Lattes.obter_secoes(123, [secao])
+        self.assertNotIn("DADOS-GERAIS", parcial)
+        artigos = Lattes.listar_artigos(123, lattes_array=parcial)
+        self.assertEqual(artigos[0]["TITULO-DO-ARTIGO"], "Artigo 1")
+
+        # Com o currículo completo em cache, as seções saem dele
+        completo = Lattes.obter_array(123)
+        self.assertEqual(Lattes.obter_secoes(123, [secao]), parcial)
+        self.assertIn("DADOS-GERAIS", completo)
+        Lattes._cache.clear()
+
+    @patch("replicado.lattes.Lattes.obter_secoes")
+    def test_extrair_relatorio(self, mock_secoes) -> None:
+        mock_secoes.return_value = {
+            "PRODUCAO-BIBLIOGRAFICA": {
+                "ARTIGOS-PUBLICADOS": {
+                    "ARTIGO-PUBLICADO": [
+                        {
+                            "DADOS-BASICOS-DO-ARTIGO": {
+                                "@attributes": {
+                                    "TITULO-DO-ARTIGO": f"Artigo {ano}",
+                                    "ANO-DO-ARTIGO": str(ano),
+                                }
+                            }
+                        }
+                        for ano in (2019, 2020, 2021)
+                    ]
+                }
+            },
+            "DADOS-GERAIS": {
+                "PREMIOS-TITULOS": {
+                    "PREMIO-TITULO": {
+                        "@attributes": {
+                            "NOME-DO-PREMIO-OU-TITULO": "Prêmio A",
+                            "ANO-DA-PREMIACAO": "2020",
+                        }
+                    }
+                }
+            },
+        }
+
+        relatorio = Lattes.extrair_relatorio(
+            123,
+            ["artigos", "premios"],
+            filtro={"tipo": "periodo", "limit_ini": 2020, "limit_fim": 2021},
+        )
+
+        mock_secoes.assert_called_once_with(
+            123,
+            [
+                "PRODUCAO-BIBLIOGRAFICA.ARTIGOS-PUBLICADOS",
+                "DADOS-GERAIS.PREMIOS-TITULOS",
+            ],
+        )
+        self.assertEqual([a["ANO"] for a in relatorio["artigos"]], ["2021", "2020"])
+        self.assertEqual(relatorio["premios"], ["Prêmio A - Ano: 2020"])
+
+        with self.assertRaises(ValueError):
+            Lattes.extrair_relatorio(123, ["inexistente"])
+
+    @patch("replicado.connection.DB.iter_rows")
+    def test_obter_zips_em_lotes(self, mock_iter) -> None:
+        mock_iter.side_effect = lambda query, params, batch_size: iter(
+            [{"codpes": c, "imgarqxml": b"zip"} for c in params.values() if c != 3]
+        )
+
+        zips = list(Lattes.obter_zips([1, 2, 3, 2], tamanho_lote=2))
+
+        self.assertEqual(zips, [(1, b"zip"), (2, b"zip")])
+        self.assertEqual(mock_iter.call_count, 2)
+        query, params = mock_iter.call_args_list[0][0]
+        self.assertIn("IN (:codpes_0, :codpes_1)", query)
+        self.assertEqual(params, {"codpes_0": 1, "codpes_1": 2})
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_obter_arrays(self, mock_fetch_all, mock_zips) -> None:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("curriculo.xml", "<CV><A>2</A></CV>")
+
+        Lattes._cache.clear()
+        Lattes._cache.set(1, "v1", {"A": "1"}, 10)
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "dtaultalt": "v1"},
+            {"codpes": 2, "dtaultalt": "v1"},
+        ]
+        mock_zips.return_value = iter([(2, buffer.getvalue())])
+
+        arrays = dict(Lattes.obter_arrays([1, 2, 3]))
+
+        self.assertEqual(arrays, {1: {"A": "1"}, 2: {"A": "2"}})
+        # Só o currículo fora do cache é baixado
+        mock_zips.assert_called_once_with([2], Lattes.LOTE)
+        self.assertEqual(Lattes._cache.get(2), {"A": "2"})
+        Lattes._cache.clear()
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_obter_arrays_paralelo(self, mock_fetch_all, mock_zips) -> None:
+        zips = []
+        for codpes in range(1, 6):
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w") as zf:
+                zf.writestr("curriculo.xml", f"<CV><A>{codpes}</A></CV>")
+            zips.append((codpes, buffer.getvalue()))
+
+        Lattes._cache.clear()
+        mock_fetch_all.return_value = [
+            {"codpes": c, "dtaultalt": "v1"} for c in range(1, 6)
+        ]
+        mock_zips.return_value = iter(zips)
+
+        arrays = dict(Lattes.obter_arrays_paralelo(range(1, 6), workers=2, chunksize=2))
+
+        self.assertEqual(arrays, {c: {"A": str(c)} for c in range(1, 6)})
+        self.assertEqual(Lattes.cache_stats()["itens"], 5)
+        Lattes._cache.clear()
+
+
+class TestLattesStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.dir.name, "lattes.db")
+        Lattes._cache.clear()
+
+    def tearDown(self) -> None:
+        Lattes.configurar_store(None)
+        Lattes._cache.clear()
+        self.dir.cleanup()
+
+    def test_store_por_versao(self) -> None:
+        store = LattesStore(self.caminho)
+        store.set(1, datetime(2024, 1, 1), {"A": "1"}, 100)
+
+        self.assertEqual(store.get(1, datetime(2024, 1, 1)), ({"A": "1"}, 100))
+        self.assertIsNone(store.get(1, datetime(2024, 2, 1)))
+        self.assertEqual(
+            list(
+                LattesStore(self.caminho).get_many(
+                    {1: datetime(2024, 1, 1), 2: datetime(2024, 1, 1)}
+                )
+            ),
+            [(1, {"A": "1"}, 100)],
+        )
+
+    @patch("replicado.lattes.Lattes._versao", return_value=datetime(2024, 1, 1))
+    @patch(
+        "replicado.lattes.Lattes._obter_xml_bytes", return_value=b"<CV><A>1</A></CV>"
+    )
+    def test_obter_array_sobrevive_reinicio(self, mock_xml, mock_versao) -> None:
+        Lattes.configurar_store(self.caminho)
+        self.assertEqual(Lattes.obter_array(123), {"A": "1"})
+
+        # Simula um novo processo: cache em memória vazio
+        Lattes._cache.clear()
+        Lattes.configurar_store(self.caminho)
+        self.assertEqual(Lattes.obter_array(123), {"A": "1"})
+        mock_xml.assert_called_once()
+
+        # Currículo atualizado no replicado é baixado de novo
+        Lattes._cache.clear()
+        mock_versao.return_value = datetime(2024, 2, 1)
+        Lattes.obter_array(123)
+        self.assertEqual(mock_xml.call_count, 2)
@@ -0,0 +1,83 @@
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from replicado.loader import BatchLoader
+from replicado.pesquisa import Pesquisa
+
+
+class TestBatchLoader(unittest.TestCase):
+    @patch("replicado.connection.DB.fetch_all")
+    def test_load_agrupa_chaves(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "nompes": "A"},
+            {"codpes": 2, "nompes": "B"},
+        ]
+        loader = BatchLoader(
+            "SELECT codpes, nompes FROM PESSOA WHERE codpes IN ({lista_in})"
+        )
+
+        adiados = [loader.load(c) for c in (1, 2, 3, 1)]
+        mock_fetch_all.assert_not_called()
+
+        self.assertEqual(
+            [a.valor and a.valor["nompes"] for a in adiados],
+            [
+                "A",
+                "B",
+                None,
+                "A",
+            ],
+        )
+        mock_fetch_all.assert_called_once()
+        _, params = mock_fetch_all.call_args[0]
+        self.assertEqual(params, {"chave_0": 1, "chave_1": 2, "chave_2": 3})
+
+        # Chaves já resolvidas não são buscadas de novo
+        self.assertEqual(loader.load_many([2])[2]["nompes"], "B")
+        mock_fetch_all.assert_called_once()
+
+    @patch("replicado.connection.DB.fetch_all")
+    def test_chave_composta(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = [
+            {"codcur": 1, "edicao": 1, "nompes": "A"},
+            {"codcur": 1, "edicao": 2, "nompes": "B"},
+            {"codcur": 1, "edicao": 1, "nompes": "C"},
+        ]
+        loader = BatchLoader(
+            "SELECT * FROM T WHERE codcur IN ({lista_in})",
+            chave=lambda row: (row["codcur"], row["edicao"]),
+            muitos=True,
+            valor_in=lambda chave: chave[0],
+        )
+
+        result = loader.load_many([(1, 1), (1, 3)])
+
+        self.assertEqual([r["nompes"] for r in result[(1, 1)]], ["A", "C"])
+        self.assertEqual(result[(1, 3)], [])
+        self.assertEqual(mock_fetch_all.call_args[0][1], {"chave_0": 1})
+
+    @patch("replicado.connection.DB.fetch_all")
+    @patch.dict(os.environ, {"REPLICADO_CODUNDCLG": "12"})
+    def test_iniciacao_cientifica_uma_consulta_de_cursos(self, mock_fetch_all) -> None:
+        ics = [
+            {
+                "aluno": codpes,
+                "data_ini": datetime(2023, 1, 1),
+                "tipo_vinculo": "ALUNOICD",
+            }
+            for codpes in range(1, 21)
+        ]
+        cursos = [{"codpes": 1, "codcurgrd": 10, "nomcur": "Curso A"}]
+        mock_fetch_all.side_effect = [ics, cursos]
+
+        res = Pesquisa.listar_iniciacao_cientifica()
+
+        self.assertEqual(mock_fetch_all.call_count, 2)
+        self.assertEqual(res[0]["nome_curso"], "Curso A")
+        self.assertIsNone(res[1]["codcur"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import inspect
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from replicado import Bempatrimoniado, Estrutura, Financeiro, Lattes, metricas
+from replicado.connection import DB
+
+
+@pytest.fixture
+def sqlite_db():
+    """SQLite no lugar do replicado, com a instrumentação zerada ao final."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE BEMPATRIMONIADO (numpat TEXT, codbem INTEGER, "
+                "stabem TEXT, sglcendsp TEXT, codlocusp INTEGER)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO BEMPATRIMONIADO VALUES (:n, 1, 'Ativo', 'IME', 7)"),
+            [{"n": f"001.{i:06d}"} for i in range(1, 11)],
+        )
+    original = DB._engine
+    DB._engine = engine
+    yield engine
+    DB._engine = original
+    metricas.configure(ativo=False, consulta_lenta=0, spans="")
+    metricas.zerar()
+
+
+def test_estatisticas_por_metodo(sqlite_db) -> None:
+    metricas.configure(ativo=True)
+    Financeiro.listar_bens_por_local(7)
+    Financeiro.listar_bens_por_local(7)
+    # Iterador fechado antes do fim: a chamada termina no fechamento
+    bens = Bempatrimoniado.iterar_bens()
+    next(bens)
+    bens.close()
+    DB.fetch("SELECT * FROM BEMPATRIMONIADO WHERE numpat = '001.000003'")
+
+    stats = metricas.estatisticas()
+    listar = stats["Financeiro.listar_bens_por_local"]
+    assert listar["chamadas"] == 2
+    assert listar["consultas"] == 2
+    assert listar["linhas"] == 20
+    assert listar["bytes"] > 0
+    assert 0 < listar["tempo_db"] <= listar["tempo_total"]
+    assert 0 < listar["p50"] <= listar["p99"] == listar["max"]
+
+    iterar = stats["Bempatrimoniado.iterar_bens"]
+    assert (iterar["chamadas"], iterar["linhas"]) == (1, 1)
+    assert stats["DB.fetch"]["linhas"] == 1
+
+    metricas.zerar()
+    assert metricas.estatisticas() == {}
+
+
+def test_desligada_nao_mede(sqlite_db) -> None:
+    Financeiro.listar_bens_por_local(7)
+    assert metricas.estatisticas() == {}
+    # A versão instrumentada continua geradora (ver replicado.aio)
+    assert inspect.isgeneratorfunction(Lattes.obter_arrays)
+
+
+def test_cache_hits_e_erros() -> None:
+    metricas.configure(ativo=True)
+    try:
+        with patch("replicado.connection.DB.fetch", return_value={"codund": 45}):
+            Estrutura.obter_unidade(45)
+            Estrutura.obter_unidade(45)
+        with patch("replicado.connection.DB.fetch", side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                Estrutura.obter_unidade(18)
+        stats = metricas.estatisticas()["Estrutura.obter_unidade"]
+        assert (stats["chamadas"], stats["cache_hits"], stats["erros"]) == (3, 1, 1)
+    finally:
+        metricas.configure(ativo=False)
+        metricas.zerar()
+
+
+def test_consulta_lenta(sqlite_db, caplog) -> None:
+    metricas.configure(consulta_lenta=1e-9)
+    with caplog.at_level(logging.WARNING, logger="replicado.metricas"):
+        Financeiro.listar_bens_por_local(7)
+    assert len(caplog.records) == 1
+    mensagem = caplog.records[0].getMessage()
+    assert mensagem.startswith("Consulta lenta em Financeiro.listar_bens_por_local")
+    assert "10 linhas | SQL: SELECT numpat, codbem" in mensagem
+
+
+def test_spans_em_arquivo(sqlite_db, tmp_path) -> None:
+    destino = tmp_path / "spans.jsonl"
+    metricas.configure(spans=str(destino))
+    Financeiro.listar_bens_por_local(7)
+    metricas.descarregar()
+
+    consulta, metodo = [json.loads(linha) for linha in destino.read_text().splitlines()]
+    assert metodo["name"] == "Financeiro.listar_bens_por_local"
+    assert "parentSpanId" not in metodo
+    assert consulta["name"] == "DB.fetch_all"
+    assert consulta["kind"] == 3
+    assert consulta["traceId"] == metodo["traceId"]
+    assert consulta["parentSpanId"] == metodo["spanId"]
+    atributos = {a["key"]: a["value"] for a in consulta["attributes"]}
+    assert atributos["db.response.returned_rows"] == {"intValue": "10"}
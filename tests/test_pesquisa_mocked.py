@@ -1,5 +1,6 @@
 import os
 import unittest
+from datetime import date
 from unittest.mock import patch
 
 from replicado.pesquisa import Pesquisa
@@ -7,26 +8,39 @@ from replicado.pesquisa import Pesquisa
 
 class TestPesquisa(unittest.TestCase):
     @patch("replicado.connection.DB.fetch_all")
-    @patch("replicado.connection.DB.fetch")
-    @patch("replicado.pessoa.Pessoa.retornar_curso_por_codpes")
     @patch.dict(os.environ, {"REPLICADO_CODUNDCLG": "12"})
-    def test_listar_iniciacao_cientifica(
-        self, mock_curso, mock_fetch, mock_fetch_all
-    ) -> None:
-        # 1. Main query
-        # 2. Scholarship check (fetch)
+    def test_listar_iniciacao_cientifica(self, mock_fetch_all) -> None:
+        # 1. Consulta principal (vínculos de IC)
+        # 2. Uma única consulta em lote com os cursos dos alunos (ALUNOGR)
+        ics = [
+            {"aluno": 123, "tipo_vinculo": "ICD", "data_ini": date(2024, 3, 1)},
+            {"aluno": 456, "tipo_vinculo": "ICV", "data_ini": None},
+            {"aluno": 123, "tipo_vinculo": "ICV", "data_ini": date(2023, 3, 1)},
+        ]
+        cursos = [{"codpes": 123, "codcurgrd": 10, "nomcur": "Curso A"}]
+        mock_fetch_all.side_effect = lambda query, params=None, **kwargs: (
+            cursos if "ALUNOGR" in query else ics
+        )
+
+        res = Pesquisa.listar_iniciacao_cientifica()
 
-        ic_mock = {"cod_projeto": 1, "aluno": 123, "nome_aluno": "Aluno A"}
-        mock_fetch_all.return_value = [ic_mock]
+        self.assertEqual(mock_fetch_all.call_count, 2)
+        query, params = mock_fetch_all.call_args[0]
+        self.assertIn("V.codpes IN (:codpes_0, :codpes_1)", query)
+        self.assertEqual(params, {"codpes_0": 123, "codpes_1": 456})
 
-        mock_curso.return_value = {"codcurgrd": 10, "nomcur": "Curso A"}
-        mock_fetch.return_value = {"codctgedi": "1"}  # PIBIC
+        self.assertEqual(len(res), 3)
+        self.assertEqual((res[0]["codcur"], res[0]["nome_curso"]), (10, "Curso A"))
+        self.assertEqual((res[2]["codcur"], res[2]["nome_curso"]), (10, "Curso A"))
+        # Aluno sem vínculo ALUNOGR
+        self.assertIsNone(res[1]["codcur"])
+        self.assertIsNone(res[1]["nome_curso"])
 
-        res = Pesquisa.listar_iniciacao_cientifica()
-        self.assertEqual(len(res), 1)
-        self.assertEqual(res[0]["codcur"], 10)
-        self.assertEqual(res[0]["codctgedi"], "PIBIC")
         self.assertEqual(res[0]["bolsa"], "true")
+        self.assertEqual(res[0]["codctgedi"], "BOLSA")
+        self.assertEqual(res[1]["bolsa"], "false")
+        self.assertEqual(res[0]["ano_projeto"], 2024)
+        self.assertIsNone(res[1]["ano_projeto"])
 
     @patch("replicado.connection.DB.fetch_all")
     def test_listar_pesquisadores_colaboradores_ativos(self, mock_fetch) -> None:
@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+
+from replicado.connection import DB
+from replicado.pessoa import Pessoa
+
+
+class TestPessoaLote(unittest.TestCase):
+    @patch("replicado.connection.DB.fetch_all")
+    def test_fetch_all_in_lotes(self, mock_fetch_all) -> None:
+        mock_fetch_all.side_effect = lambda query, params, **kwargs: [
+            {"codpes": v} for k, v in params.items() if k.startswith("codpes_")
+        ]
+
+        result = DB.fetch_all_in(
+            "SELECT codpes FROM PESSOA WHERE codpes IN ({lista_in}) AND x = :x",
+            [1, 2, 2, 3, 4, 5],
+            {"x": 1},
+            tamanho_lote=2,
+        )
+
+        self.assertEqual([r["codpes"] for r in result], [1, 2, 3, 4, 5])
+        self.assertEqual(mock_fetch_all.call_count, 3)
+        query, params = mock_fetch_all.call_args_list[0][0]
+        self.assertIn("IN (:codpes_0, :codpes_1)", query)
+        self.assertEqual(params, {"x": 1, "codpes_0": 1, "codpes_1": 2})
+
+    @patch("replicado.connection.DB.fetch_all")
+    def test_emails_lote(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "codema": "a@usp.br"},
+            {"codpes": 1, "codema": "a@usp.br"},
+            {"codpes": 2, "codema": "b@usp.br"},
+        ]
+
+        result = Pessoa.emails_lote([1, 2, 3])
+
+        self.assertEqual(result, {1: ["a@usp.br"], 2: ["b@usp.br"], 3: []})
+        mock_fetch_all.assert_called_once()
+
+    @patch("replicado.connection.DB.fetch_all")
+    def test_telefones_e_nome_social_lote(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "codddd": "11 ", "numtel": "3091-0000"}
+        ]
+        self.assertEqual(Pessoa.telefones_lote([1, 2]), {1: ["(11) 3091-0000"], 2: []})
+
+        mock_fetch_all.return_value = [{"codpes": 2, "nomcnhpes": "Nome Social"}]
+        self.assertEqual(
+            Pessoa.obter_nome_social_lote([1, 2]), {1: None, 2: "Nome Social"}
+        )
+
+    @patch("replicado.connection.DB.fetch_all")
+    def test_endereco_e_vinculos_lote(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = [{"codpes": 1, "cidloc": "São Paulo"}]
+        self.assertEqual(
+            Pessoa.obter_endereco_lote([1, 2]), {1: {"cidloc": "São Paulo"}, 2: None}
+        )
+
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "tipvin": "SERVIDOR"},
+            {"codpes": 1, "tipvin": "ALUNOPOS"},
+        ]
+        result = Pessoa.listar_vinculos_ativos_lote([1, 2], designados=False)
+        self.assertEqual(len(result[1]), 2)
+        self.assertEqual(result[2], [])
+        self.assertIn("tipdsg IS NULL", mock_fetch_all.call_args[0][0])
+
+    @patch("replicado.connection.DB.fetch_all")
+    def test_obter_nome_lista_parametrizada(self, mock_fetch_all) -> None:
+        mock_fetch_all.return_value = [{"codpes": 1, "nompesttd": "Fulano"}]
+
+        self.assertEqual(Pessoa.obter_nome([1, 1]), {1: "Fulano"})
+        query, params = mock_fetch_all.call_args[0]
+        self.assertIn("IN (:codpes_0)", query)
+        self.assertEqual(params, {"codpes_0": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
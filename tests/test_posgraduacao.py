@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from replicado.connection import DB
+from replicado.posgraduacao import Posgraduacao
+
+TABELAS = [
+    "CREATE TABLE CURSO (codcur INTEGER, codclg INTEGER, tipcur TEXT, dtainiccp TEXT)",
+    "CREATE TABLE NOMECURSO (codcur INTEGER, nomcur TEXT, dtafimcur TEXT)",
+    "CREATE TABLE AREA (codcur INTEGER, codare INTEGER)",
+    "CREATE TABLE NOMEAREA "
+    "(codcur INTEGER, codare INTEGER, nomare TEXT, dtafimare TEXT)",
+    "CREATE TABLE CREDAREA (codare INTEGER, dtadtvare TEXT)",
+    "CREATE TABLE VINCULOPESSOAUSP (codpes INTEGER, codare INTEGER, nivpgm TEXT, "
+    "dtainivin TEXT, tipvin TEXT, sitatl TEXT)",
+    "CREATE TABLE LOCALIZAPESSOA "
+    "(codpes INTEGER, nompes TEXT, codema TEXT, codundclg INTEGER)",
+]
+
+
+def popular(conn, programas: int, areas: int, alunos: int) -> None:
+    """Cria `programas` cursos de pós com `areas` áreas e `alunos` por área."""
+    for tabela in TABELAS:
+        conn.execute(text(tabela))
+    codpes = 0
+    for p in range(1, programas + 1):
+        conn.execute(text(f"INSERT INTO CURSO VALUES ({p}, 45, 'POS', '2000-01-01')"))
+        conn.execute(
+            text(f"INSERT INTO NOMECURSO VALUES ({p}, 'Programa {p:03}', NULL)")
+        )
+        for a in range(areas):
+            codare = p * 100 + a
+            conn.execute(text(f"INSERT INTO AREA VALUES ({p}, {codare})"))
+            conn.execute(
+                text(
+                    f"INSERT INTO NOMEAREA VALUES ({p}, {codare}, 'Área {codare}', NULL)"
+                )
+            )
+            conn.execute(text(f"INSERT INTO CREDAREA VALUES ({codare}, NULL)"))
+            for _ in range(alunos):
+                codpes += 1
+                conn.execute(
+                    text(
+                        f"INSERT INTO VINCULOPESSOAUSP VALUES ({codpes}, {codare}, "
+                        "'DO', '2020-01-01', 'ALUNOPOS', 'A')"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"INSERT INTO LOCALIZAPESSOA VALUES ({codpes}, "
+                        f"'Aluno {codpes:05}', 'a@usp.br', 45)"
+                    )
+                )
+
+
+@pytest.fixture
+def pos_db():
+    """SQLite em memória com programas de pós; conta as idas ao banco."""
+
+    def criar(programas: int, areas: int, alunos: int = 2) -> list[str]:
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            popular(conn, programas, areas, alunos)
+        consultas = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, sql, *args: consultas.append(sql),
+        )
+        DB._engine = engine
+        return consultas
+
+    original = DB._engine
+    yield criar
+    DB._engine = original
+
+
+@pytest.mark.parametrize("programas,areas", [(1, 1), (5, 3), (20, 5)])
+def test_areas_programas_idas_constantes(pos_db, programas, areas) -> None:
+    """O número de consultas não cresce com programas/áreas."""
+    consultas = pos_db(programas, areas)
+
+    result = Posgraduacao.areas_programas(45)
+
+    assert len(consultas) == 2
+    assert list(result) == list(range(1, programas + 1))
+    assert result[1] == [
+        {"codare": 100 + a, "nomare": f"Área {100 + a}"} for a in range(areas)
+    ]
+
+
+def test_alunos_programa(pos_db) -> None:
+    consultas = pos_db(programas=20, areas=5, alunos=3)
+
+    alunos = Posgraduacao.alunos_programa(45, 2)
+
+    assert len(consultas) == 3
+    assert len(alunos) == 15
+    # Agrupados por área, em ordem de nome dentro de cada área
+    assert [a["codare"] for a in alunos] == [c for c in range(200, 205) for _ in "abc"]
+    assert alunos[0] == {
+        "codare": 200,
+        "codpes": 16,
+        "nompes": "Aluno 00016",
+        "nivpgm": "DO",
+        "codema": "a@usp.br",
+        "dtainivin": "2020-01-01",
+    }
+
+    consultas.clear()
+    assert len(Posgraduacao.alunos_programa(45, 2, codare=201)) == 3
+    assert len(consultas) == 1
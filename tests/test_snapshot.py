@@ -0,0 +1,191 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from replicado import cli, snapshot
+from replicado.connection import DB
+
+
+@pytest.fixture
+def replicado_db():
+    """SQLite no papel do replicado, contando as consultas recebidas."""
+    engine = create_engine("sqlite://")
+    # Função que só o "replicado" conhece, para simular SQL sem equivalente local
+    event.listen(
+        engine,
+        "connect",
+        lambda dbapi_conn, _: dbapi_conn.create_function("bogus", 1, lambda x: 1),
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE PESSOA (codpes INTEGER, nompes TEXT)"))
+        conn.execute(
+            text("CREATE TABLE LOCALIZAPESSOA (codpes INTEGER, codundclg INTEGER)")
+        )
+        conn.execute(text("CREATE TABLE SETOR (codset INTEGER, codund INTEGER)"))
+        conn.execute(text("CREATE TABLE UNIDADE (codund INTEGER, sglund TEXT)"))
+        conn.execute(text("CREATE TABLE VINCULO (codpes INTEGER)"))
+        conn.execute(
+            text("INSERT INTO PESSOA VALUES (1, 'Ana   '), (2, 'Bia'), (3, 'Caio')")
+        )
+        conn.execute(
+            text("INSERT INTO LOCALIZAPESSOA VALUES (1, 45), (2, 45), (3, 18)")
+        )
+        conn.execute(text("INSERT INTO SETOR VALUES (10, 45), (20, 18)"))
+        conn.execute(text("INSERT INTO UNIDADE VALUES (45, 'IME'), (18, 'ICMC')"))
+    consultas = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: consultas.append(sql),
+    )
+    original = DB._engine
+    DB._engine = engine
+    yield consultas
+    DB._engine = original
+    snapshot.configure(None)
+
+
+def test_traduzir() -> None:
+    assert snapshot.traduzir(
+        "SELECT TOP 1 nomcur FROM CURSOGR WHERE codcur = convert(int, :codcur)"
+    ) == ("SELECT nomcur FROM CURSOGR WHERE codcur = CAST(:codcur AS INTEGER) LIMIT 1")
+    assert snapshot.traduzir(
+        "SELECT ISNULL(nomset, '') FROM SETOR WHERE YEAR(GETDATE()) > LEN(x)"
+    ) == (
+        "SELECT IFNULL(nomset, '') FROM SETOR WHERE "
+        "CAST(strftime('%Y', datetime('now', 'localtime')) AS INTEGER) > LENGTH(x)"
+    )
+    # Sem tradução: a consulta vai ao replicado
+    assert snapshot.traduzir("SELECT DATEDIFF(day, a, b) FROM SETOR") is None
+    assert snapshot.traduzir("SELECT nompes + ' ' FROM PESSOA") is None
+    assert snapshot.traduzir("SELECT * FROM (SELECT TOP 1 * FROM SETOR) s") is None
+
+
+def test_tabelas_da_query() -> None:
+    assert snapshot._tabelas_da_query(
+        """
+        SELECT CURSOGR.*, H.* FROM CURSOGR, dbo.HABILITACAOGR AS H
+        LEFT JOIN SETOR s ON s.codset = H.codset
+        WHERE H.codcur IN (SELECT codcur FROM AREA)
+        """
+    ) == {"CURSOGR", "HABILITACAOGR", "SETOR", "AREA"}
+
+
+def test_atualizar_e_rotear(replicado_db, tmp_path) -> None:
+    caminho = str(tmp_path / "snapshot.db")
+    contagem = snapshot.atualizar(
+        caminho,
+        tabelas=["PESSOA", "LOCALIZAPESSOA", "SETOR", "UNIDADE"],
+        codundclg="45",
+    )
+    assert contagem == {"PESSOA": 2, "LOCALIZAPESSOA": 2, "SETOR": 1, "UNIDADE": 2}
+    assert [t["tabela"] for t in snapshot.status(caminho)] == [
+        "LOCALIZAPESSOA",
+        "PESSOA",
+        "SETOR",
+        "UNIDADE",
+    ]
+
+    snapshot.configure(caminho)
+    replicado_db.clear()
+    # Tabela copiada por inteiro: respondida localmente
+    assert DB.fetch(
+        "SELECT TOP 1 sglund FROM UNIDADE WHERE codund = convert(int, :codund)",
+        {"codund": 18},
+    ) == {"sglund": "ICMC"}
+    assert [r["codund"] for r in DB.iter_rows("SELECT * FROM UNIDADE")] == [45, 18]
+    assert replicado_db == []
+
+    # Tabela fora do snapshot e consulta que falha no SQLite: vão ao replicado
+    assert DB.fetch_all("SELECT codpes FROM VINCULO") == []
+    assert len(replicado_db) == 1
+    assert DB.fetch_all("SELECT sglund FROM UNIDADE WHERE bogus(1)") == [
+        {"sglund": "IME"},
+        {"sglund": "ICMC"},
+    ]
+    assert snapshot.rotear("SELECT sglund FROM UNIDADE WHERE bogus(1)") is None
+
+
+def test_tabelas_filtradas_vao_ao_replicado(replicado_db, tmp_path) -> None:
+    caminho = str(tmp_path / "snapshot.db")
+    snapshot.atualizar(
+        caminho, tabelas=["PESSOA", "LOCALIZAPESSOA", "UNIDADE"], codundclg="45"
+    )
+    snapshot.configure(caminho)
+    replicado_db.clear()
+
+    # Pessoa de outra unidade (fora da cópia local) continua sendo encontrada
+    consulta = "SELECT nompes FROM PESSOA WHERE codpes = :codpes"
+    assert DB.fetch(consulta, {"codpes": 3}) == {"nompes": "Caio"}
+    assert len(replicado_db) == 1
+    assert snapshot.rotear("SELECT P.codpes FROM PESSOA P, UNIDADE U") is None
+
+    # Com parciais=True, a aplicação aceita responder pela cópia da unidade
+    snapshot.configure(caminho, parciais=True)
+    replicado_db.clear()
+    assert DB.fetch(consulta, {"codpes": 1}) == {"nompes": "Ana"}
+    assert DB.fetch(consulta, {"codpes": 3}) is None
+    assert replicado_db == []
+
+
+def test_atualizar_sem_unidade(replicado_db, tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("REPLICADO_CODUNDCLG", raising=False)
+    with pytest.raises(ValueError, match="REPLICADO_CODUNDCLG"):
+        snapshot.atualizar(str(tmp_path / "s.db"), tabelas=["SETOR"])
+    assert not (tmp_path / "s.db").exists()
+    assert not (tmp_path / "s.db.tmp").exists()
+
+
+def test_snapshot_desatualizado(replicado_db, tmp_path) -> None:
+    caminho = str(tmp_path / "snapshot.db")
+    snapshot.atualizar(caminho, tabelas=["UNIDADE"], codundclg="45")
+    with sqlite3.connect(caminho) as conn:
+        conn.execute(
+            "UPDATE _replicado_snapshot SET atualizado_em = ?",
+            (datetime(2000, 1, 1).isoformat(" "),),
+        )
+
+    snapshot.configure(caminho, max_idade=24)
+    assert snapshot.rotear("SELECT * FROM UNIDADE") is None
+    snapshot.configure(caminho, max_idade=0)
+    assert snapshot.rotear("SELECT * FROM UNIDADE") is not None
+
+
+@pytest.mark.parametrize("conteudo", [b"", b"lixo" * 100, "outro"])
+def test_arquivo_invalido_vai_ao_replicado(
+    replicado_db, tmp_path, conteudo, caplog
+) -> None:
+    caminho = tmp_path / "snapshot.db"
+    if conteudo == "outro":
+        with closing(sqlite3.connect(caminho)) as conn:
+            conn.execute("CREATE TABLE UNIDADE (codund INTEGER)")
+    else:
+        caminho.write_bytes(conteudo)
+    snapshot.configure(str(caminho))
+
+    carregar = snapshot._carregar_estado
+    with patch.object(snapshot, "_carregar_estado", wraps=carregar) as mock_carregar:
+        assert snapshot.rotear("SELECT * FROM UNIDADE") is None
+        linhas = DB.fetch_all("SELECT sglund FROM UNIDADE WHERE codund = 45")
+        assert snapshot.rotear("SELECT * FROM UNIDADE") is None
+    assert linhas == [{"sglund": "IME"}]
+    assert mock_carregar.call_count == 1
+    assert "inválido" in caplog.text
+
+    # Trocado por um snapshot válido, volta a ser usado
+    caminho.unlink()
+    snapshot.atualizar(str(caminho), tabelas=["UNIDADE"], codundclg="45")
+    assert snapshot.rotear("SELECT * FROM UNIDADE") is not None
+
+
+def test_cli_snapshot(replicado_db, tmp_path, capsys) -> None:
+    caminho = str(tmp_path / "snapshot.db")
+    codigo = cli.main(
+        ["snapshot", "--arquivo", caminho, "--tabela", "setor", "--codundclg", "45"]
+    )
+    assert codigo == 0
+    assert capsys.readouterr().out.startswith("SETOR\t1\t")
@@ -0,0 +1,175 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from datetime import datetime
+from unittest.mock import patch
+
+from replicado import cli
+from replicado.lattes import LattesStore
+from replicado.sync import MARCA_LATTES, sincronizar_lattes
+
+
+def _zip(codpes: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("curriculo.xml", f"<CV><A>{codpes}</A></CV>")
+    return buffer.getvalue()
+
+
+class TestSincronizarLattes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.dir.name, "lattes.db")
+        self.store = LattesStore(self.caminho)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_baixa_apenas_alterados(self, mock_fetch_all, mock_zips) -> None:
+        mock_fetch_all.return_value = [
+            {"codpes": 2, "dtaultalt": datetime(2024, 1, 2)},
+            {"codpes": 1, "dtaultalt": datetime(2024, 1, 1)},
+        ]
+        mock_zips.side_effect = lambda codpes, _: [(c, _zip(c)) for c in codpes]
+        alterados = []
+
+        resultado = sincronizar_lattes(
+            self.store, ao_alterar=lambda c, d: alterados.append((c, d))
+        )
+
+        self.assertEqual(resultado.alterados, [1, 2])
+        self.assertEqual(alterados, [(1, {"A": "1"}), (2, {"A": "2"})])
+        self.assertEqual(resultado.marca_atual, datetime(2024, 1, 2))
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-01-02T00:00:00")
+        self.assertEqual(self.store.get(2, datetime(2024, 1, 2))[0], {"A": "2"})
+
+        # Segunda execução parte da marca e ignora versões já guardadas
+        mock_fetch_all.return_value = [
+            {"codpes": 2, "dtaultalt": datetime(2024, 1, 2)},
+            {"codpes": 3, "dtaultalt": datetime(2024, 1, 3)},
+        ]
+        resultado = sincronizar_lattes(self.store)
+
+        self.assertEqual(
+            mock_fetch_all.call_args[0][1], {"desde": datetime(2024, 1, 2)}
+        )
+        self.assertEqual(mock_zips.call_args[0][0], [3])
+        self.assertEqual(resultado.alterados, [3])
+        self.assertEqual(resultado.marca_anterior, datetime(2024, 1, 2))
+
+    @patch("replicado.lattes.Lattes.obter_zips", return_value=[])
+    @patch("replicado.connection.DB.fetch_all")
+    def test_falhas_sao_reportadas(self, mock_fetch_all, mock_zips) -> None:
+        mock_fetch_all.return_value = [{"codpes": 1, "dtaultalt": datetime(2024, 1, 1)}]
+
+        resultado = sincronizar_lattes(self.store)
+
+        self.assertEqual(resultado.alterados, [])
+        self.assertEqual(resultado.falhas, [1])
+        self.assertIsNone(self.store.get(1, datetime(2024, 1, 1)))
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_falha_parcial_segura_marca(self, mock_fetch_all, mock_zips) -> None:
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "dtaultalt": datetime(2024, 1, 1)},
+            {"codpes": 2, "dtaultalt": datetime(2024, 1, 2)},
+            {"codpes": 3, "dtaultalt": datetime(2024, 1, 3)},
+        ]
+        # O currículo 2 não vem do replicado
+        mock_zips.side_effect = lambda codpes, _: [
+            (c, _zip(c)) for c in codpes if c != 2
+        ]
+
+        resultado = sincronizar_lattes(self.store)
+
+        self.assertEqual(resultado.alterados, [1, 3])
+        self.assertEqual(resultado.falhas, [2])
+        self.assertEqual(resultado.marca_atual, datetime(2024, 1, 2))
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-01-02T00:00:00")
+
+        # Na execução seguinte, só o que falhou é baixado
+        mock_zips.side_effect = lambda codpes, _: [(c, _zip(c)) for c in codpes]
+        resultado = sincronizar_lattes(self.store)
+
+        self.assertEqual(
+            mock_fetch_all.call_args[0][1], {"desde": datetime(2024, 1, 2)}
+        )
+        self.assertEqual(resultado.alterados, [2])
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-01-03T00:00:00")
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_execucao_parcial_nao_grava_marca(self, mock_fetch_all, mock_zips) -> None:
+        self.store.gravar_marca(MARCA_LATTES, "2024-01-01T00:00:00")
+        mock_fetch_all.return_value = [{"codpes": 7, "dtaultalt": datetime(2024, 5, 1)}]
+        mock_zips.side_effect = lambda codpes, _: [(c, _zip(c)) for c in codpes]
+
+        resultado = sincronizar_lattes(self.store, codpes_list=[7])
+        self.assertEqual(resultado.alterados, [7])
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-01-01T00:00:00")
+
+        sincronizar_lattes(self.store, desde=datetime(2024, 4, 1))
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-01-01T00:00:00")
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_completo_ignora_marca(self, mock_fetch_all, mock_zips) -> None:
+        self.store.gravar_marca(MARCA_LATTES, "2024-03-01T00:00:00")
+        mock_fetch_all.return_value = [
+            {"codpes": 1, "dtaultalt": datetime(2024, 1, 1)},
+            {"codpes": 2, "dtaultalt": datetime(2024, 2, 1)},
+        ]
+
+        # Execução completa que falha no meio mantém a marca anterior
+        mock_zips.side_effect = RuntimeError("falhou")
+        with self.assertRaises(RuntimeError):
+            sincronizar_lattes(self.store, completo=True)
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-03-01T00:00:00")
+
+        # Sem data de corte; a marca é substituída ao final
+        mock_zips.side_effect = lambda codpes, _: [(c, _zip(c)) for c in codpes]
+        resultado = sincronizar_lattes(self.store, completo=True)
+        self.assertNotIn("desde", mock_fetch_all.call_args[0][0])
+        self.assertEqual(resultado.alterados, [1, 2])
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-02-01T00:00:00")
+
+        with self.assertRaises(ValueError):
+            sincronizar_lattes(self.store, codpes_list=[1], completo=True)
+
+    def test_cli_completo_com_codpes(self) -> None:
+        self.store.gravar_marca(MARCA_LATTES, "2024-03-01T00:00:00")
+        for extra in (["--codpes", "inexistente.txt"], ["--desde", "2024-01-01"]):
+            with patch("sys.stderr", io.StringIO()):
+                with self.assertRaises(SystemExit) as erro:
+                    cli.main(
+                        ["lattes-sync", "--store", self.caminho, "--completo", *extra]
+                    )
+            self.assertEqual(erro.exception.code, 2)
+        self.assertEqual(self.store.obter_marca(MARCA_LATTES), "2024-03-01T00:00:00")
+
+    @patch("replicado.lattes.Lattes._store", None)
+    def test_sem_store(self) -> None:
+        with self.assertRaises(ValueError):
+            sincronizar_lattes(None)
+
+    @patch("replicado.lattes.Lattes.obter_zips")
+    @patch("replicado.connection.DB.fetch_all")
+    def test_cli(self, mock_fetch_all, mock_zips) -> None:
+        mock_fetch_all.return_value = [{"codpes": 5, "dtaultalt": datetime(2024, 1, 1)}]
+        mock_zips.side_effect = lambda codpes, _: [(c, _zip(c)) for c in codpes]
+        saida = os.path.join(self.dir.name, "alterados.txt")
+
+        codigo = cli.main(["lattes-sync", "--store", self.caminho, "--saida", saida])
+
+        self.assertEqual(codigo, 0)
+        with open(saida, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "5\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
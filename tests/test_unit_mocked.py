@@ -102,21 +102,19 @@ def test_cria_filtro_busca() -> None:
         DB.execute("SELECT 1")
         assert mock_conn.execute.called
 
-        # fetch
-        mock_conn.execute.return_value.fetchone.return_value = MagicMock(
-            _mapping={"a": " b "}
-        )
+        # fetch (o driver não descreve os tipos: limpa todas as strings)
+        mock_conn.execute.return_value.keys.return_value = ["a"]
+        mock_conn.execute.return_value.cursor.description = None
+        mock_conn.execute.return_value.fetchone.return_value = (" b ",)
         res = DB.fetch("SELECT 1")
         assert res["a"] == "b"
 
         # fetch_all
-        mock_conn.execute.return_value._mapping.items.return_value = {
-            "a": " b "
-        }.items()  # Mock row mapping items
-        # Actually in SQLAlchemy 2.0+ it's result._mapping
-        row = MagicMock()
-        row._mapping = {"k": " v "}
-        mock_conn.execute.return_value = [row]
+        result = MagicMock()
+        result.keys.return_value = ["k"]
+        result.cursor.description = None
+        result.__iter__.return_value = iter([(" v ",)])
+        mock_conn.execute.return_value = result
         results = DB.fetch_all("SELECT 1")
         assert results[0]["k"] == "v"
 
@@ -403,13 +401,12 @@ def test_posgraduacao_methods(mock_fetch_all, mock_fetch) -> None:
     Posgraduacao.total_pos_nivel_programa("ME", 45)
 
     # areas_programas
-    # Sequence: 1. programas, 2. areas of course
+    # Sequence: 1. programas, 2. areas of all courses
     mock_fetch_all.side_effect = [
         [{"codcur": 1, "nomcur": "X", "codare": 1, "nomare": "Y"}],
-        [{"codare": 10}],
+        [{"codcur": 1, "codare": 10, "nomare": "Y"}],
     ]
-    mock_fetch.return_value = {"codare": 10, "nomare": "Y"}
-    Posgraduacao.areas_programas(45)
+    assert Posgraduacao.areas_programas(45) == {1: [{"codare": 10, "nomare": "Y"}]}
     mock_fetch_all.side_effect = None
 
     # listar_defesas
@@ -426,15 +423,18 @@ def test_posgraduacao_methods(mock_fetch_all, mock_fetch) -> None:
 
     # areas_programas with env comma
     with patch.dict(os.environ, {"REPLICADO_CODUNDCLG": "45,88"}):
-        mock_fetch_all.side_effect = [[{"codcur": 1}], [{"codare": 1}]]
-        mock_fetch.return_value = {"codare": 1, "nomare": "A"}
+        mock_fetch_all.side_effect = [
+            [{"codcur": 1}],
+            [{"codcur": 1, "codare": 1, "nomare": "A"}],
+        ]
         Posgraduacao.areas_programas()
         mock_fetch_all.side_effect = None
 
     # alunos_programa without codare
     with patch("replicado.posgraduacao.Posgraduacao.areas_programas") as m_areas:
         m_areas.return_value = {10: [{"codare": 1}]}
-        Posgraduacao.alunos_programa(45, 10)
+        mock_fetch_all.return_value = [{"codare": 1, "codpes": 1}]
+        assert Posgraduacao.alunos_programa(45, 10) == [{"codare": 1, "codpes": 1}]
 
     # idioma_disciplina without cod
     assert Posgraduacao.idioma_disciplina(None) is None
@@ -574,6 +574,15 @@ def test_bempatrimoniado_methods(mock_fetch_all, mock_fetch) -> None:
     assert Bempatrimoniado.is_informatica("1") is False
 
 
+def test_bempatrimoniado_limite() -> None:
+    query, _ = Bempatrimoniado._query_bens(None, None, None, 0)
+    assert query.startswith("SELECT TOP 0 * FROM BEMPATRIMONIADO")
+    query, _ = Bempatrimoniado._query_bens(None, None, None, None)
+    assert query.startswith("SELECT * FROM BEMPATRIMONIADO")
+    with pytest.raises(ValueError):
+        Bempatrimoniado._query_bens(None, None, None, -1)
+
+
 @patch("replicado.connection.DB.fetch")
 @patch("replicado.connection.DB.fetch_all")
 def test_coverage_gap_fillers(mock_fetch_all, mock_fetch) -> None:
@@ -633,7 +642,7 @@ def test_coverage_gap_fillers(mock_fetch_all, mock_fetch) -> None:
     mock_fetch_all.return_value = [{"coddis": "D"}]
     Posgraduacao.espacoturma("S", 1, 1)
 
-    mock_fetch_all.return_value = [{"codpes": 1}]
+    mock_fetch_all.return_value = [{"codare": 20, "codpes": 1}]
     Posgraduacao.alunos_programa(45, 10, 20)
 
     mock_fetch.return_value = {"dsclin": "Portugues"}
@@ -1,7 +1,7 @@
 import unittest
 import xml.etree.ElementTree as ET
 
-from replicado.utils import etree_to_dict, get_path
+from replicado.utils import etree_to_dict, extrair_secoes, get_path, lotes
 
 
 class TestUtils(unittest.TestCase):
@@ -43,3 +43,28 @@ class TestUtils(unittest.TestCase):
         d = {"a": {"b": {"c": 1}}}
         self.assertEqual(get_path(d, "a.b.c"), 1)
         self.assertEqual(get_path(d, "a.x"), None)
+
+    def test_extrair_secoes(self) -> None:
+        xml = (
+            '<CV ID="1"><DADOS-GERAIS NOME="A"><X>1</X></DADOS-GERAIS>'
+            '<PRODUCAO P="2"><ARTIGOS><ART ANO="2020"/><ART ANO="2021"/></ARTIGOS>'
+            "<LIVROS><LIVRO/></LIVROS></PRODUCAO>"
+            "<OUTROS><Y>2</Y></OUTROS></CV>"
+        )
+        root = ET.fromstring(xml)
+        completo = etree_to_dict(root)["CV"]
+
+        d = extrair_secoes(xml.encode(), ["PRODUCAO.ARTIGOS"])
+        self.assertEqual(d["PRODUCAO"]["ARTIGOS"], completo["PRODUCAO"]["ARTIGOS"])
+        self.assertEqual(d["PRODUCAO"]["@attributes"], {"P": "2"})
+        self.assertEqual(d["@attributes"], {"ID": "1"})
+        self.assertNotIn("LIVROS", d["PRODUCAO"])
+        self.assertNotIn("DADOS-GERAIS", d)
+
+        d = extrair_secoes(xml, ["DADOS-GERAIS", "OUTROS/Y"])
+        self.assertEqual(d["DADOS-GERAIS"], completo["DADOS-GERAIS"])
+        self.assertEqual(d["OUTROS"], {"Y": "2"})
+
+    def test_lotes(self) -> None:
+        self.assertEqual(list(lotes(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(lotes([], 2)), [])